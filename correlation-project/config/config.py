@@ -5,6 +5,26 @@ from pathlib import Path
 BASE_DIR = Path(__file__).parent.parent
 RAW_CSV_DIR = BASE_DIR / "raw_csv"
 OUTPUT_DIR = BASE_DIR / "output"
+CACHE_DIR = OUTPUT_DIR / "cache"
+CACHE_NOMES = CACHE_DIR / "nomes_normalizados.json"
+STAGING_DIR = OUTPUT_DIR / "staging"
+RELATORIOS_DIR = OUTPUT_DIR / "relatorios"
+INDICE_PESSOAS = CACHE_DIR / "indice_pessoas.sqlite"
+CACHE_CLASSIFICACAO = CACHE_DIR / "classificacao"
+
+# Arquivo .prom para o coletor textfile do node_exporter (None = não gerar)
+PROMETHEUS_TEXTFILE = None
+
+# Processos usados pelo detector psiquiátrico (1 = sem paralelismo, -1 = todos os núcleos);
+# entradas pequenas (< MIN_TEXTOS_PARALELO em utils/psychiatric_detector.py) rodam sem pool
+N_JOBS_DETECTOR = -1
+
+# Registros por bloco na leitura em streaming do CSV (etl.pipeline.pipeline_streaming)
+CHUNKSIZE_CSV = 200_000
+
+# Versões (impressões digitais) mantidas em staging por etapa; as usadas há
+# mais tempo são removidas (ex.: dois CSVs, ou com e sem filtro de grupo-alvo)
+STAGING_VERSOES_POR_ETAPA = 4
 
 # Mapeamento de campos (sem caracteres especiais, sem pontos, snake_case)
 FIELD_MAPPING = {
@@ -184,3 +204,19 @@ CLASSIFICACAO_HOMICIDIO_SEM_DESAPARECIMENTO = "Homicídio sem registro de desapa
 NATUREZA_DESAPARECIMENTO = ['DESAPARECIMENTO DE PESSOA', '73_DESAPARECIMENTO DE PESSOA']
 NATUREZA_LOCALIZACAO_CADAVER = ['LOCALIZAÇÃO DE CADÁVER', 'LOCALIZACAO DE CADAVER']
 NATUREZA_HOMICIDIO = ['HOMICÍDIO', 'HOMICIDIO', 'LATROCÍNIO', 'LATROCINIO']
+
+# Regras de classificação (utils.classificacao): classe -> termos procurados no
+# texto em maiúsculas. Vale a primeira classe, na ordem abaixo, com algum termo
+# presente; acrescentar termos aqui estende a classificação.
+REGRAS_NATUREZA_ALVO = {
+    'DESAPARECIMENTO': ['DESAPARECIMENTO'],
+    'HOMICIDIO': ['HOMICIDIO', 'HOMICÍDIO'],
+    'CADAVER': ['CADAVER', 'CADÁVER'],
+}
+REGRAS_PAPEL_PESSOA = {
+    'VITIMA': ['VITIMA', 'VÍTIMA'],
+    'AUTOR': ['AUTOR'],
+    'TESTEMUNHA': ['TESTEMUNHA'],
+    'COMUNICANTE': ['COMUNICANTE'],
+    'REPRESENTANTE': ['REPRESENTANTE'],
+}
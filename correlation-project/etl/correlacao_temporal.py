@@ -0,0 +1,256 @@
+"""Engine de correlação temporal: desaparecimento seguido de cadáver/homicídio"""
+import numpy as np
+import pandas as pd
+import sys
+from pathlib import Path
+
+# Adicionar diretórios ao path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from config.config import OUTPUT_DIR
+from etl.staging import carregar_dataset_unificado
+
+
+NATUREZAS_GRUPO_ALVO = ['DESAPARECIMENTO', 'CADAVER', 'HOMICIDIO']
+NATUREZAS_MORTE = ['CADAVER', 'HOMICIDIO']
+
+# Limites (em dias) das faixas de força da correlação
+LIMITE_DIAS_FORTE = 30
+LIMITE_DIAS_MEDIA = 90
+
+# Colunas do registro de desaparecimento -> nome na correlação
+COLUNAS_DESAPARECIMENTO = {
+    'nome': 'nome',
+    'data_nascimento': 'data_nascimento',
+    'ano_nascimento': 'ano_nascimento',
+    'nome_mae': 'nome_mae',
+    'nome_mae_normalizado': 'nome_mae_normalizado',
+    'nome_pai': 'nome_pai',
+    'numero_identidade': 'numero_rg',
+    'orgao_expedidor_identidade': 'orgao_rg',
+    'uf_identidade': 'uf_rg',
+    'sexo': 'sexo',
+    'raca_padronizada': 'raca',
+    'tem_transtorno_psiquiatrico': 'tem_transtorno_psiquiatrico',
+    'tipo_transtorno': 'tipo_transtorno',
+    'evidencia_transtorno': 'evidencia_transtorno',
+    'chave_ocorrencia': 'bo_desaparecimento',
+    'cidade_ra': 'cidade_desaparecimento',
+    'unidade_registro': 'unidade_desaparecimento',
+    'historico_limpo': 'historico_desaparecimento',
+}
+
+# Colunas do registro de morte -> nome na correlação
+COLUNAS_MORTE = {
+    'natureza_alvo': 'tipo_morte',
+    'chave_ocorrencia': 'bo_morte',
+    'cidade_ra': 'cidade_morte',
+    'unidade_registro': 'unidade_morte',
+    'historico_limpo': 'historico_morte',
+}
+
+ORDEM_COLUNAS = [
+    'chave_pessoa',
+    'nome', 'data_nascimento', 'ano_nascimento', 'nome_mae', 'nome_mae_normalizado',
+    'nome_pai', 'numero_rg', 'orgao_rg', 'uf_rg', 'sexo', 'raca',
+    'tem_transtorno_psiquiatrico', 'tipo_transtorno', 'evidencia_transtorno',
+    'data_desaparecimento', 'bo_desaparecimento', 'cidade_desaparecimento',
+    'unidade_desaparecimento', 'historico_desaparecimento',
+    'data_morte', 'tipo_morte', 'bo_morte', 'cidade_morte', 'unidade_morte', 'historico_morte',
+    'dias_entre_eventos', 'tem_evento_intermediario', 'forca_correlacao', 'explicacao',
+]
+
+_NS_POR_DIA = 86_400 * 10**9
+
+
+def classificar_forca(dias: np.ndarray) -> np.ndarray:
+    """
+    Classifica a força da correlação pelo intervalo em dias.
+
+    Returns:
+        Array com 'FORTE' (até 30 dias), 'MÉDIA' (até 90) ou 'FRACA'
+    """
+    return np.select(
+        [dias <= LIMITE_DIAS_FORTE, dias <= LIMITE_DIAS_MEDIA],
+        ['FORTE', 'MÉDIA'],
+        default='FRACA'
+    )
+
+
+def _copiar_colunas(df: pd.DataFrame, posicoes: np.ndarray, mapeamento: dict) -> dict:
+    """Extrai as colunas mapeadas nas posições dadas (None se a coluna não existe)"""
+    colunas = {}
+    for origem, destino in mapeamento.items():
+        if origem in df.columns:
+            colunas[destino] = df[origem].to_numpy()[posicoes]
+        else:
+            colunas[destino] = np.full(len(posicoes), None, dtype=object)
+    return colunas
+
+
+def gerar_correlacoes_temporais(
+    df: pd.DataFrame,
+    col_pessoa: str = 'chave_pessoa',
+    col_data: str = 'data_fato_dt'
+) -> pd.DataFrame:
+    """
+    Encontra pares desaparecimento -> cadáver/homicídio posterior da mesma pessoa.
+
+    Ordena o grupo-alvo uma única vez por (pessoa, data) e resolve tudo com
+    operações em array: os pares saem de um self-join por código inteiro de
+    pessoa, e a existência de eventos intermediários é obtida por busca
+    binária sobre a chave composta (pessoa, posto da data), sem filtrar o
+    DataFrame por pessoa.
+
+    Args:
+        df: Dataset enriquecido (natureza_alvo, chave_pessoa, data_fato_dt, ...)
+        col_pessoa: Coluna que identifica a pessoa
+        col_data: Coluna com a data do fato
+
+    Returns:
+        DataFrame com uma linha por par (mesmas colunas do relatório de correlações)
+    """
+    alvo = df[df['natureza_alvo'].isin(NATUREZAS_GRUPO_ALVO)]
+    datas = pd.to_datetime(alvo[col_data], errors='coerce')
+
+    # Sem pessoa ou sem data o registro não participa de nenhuma comparação
+    validos = (alvo[col_pessoa].notna() & datas.notna()).to_numpy()
+    alvo = alvo[validos]
+
+    print(f"[Correlação] {len(alvo):,} registros do grupo-alvo com pessoa e data")
+
+    if alvo.empty:
+        return pd.DataFrame(columns=ORDEM_COLUNAS)
+
+    pessoa, pessoas_unicas = pd.factorize(alvo[col_pessoa])
+    data_ns = datas[validos].to_numpy(dtype='datetime64[ns]').view('int64')
+
+    print(f"[Correlação] Pessoas únicas: {len(pessoas_unicas):,}")
+
+    # Ordenação única por (pessoa, data)
+    ordem = np.lexsort((data_ns, pessoa))
+    pessoa_ord = pessoa[ordem].astype(np.int64)
+    data_ord = data_ns[ordem]
+    natureza_ord = alvo['natureza_alvo'].to_numpy()[ordem]
+
+    # Chave composta ordenada: pessoa * n_datas + posto denso da data
+    datas_unicas, posto = np.unique(data_ord, return_inverse=True)
+    composta = pessoa_ord * len(datas_unicas) + posto
+
+    posicoes = np.arange(len(ordem))
+    eh_desap = natureza_ord == 'DESAPARECIMENTO'
+    eh_morte = np.isin(natureza_ord, NATUREZAS_MORTE)
+
+    pares = pd.merge(
+        pd.DataFrame({'pessoa': pessoa_ord[eh_desap], 'pos_desap': posicoes[eh_desap]}),
+        pd.DataFrame({'pessoa': pessoa_ord[eh_morte], 'pos_morte': posicoes[eh_morte]}),
+        on='pessoa'
+    )
+    pos_desap = pares['pos_desap'].to_numpy()
+    pos_morte = pares['pos_morte'].to_numpy()
+
+    # Apenas mortes estritamente posteriores ao desaparecimento
+    posterior = data_ord[pos_morte] > data_ord[pos_desap]
+    pos_desap = pos_desap[posterior]
+    pos_morte = pos_morte[posterior]
+
+    # Eventos da pessoa com data estritamente entre os dois
+    apos_desap = np.searchsorted(composta, composta[pos_desap], side='right')
+    antes_morte = np.searchsorted(composta, composta[pos_morte], side='left')
+    tem_intermediario = antes_morte > apos_desap
+
+    dias = (data_ord[pos_morte] - data_ord[pos_desap]) // _NS_POR_DIA
+
+    # Voltar das posições ordenadas para as linhas do DataFrame
+    linhas_desap = ordem[pos_desap]
+    linhas_morte = ordem[pos_morte]
+
+    colunas = {'chave_pessoa': alvo[col_pessoa].to_numpy()[linhas_desap]}
+    colunas.update(_copiar_colunas(alvo, linhas_desap, COLUNAS_DESAPARECIMENTO))
+    colunas.update(_copiar_colunas(alvo, linhas_morte, COLUNAS_MORTE))
+
+    data_desap = pd.Series(data_ord[pos_desap].view('datetime64[ns]'))
+    data_morte = pd.Series(data_ord[pos_morte].view('datetime64[ns]'))
+    colunas['data_desaparecimento'] = data_desap.dt.strftime('%Y-%m-%d').to_numpy()
+    colunas['data_morte'] = data_morte.dt.strftime('%Y-%m-%d').to_numpy()
+    colunas['dias_entre_eventos'] = dias
+    colunas['tem_evento_intermediario'] = tem_intermediario
+    colunas['forca_correlacao'] = classificar_forca(dias)
+
+    correlacoes = pd.DataFrame(colunas)
+    correlacoes['explicacao'] = (
+        "Pessoa desapareceu em " + data_desap.dt.strftime('%d/%m/%Y')
+        + " e " + correlacoes['tipo_morte'].astype(str).str.lower()
+        + " encontrado em " + data_morte.dt.strftime('%d/%m/%Y')
+        + " (" + correlacoes['dias_entre_eventos'].astype(str) + " dias depois)"
+    )
+
+    correlacoes = correlacoes[ORDEM_COLUNAS].sort_values(
+        'data_desaparecimento', ascending=False, kind='stable'
+    ).reset_index(drop=True)
+
+    print(f"[Correlação] Total de correlações encontradas: {len(correlacoes):,}")
+
+    return correlacoes
+
+
+def exportar_correlacoes(df_correlacoes: pd.DataFrame, caminho_saida: str) -> None:
+    """
+    Salva as correlações em Excel: todas, uma aba por força e estatísticas.
+
+    Args:
+        df_correlacoes: Resultado de gerar_correlacoes_temporais
+        caminho_saida: Caminho do arquivo .xlsx
+    """
+    caminho = Path(caminho_saida)
+    caminho.parent.mkdir(parents=True, exist_ok=True)
+
+    forca = df_correlacoes['forca_correlacao']
+    df_fortes = df_correlacoes[forca == 'FORTE']
+    df_medias = df_correlacoes[forca == 'MÉDIA']
+    df_fracas = df_correlacoes[forca == 'FRACA']
+
+    stats = pd.DataFrame({
+        'Métrica': [
+            'Total de Correlações',
+            'Correlações FORTES (0-30 dias)',
+            'Correlações MÉDIAS (31-90 dias)',
+            'Correlações FRACAS (>90 dias)',
+            'Média de dias entre eventos',
+            'Menor intervalo (dias)',
+            'Maior intervalo (dias)',
+            'Com dados completos de identificação'
+        ],
+        'Valor': [
+            len(df_correlacoes),
+            len(df_fortes),
+            len(df_medias),
+            len(df_fracas),
+            df_correlacoes['dias_entre_eventos'].mean(),
+            df_correlacoes['dias_entre_eventos'].min(),
+            df_correlacoes['dias_entre_eventos'].max(),
+            int(df_correlacoes['numero_rg'].notna().sum())
+        ]
+    })
+
+    with pd.ExcelWriter(caminho, engine='openpyxl') as writer:
+        df_correlacoes.to_excel(writer, sheet_name='Todas Correlações', index=False)
+        df_fortes.to_excel(writer, sheet_name='Correlações FORTES', index=False)
+        df_medias.to_excel(writer, sheet_name='Correlações MÉDIAS', index=False)
+        df_fracas.to_excel(writer, sheet_name='Correlações FRACAS', index=False)
+        stats.to_excel(writer, sheet_name='Estatísticas', index=False)
+
+    print(f"[Correlação] Arquivo salvo: {caminho}")
+
+
+if __name__ == "__main__":
+    caminho_entrada = OUTPUT_DIR / "dataset_unificado.xlsx"
+    caminho_saida = OUTPUT_DIR / "correlacoes_completas_com_identificacao.xlsx"
+
+    df_dataset = carregar_dataset_unificado(caminho_entrada)
+    df_resultado = gerar_correlacoes_temporais(df_dataset)
+
+    print("\n[ESTATÍSTICAS]")
+    print(df_resultado['forca_correlacao'].value_counts())
+
+    exportar_correlacoes(df_resultado, str(caminho_saida))
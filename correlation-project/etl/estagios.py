@@ -0,0 +1,183 @@
+"""
+Execução incremental do pipeline em estágios nomeados.
+
+Cada estágio declara suas dependências, uma versão de código e a
+configuração que influencia o resultado. A impressão digital (fingerprint)
+de um estágio combina esses três itens com as impressões das dependências;
+o resultado fica em staging sob essa chave. Numa nova execução só rodam os
+estágios cuja impressão mudou (e os que dependem deles) — trocar a lista de
+palavras-chave, por exemplo, refaz apenas a detecção e a exportação.
+"""
+import json
+import sys
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+import pandas as pd
+
+# Adicionar diretórios ao path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from config.config import STAGING_DIR
+from etl.staging import (
+    combinar_chaves, caminho_staging, carregar_staging, salvar_staging, aplicar_esquema
+)
+from utils.instrumentacao import Instrumentacao, medir
+
+
+@dataclass
+class Estagio:
+    """
+    Estágio do pipeline.
+
+    A função recebe os resultados das dependências, na ordem declarada.
+    Estágios de efeito (persistir=False, ex.: exportação) não guardam
+    resultado; registram apenas a impressão da última execução, e são
+    pulados se ela não mudou e o arquivo gerado ainda existe.
+    """
+    nome: str
+    funcao: Callable[..., Any]
+    dependencias: List[str] = field(default_factory=list)
+    versao: Any = 1
+    config: Dict[str, Any] = field(default_factory=dict)
+    persistir: bool = True
+    esquema: Optional[Dict[str, str]] = None
+    arquivo_saida: Optional[str] = None
+
+
+def impressao_config(config: Dict[str, Any]) -> str:
+    """Hash estável de um dict de configuração (listas, dicts, caminhos, ...)"""
+    return combinar_chaves(json.dumps(config, sort_keys=True, ensure_ascii=False, default=str))
+
+
+def _linhas(resultado: Any) -> Optional[int]:
+    return len(resultado) if isinstance(resultado, pd.DataFrame) else None
+
+
+class PipelineEstagios:
+    """
+    DAG de estágios com cache em staging.
+
+    Uso:
+        dag = PipelineEstagios()
+        dag.adicionar(Estagio('bruto', carregar, config={'arquivo': hash_csv}))
+        dag.adicionar(Estagio('padronizado', padronizar, ['bruto'], versao=2))
+        df = dag.executar('padronizado')
+    """
+
+    def __init__(self, instrumentacao: Optional[Instrumentacao] = None):
+        self.instrumentacao = instrumentacao
+        self.estagios: Dict[str, Estagio] = {}
+        self._impressoes: Dict[str, str] = {}
+        self.executados: List[str] = []
+        self.reaproveitados: List[str] = []
+
+    def adicionar(self, estagio: Estagio) -> Estagio:
+        """Registra um estágio (as dependências precisam já estar registradas)"""
+        for dependencia in estagio.dependencias:
+            if dependencia not in self.estagios:
+                raise ValueError(f"Estágio '{estagio.nome}' depende de '{dependencia}', não registrado")
+        self.estagios[estagio.nome] = estagio
+        self._impressoes.clear()
+        return estagio
+
+    def impressao(self, nome: str) -> str:
+        """Impressão digital do estágio: versão + config + impressões das dependências"""
+        if nome not in self._impressoes:
+            estagio = self.estagios[nome]
+            self._impressoes[nome] = combinar_chaves(
+                nome,
+                estagio.versao,
+                impressao_config(estagio.config),
+                estagio.arquivo_saida,
+                *(self.impressao(dep) for dep in estagio.dependencias)
+            )
+        return self._impressoes[nome]
+
+    def executar(self, nome: str, resultados: Optional[Dict[str, Any]] = None) -> Any:
+        """
+        Obtém o resultado de um estágio, executando só o que estiver desatualizado.
+
+        Dependências de um estágio reaproveitado do staging não são carregadas.
+
+        Args:
+            nome: Estágio alvo
+            resultados: Resultados já obtidos nesta execução (memo)
+
+        Returns:
+            Resultado do estágio (None para estágios de efeito)
+        """
+        resultados = {} if resultados is None else resultados
+        if nome in resultados:
+            return resultados[nome]
+
+        estagio = self.estagios[nome]
+        impressao = self.impressao(nome)
+
+        if estagio.persistir and caminho_staging(nome, impressao).exists():
+            with medir(self.instrumentacao, nome) as medicao:
+                medicao.extras['origem'] = 'staging'
+                resultado = carregar_staging(nome, impressao)
+                medicao.linhas_saida = _linhas(resultado)
+            if resultado is not None:
+                print(f"[Estágios] {nome}: reaproveitado ({impressao[:8]})")
+                self.reaproveitados.append(nome)
+                resultados[nome] = resultado
+                return resultado
+        elif not estagio.persistir and self._efeito_atualizado(estagio, impressao):
+            print(f"[Estágios] {nome}: sem alterações ({impressao[:8]})")
+            self.reaproveitados.append(nome)
+            resultados[nome] = None
+            return None
+
+        entradas = []
+        for dependencia in estagio.dependencias:
+            entrada = self.executar(dependencia, resultados)
+            if entrada is None and self.estagios[dependencia].persistir:
+                # Dependência sem resultado (ex.: falha ao ler o CSV) interrompe a cadeia
+                resultados[nome] = None
+                return None
+            # Cópia rasa: o estágio pode acrescentar colunas sem alterar a entrada guardada
+            entradas.append(entrada.copy(deep=False) if isinstance(entrada, pd.DataFrame) else entrada)
+
+        print(f"[Estágios] {nome}: executando ({impressao[:8]})")
+        linhas_entrada = _linhas(entradas[0]) if entradas else None
+        with medir(self.instrumentacao, nome, linhas_entrada) as medicao:
+            medicao.extras['origem'] = 'execucao'
+            resultado = estagio.funcao(*entradas)
+            medicao.linhas_saida = _linhas(resultado)
+        self.executados.append(nome)
+
+        if estagio.persistir:
+            if resultado is not None:
+                # Mesmos tipos da leitura do staging, para a execução seguinte ser idêntica
+                with medir(self.instrumentacao, f"{nome}:staging", _linhas(resultado)):
+                    resultado = aplicar_esquema(resultado, estagio.esquema)
+                    salvar_staging(resultado, nome, impressao, estagio.esquema)
+        else:
+            self._registrar_efeito(estagio, impressao)
+
+        resultados[nome] = resultado
+        return resultado
+
+    def _marcador(self, estagio: Estagio) -> Path:
+        return STAGING_DIR / f"{estagio.nome}.estagio.json"
+
+    def _efeito_atualizado(self, estagio: Estagio, impressao: str) -> bool:
+        marcador = self._marcador(estagio)
+        if not marcador.exists():
+            return False
+        if estagio.arquivo_saida and not Path(estagio.arquivo_saida).exists():
+            return False
+        try:
+            with open(marcador, 'r', encoding='utf-8') as f:
+                return json.load(f).get('impressao') == impressao
+        except (OSError, ValueError):
+            return False
+
+    def _registrar_efeito(self, estagio: Estagio, impressao: str) -> None:
+        marcador = self._marcador(estagio)
+        marcador.parent.mkdir(parents=True, exist_ok=True)
+        with open(marcador, 'w', encoding='utf-8') as f:
+            json.dump({'impressao': impressao, 'arquivo_saida': estagio.arquivo_saida}, f)
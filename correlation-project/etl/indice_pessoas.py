@@ -0,0 +1,457 @@
+"""
+Índice persistente de pessoas para o matching incremental.
+
+Cada exportação mensal traz o histórico inteiro; refazer o matching de tudo
+a cada mês custa horas. O índice guarda, num arquivo SQLite, todos os
+registros já padronizados com suas chaves de matching (hashes uint64 das
+chaves forte/moderada/fonética/fraca e o bloco do fuzzy) e o grupo de pessoa
+de cada um. Numa nova exportação:
+
+    1. as linhas já vistas são descartadas pelo hash do conteúdo bruto
+       (hash_linhas), antes de qualquer padronização;
+    2. só as linhas novas são padronizadas;
+    3. os registros novos são sondados contra o índice: apenas os registros
+       antigos que compartilham alguma chave (ou bloco fuzzy) com eles são
+       lidos, e o MatchingEngine roda sobre esse recorte;
+    4. os pares encontrados atualizam os grupos de pessoa (união-busca),
+       inclusive fundindo grupos antigos ligados por um registro novo.
+
+Uso:
+    with IndicePessoas(INDICE_PESSOAS) as indice:
+        conhecidas = indice.linhas_conhecidas(hashes)
+        resultado = indice.atualizar(df_novos_padronizado, hashes_linhas=hashes[~conhecidas])
+"""
+import json
+import sqlite3
+import sys
+import time
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+# Adicionar diretórios ao path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from config.config import FIELD_MAPPING
+from etl.matching_engine import MatchingEngine, MatchTable, codigo_primeiro_nome
+from etl.padronizacao import VERSAO_PADRONIZACAO, hash_linhas
+from etl.resolucao_entidades import TIPOS_RESOLUCAO, UniaoBusca
+from etl.staging import combinar_chaves
+from utils.fonetica import VERSAO_FONETICA
+from utils.normalization import VERSAO_NORMALIZACAO_NOME
+
+# Versão do esquema do índice: incrementar ao mudá-lo
+VERSAO_INDICE = 1
+
+# Camadas usadas para ligar registros à mesma pessoa (as mesmas de resolver_entidades)
+TIPOS_INDICE = TIPOS_RESOLUCAO
+
+CHAVES_TEXTO = ['chave_forte', 'chave_moderada', 'chave_fonetica', 'chave_fraca']
+CHAVES_HASH = [f'{chave}_hash' for chave in CHAVES_TEXTO]
+
+# Colunas de cada registro guardadas no índice (além de pessoa_id e lote)
+COLUNAS_REGISTRO = [
+    'id_unico', 'natureza', 'nome_normalizado', 'sexo',
+    'ano_nascimento', 'idade_estimativa', 'codigo_nome',
+] + CHAVES_TEXTO + CHAVES_HASH
+
+_COLUNAS_INTEIRAS = ['ano_nascimento', 'idade_estimativa']
+
+
+def impressao_regras() -> str:
+    """
+    Impressão das regras que definem as chaves gravadas no índice.
+
+    Se padronização, normalização de nomes, fonética ou mapeamento de
+    colunas mudarem, as chaves antigas deixam de ser comparáveis às novas
+    e o índice precisa ser reconstruído.
+    """
+    return combinar_chaves(
+        VERSAO_INDICE, VERSAO_PADRONIZACAO, VERSAO_NORMALIZACAO_NOME, VERSAO_FONETICA,
+        json.dumps(FIELD_MAPPING, sort_keys=True, ensure_ascii=False)
+    )
+
+
+def _para_sqlite(valores: np.ndarray) -> np.ndarray:
+    """uint64 -> int64 (mesmos bits), o tipo de inteiro do SQLite"""
+    return np.asarray(valores, dtype=np.uint64).view(np.int64)
+
+
+def _hash_de_sqlite(valores: Sequence[Optional[int]]) -> pd.arrays.IntegerArray:
+    """Coluna de hashes lida do SQLite (int64 ou None) -> UInt64"""
+    ausentes = np.fromiter((v is None for v in valores), dtype=bool, count=len(valores))
+    inteiros = np.fromiter((v or 0 for v in valores), dtype=np.int64, count=len(valores))
+    return pd.arrays.IntegerArray(inteiros.view(np.uint64), ausentes)
+
+
+class IndicePessoas:
+    """
+    Índice SQLite de registros padronizados e seus grupos de pessoa.
+
+    Tabelas:
+        - registros: um registro por id_unico, com chaves, hashes e pessoa_id
+        - linhas: hashes das linhas brutas já incorporadas
+        - meta: impressão das regras e o próximo pessoa_id livre
+    """
+
+    def __init__(self, caminho: str, reconstruir: bool = False):
+        """
+        Args:
+            caminho: Arquivo SQLite (criado se não existir)
+            reconstruir: Apaga o índice existente e começa do zero
+        """
+        self.caminho = Path(caminho)
+        self.caminho.parent.mkdir(parents=True, exist_ok=True)
+        if reconstruir:
+            for arquivo in (self.caminho, Path(f'{self.caminho}-wal'), Path(f'{self.caminho}-shm')):
+                if arquivo.exists():
+                    arquivo.unlink()
+
+        self._conexao = sqlite3.connect(str(self.caminho))
+        self._conexao.execute('PRAGMA journal_mode=WAL')
+        self._conexao.execute('PRAGMA synchronous=NORMAL')
+        self._criar_tabelas()
+
+    def _criar_tabelas(self) -> None:
+        colunas_texto = ', '.join(
+            f'{c} TEXT' for c in COLUNAS_REGISTRO[1:]
+            if c not in _COLUNAS_INTEIRAS and c not in CHAVES_HASH
+        )
+        colunas_inteiras = ', '.join(f'{c} INTEGER' for c in _COLUNAS_INTEIRAS + CHAVES_HASH)
+        self._conexao.execute(
+            'CREATE TABLE IF NOT EXISTS registros ('
+            ' id_unico TEXT PRIMARY KEY,'
+            ' pessoa_id INTEGER NOT NULL,'
+            f' {colunas_texto}, {colunas_inteiras},'
+            ' lote TEXT,'
+            ' incluido_em REAL NOT NULL)'
+        )
+        for coluna in CHAVES_HASH + ['pessoa_id']:
+            self._conexao.execute(
+                f'CREATE INDEX IF NOT EXISTS idx_registros_{coluna} ON registros ({coluna})'
+            )
+        self._conexao.execute(
+            'CREATE INDEX IF NOT EXISTS idx_registros_bloco'
+            ' ON registros (codigo_nome, ano_nascimento)'
+        )
+        self._conexao.execute(
+            'CREATE TABLE IF NOT EXISTS linhas (hash INTEGER PRIMARY KEY) WITHOUT ROWID'
+        )
+        self._conexao.execute(
+            'CREATE TABLE IF NOT EXISTS meta (chave TEXT PRIMARY KEY, valor TEXT NOT NULL)'
+        )
+        self._conexao.execute(
+            "INSERT OR IGNORE INTO meta VALUES ('regras', ?)", (impressao_regras(),)
+        )
+        self._conexao.execute("INSERT OR IGNORE INTO meta VALUES ('proxima_pessoa', '0')")
+        self._conexao.commit()
+
+    def _meta(self, chave: str) -> Optional[str]:
+        linha = self._conexao.execute('SELECT valor FROM meta WHERE chave = ?', (chave,)).fetchone()
+        return linha[0] if linha else None
+
+    def compativel(self) -> bool:
+        """True se o índice foi gerado pelas regras atuais de padronização"""
+        return self._meta('regras') == impressao_regras()
+
+    def linhas_conhecidas(self, hashes: np.ndarray) -> np.ndarray:
+        """
+        Marca as linhas brutas já incorporadas ao índice.
+
+        Args:
+            hashes: Resultado de hash_linhas
+
+        Returns:
+            Array bool alinhado a hashes
+        """
+        total = self._conexao.execute('SELECT COUNT(*) FROM linhas').fetchone()[0]
+        conhecidos = np.fromiter(
+            (h for (h,) in self._conexao.execute('SELECT hash FROM linhas')),
+            dtype=np.int64, count=total
+        )
+        return np.isin(_para_sqlite(hashes), conhecidos)
+
+    def _candidatos(self, novos: pd.DataFrame) -> pd.DataFrame:
+        """
+        Registros do índice que compartilham alguma chave ou bloco fuzzy com os novos.
+
+        As chaves dos novos vão para tabelas temporárias e cada coluna de hash
+        é consultada pelo seu índice; o resto da base não é lido.
+        """
+        self._conexao.execute('CREATE TEMP TABLE IF NOT EXISTS sonda_hash (h INTEGER PRIMARY KEY)')
+        self._conexao.execute(
+            'CREATE TEMP TABLE IF NOT EXISTS sonda_bloco ('
+            ' codigo_nome TEXT, ano_nascimento INTEGER,'
+            ' PRIMARY KEY (codigo_nome, ano_nascimento))'
+        )
+        self._conexao.execute('DELETE FROM sonda_hash')
+        self._conexao.execute('DELETE FROM sonda_bloco')
+
+        hashes = pd.concat([novos[col].dropna() for col in CHAVES_HASH]).unique()
+        self._conexao.executemany(
+            'INSERT OR IGNORE INTO sonda_hash VALUES (?)',
+            ((int(h),) for h in _para_sqlite(np.asarray(hashes, dtype=np.uint64)))
+        )
+        blocos = novos.loc[
+            novos['codigo_nome'].notna() & novos['ano_nascimento'].notna(),
+            ['codigo_nome', 'ano_nascimento']
+        ].drop_duplicates()
+        self._conexao.executemany(
+            'INSERT OR IGNORE INTO sonda_bloco VALUES (?, ?)',
+            ((c, int(a)) for c, a in blocos.itertuples(index=False))
+        )
+
+        subconsultas = [
+            f'SELECT rowid FROM registros WHERE {col} IN (SELECT h FROM sonda_hash)'
+            for col in CHAVES_HASH
+        ]
+        subconsultas.append(
+            'SELECT r.rowid FROM sonda_bloco s JOIN registros r'
+            ' ON r.codigo_nome = s.codigo_nome AND r.ano_nascimento = s.ano_nascimento'
+        )
+        colunas = ['pessoa_id'] + COLUNAS_REGISTRO
+        cursor = self._conexao.execute(
+            f"SELECT {', '.join(colunas)} FROM registros"
+            f" WHERE rowid IN ({' UNION '.join(subconsultas)})"
+        )
+        linhas = cursor.fetchall()
+
+        valores = dict(zip(colunas, map(list, zip(*linhas)))) if linhas else {c: [] for c in colunas}
+        df = pd.DataFrame({
+            c: (
+                _hash_de_sqlite(valores[c]) if c in CHAVES_HASH
+                else pd.array(valores[c], dtype='Int64') if c in _COLUNAS_INTEIRAS
+                else pd.Series(valores[c], dtype=object)
+            )
+            for c in colunas
+        })
+        df['pessoa_id'] = df['pessoa_id'].astype('int64')
+        return df
+
+    @staticmethod
+    def _preparar_novos(novos: pd.DataFrame) -> pd.DataFrame:
+        """Recorte dos novos registros com as colunas guardadas no índice"""
+        novos = novos.drop_duplicates('id_unico', keep='last')
+        df = pd.DataFrame(index=novos.index)
+        for coluna in COLUNAS_REGISTRO:
+            if coluna in novos.columns:
+                df[coluna] = novos[coluna]
+            elif coluna == 'codigo_nome':
+                continue
+            else:
+                df[coluna] = None
+        df['sexo'] = df['sexo'].fillna('IGN')
+        for coluna in _COLUNAS_INTEIRAS:
+            df[coluna] = pd.to_numeric(df[coluna], errors='coerce').astype('Int64')
+        for coluna in CHAVES_HASH:
+            df[coluna] = df[coluna].astype('UInt64')
+
+        # Bloco do fuzzy: código do primeiro nome, uma vez por nome distinto
+        nomes = df['nome_normalizado'].where(df['nome_normalizado'] != '')
+        distintos = nomes.dropna().unique()
+        codigos = {nome: codigo_primeiro_nome(nome) or None for nome in distintos}
+        df['codigo_nome'] = nomes.map(codigos).astype(object)
+        return df.reset_index(drop=True)
+
+    def _parear(self, novos: pd.DataFrame, base: pd.DataFrame, tipos: List[str]) -> MatchTable:
+        """
+        Matching dos novos contra a base (candidatos + os próprios novos).
+
+        Diferente de executar_matching_completo, uma camada não exclui os
+        registros já pareados nas anteriores: cada par depende só dos dois
+        registros, então os grupos não dependem da ordem de chegada e a carga
+        incremental dá o mesmo resultado que reconstruir o índice de uma vez.
+        Como os novos também estão na base, os pares de um registro consigo
+        mesmo são descartados.
+        """
+        engine = MatchingEngine()
+        metodos = {
+            'forte': engine.fazer_match_forte,
+            'moderado': engine.fazer_match_moderado,
+            'fonetico': engine.fazer_match_fonetico,
+            'fraco': engine.fazer_match_fraco,
+            'fuzzy': engine.fazer_match_fuzzy,
+        }
+        tabelas = []
+        for tipo in tipos:
+            tabela = metodos[tipo](novos, base).df
+            tabelas.append(MatchTable(tabela[tabela['id_origem'] != tabela['id_destino']]))
+
+        return MatchTable.concatenar(tabelas)
+
+    def atualizar(
+        self,
+        novos: pd.DataFrame,
+        hashes_linhas: Optional[np.ndarray] = None,
+        tipos: Optional[List[str]] = None,
+        lote: Optional[str] = None
+    ) -> Dict:
+        """
+        Sonda os registros novos contra o índice e os incorpora.
+
+        Registros cujo id_unico já está no índice (linha corrigida na
+        exportação) são substituídos e continuam ligados ao grupo anterior.
+
+        Args:
+            novos: Registros novos já padronizados (pipeline_padronizacao_completa)
+            hashes_linhas: Hashes das linhas brutas correspondentes, marcadas como vistas
+            tipos: Camadas de matching (default: TIPOS_INDICE)
+            lote: Identificação da carga (ex.: nome do arquivo), guardada em cada registro
+
+        Returns:
+            Dict com 'matches' (MatchTable dos pares novos), 'pessoas'
+            (DataFrame id_unico -> pessoa_id dos novos), 'fusoes' (grupos
+            antigos absorvidos por outro) e 'candidatos' (registros lidos do índice)
+        """
+        print("\n[Índice] Sondando registros novos contra o índice de pessoas...")
+        tipos = TIPOS_INDICE if tipos is None else tipos
+
+        novos = self._preparar_novos(novos)
+        candidatos = self._candidatos(novos)
+        print(f"[Índice] Novos: {len(novos):,} | candidatos lidos do índice: {len(candidatos):,}")
+
+        # Versões antigas de registros reenviados: saem da base, mas o grupo fica
+        reenviados = candidatos[candidatos['id_unico'].isin(novos['id_unico'])]
+        candidatos = candidatos[~candidatos['id_unico'].isin(novos['id_unico'])]
+
+        base = pd.concat([candidatos[COLUNAS_REGISTRO], novos], ignore_index=True)
+        matches = self._parear(novos, base, tipos)
+
+        # Nós da união-busca: novos (0..n-1) e grupos antigos envolvidos (n..)
+        n = len(novos)
+        grupos_antigos = pd.Index(pd.unique(pd.concat([
+            candidatos['pessoa_id'], reenviados['pessoa_id']
+        ])))
+        no_por_id = pd.concat([
+            pd.Series(np.arange(n), index=novos['id_unico'].to_numpy()),
+            pd.Series(
+                n + grupos_antigos.get_indexer(candidatos['pessoa_id']),
+                index=candidatos['id_unico'].to_numpy()
+            ),
+        ])
+
+        conjuntos = UniaoBusca(n + len(grupos_antigos))
+        conjuntos.unir_pares(
+            no_por_id.reindex(matches.ids_origem).to_numpy(),
+            no_por_id.reindex(matches.ids_destino).to_numpy()
+        )
+        conjuntos.unir_pares(
+            no_por_id.reindex(reenviados['id_unico']).to_numpy(),
+            n + grupos_antigos.get_indexer(reenviados['pessoa_id'])
+        )
+        raizes = conjuntos.raizes()
+
+        # Cada componente fica com o menor pessoa_id antigo; sem antigo, ganha um novo
+        antigos = pd.DataFrame({'raiz': raizes[n:], 'pessoa_id': grupos_antigos.to_numpy()})
+        representante = antigos.groupby('raiz')['pessoa_id'].min()
+        antigos['destino'] = antigos['raiz'].map(representante)
+        fusoes = antigos[antigos['pessoa_id'] != antigos['destino']]
+
+        pessoa_novos = pd.Series(raizes[:n]).map(representante)
+        sem_grupo = pessoa_novos.isna()
+        proxima = int(self._meta('proxima_pessoa'))
+        codigos, _ = pd.factorize(pd.Series(raizes[:n])[sem_grupo])
+        pessoa_novos[sem_grupo] = proxima + codigos
+        proxima += len(np.unique(codigos))
+        novos['pessoa_id'] = pessoa_novos.astype('int64').to_numpy()
+
+        self._gravar(novos, fusoes, proxima, hashes_linhas, lote)
+
+        print(f"[Índice] Pares encontrados: {len(matches):,}")
+        print(f"[Índice] Registros ligados a pessoas já conhecidas: "
+              f"{int((~sem_grupo).sum()):,} | pessoas novas: {len(np.unique(codigos)):,}")
+        print(f"[Índice] Grupos antigos fundidos: {len(fusoes):,}")
+
+        return {
+            'matches': matches,
+            'pessoas': novos[['id_unico', 'pessoa_id']],
+            'fusoes': len(fusoes),
+            'candidatos': len(candidatos),
+        }
+
+    def _gravar(
+        self,
+        novos: pd.DataFrame,
+        fusoes: pd.DataFrame,
+        proxima: int,
+        hashes_linhas: Optional[np.ndarray],
+        lote: Optional[str]
+    ) -> None:
+        """Grava registros, fusões de grupos, linhas vistas e contador em uma transação"""
+        tabela = novos[['pessoa_id'] + COLUNAS_REGISTRO].astype(object)
+        for coluna in CHAVES_HASH:
+            valores = novos[coluna]
+            tabela[coluna] = pd.Series(
+                _para_sqlite(valores.fillna(0).to_numpy(dtype=np.uint64)), dtype=object
+            ).where(valores.notna().to_numpy(), None).to_numpy()
+        tabela = tabela.where(tabela.notna(), None)
+        tabela['lote'] = lote
+        tabela['incluido_em'] = time.time()
+
+        colunas = list(tabela.columns)
+        with self._conexao:
+            self._conexao.executemany(
+                f"INSERT OR REPLACE INTO registros ({', '.join(colunas)})"
+                f" VALUES ({', '.join('?' * len(colunas))})",
+                tabela.itertuples(index=False, name=None)
+            )
+            self._conexao.executemany(
+                'UPDATE registros SET pessoa_id = ? WHERE pessoa_id = ?',
+                [(int(d), int(p)) for d, p in zip(fusoes['destino'], fusoes['pessoa_id'])]
+            )
+            if hashes_linhas is not None:
+                self._conexao.executemany(
+                    'INSERT OR IGNORE INTO linhas VALUES (?)',
+                    ((int(h),) for h in _para_sqlite(hashes_linhas))
+                )
+            self._conexao.execute(
+                "UPDATE meta SET valor = ? WHERE chave = 'proxima_pessoa'", (str(proxima),)
+            )
+
+    def pessoas(self, ids: Optional[Sequence[str]] = None) -> pd.DataFrame:
+        """
+        Grupo de pessoa de cada registro do índice.
+
+        Args:
+            ids: Restringe aos IDs informados (default: todos)
+
+        Returns:
+            DataFrame com id_unico e pessoa_id
+        """
+        consulta = 'SELECT id_unico, pessoa_id FROM registros'
+        if ids is None:
+            linhas = self._conexao.execute(consulta).fetchall()
+        else:
+            self._conexao.execute('CREATE TEMP TABLE IF NOT EXISTS sonda_id (id TEXT PRIMARY KEY)')
+            self._conexao.execute('DELETE FROM sonda_id')
+            self._conexao.executemany(
+                'INSERT OR IGNORE INTO sonda_id VALUES (?)', ((str(i),) for i in ids)
+            )
+            linhas = self._conexao.execute(
+                consulta + ' WHERE id_unico IN (SELECT id FROM sonda_id)'
+            ).fetchall()
+        return pd.DataFrame(linhas, columns=['id_unico', 'pessoa_id'])
+
+    def estatisticas(self) -> Dict:
+        """Tamanho do índice: registros, pessoas e linhas brutas já vistas"""
+        registros, pessoas = self._conexao.execute(
+            'SELECT COUNT(*), COUNT(DISTINCT pessoa_id) FROM registros'
+        ).fetchone()
+        linhas = self._conexao.execute('SELECT COUNT(*) FROM linhas').fetchone()[0]
+        return {
+            'registros': registros,
+            'pessoas': pessoas,
+            'linhas_vistas': linhas,
+            'compativel': self.compativel(),
+        }
+
+    def fechar(self) -> None:
+        self._conexao.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.fechar()
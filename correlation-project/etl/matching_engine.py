@@ -1,26 +1,246 @@
 """Engine de matching entre bases de dados"""
 import pandas as pd
-from typing import Dict, List, Tuple, Optional, Set
+import sys
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Tuple, Optional, Set
 from dataclasses import dataclass
 
+# Adicionar diretórios ao path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from utils.fonetica import codificar_palavra
+from utils.similaridade import similaridade_nomes_em_lote
+
 
 @dataclass
 class MatchResult:
     """Resultado de um match"""
     id_origem: str
     id_destino: str
-    tipo_match: str  # 'forte', 'moderado', 'fraco'
+    tipo_match: str  # 'forte', 'moderado', 'fonetico', 'fraco', 'fuzzy'
     chave_usada: str
     confianca: float  # 0.0 a 1.0
 
 
+# Colunas e tipos da tabela colunar de matches
+COLUNAS_MATCH = ['id_origem', 'id_destino', 'tipo_match', 'chave_usada', 'confianca']
+TIPOS_MATCH = ['forte', 'moderado', 'fonetico', 'fraco', 'fuzzy']
+
+# Match fuzzy: similaridade mínima do nome e fator aplicado a ela na confiança
+LIMIAR_FUZZY = 0.92
+FATOR_CONFIANCA_FUZZY = 0.6
+
+
+class MatchTable:
+    """
+    Armazena matches em formato colunar (DataFrame), um registro por par.
+    
+    Colunas:
+        - id_origem / id_destino: IDs dos registros pareados
+        - tipo_match: Categorical com os tipos em TIPOS_MATCH
+        - chave_usada: chave que gerou o match
+        - confianca: float64 (0.0 a 1.0)
+    
+    A API de MatchResult continua disponível como visão preguiçosa:
+    iterar ou indexar a tabela cria os objetos apenas sob demanda.
+    """
+    
+    def __init__(self, df: Optional[pd.DataFrame] = None):
+        if df is None:
+            df = pd.DataFrame({col: pd.Series(dtype=object) for col in COLUNAS_MATCH})
+        self.df = self._tipar(df[COLUNAS_MATCH].reset_index(drop=True))
+    
+    @staticmethod
+    def _tipar(df: pd.DataFrame) -> pd.DataFrame:
+        """Aplica os tipos definitivos às colunas"""
+        return df.astype({
+            'tipo_match': pd.CategoricalDtype(TIPOS_MATCH),
+            'confianca': 'float64',
+        })
+    
+    @classmethod
+    def de_pares(
+        cls,
+        ids_origem: pd.Series,
+        ids_destino: pd.Series,
+        chaves: pd.Series,
+        tipo_match: str,
+        confianca: float
+    ) -> 'MatchTable':
+        """
+        Cria a tabela a partir de colunas já alinhadas (ex.: resultado de pd.merge).
+        
+        Args:
+            ids_origem: IDs da origem
+            ids_destino: IDs do destino
+            chaves: Chave usada em cada par
+            tipo_match: Um dos TIPOS_MATCH
+            confianca: Confiança atribuída a todos os pares
+        """
+        df = pd.DataFrame({
+            'id_origem': ids_origem.to_numpy(),
+            'id_destino': ids_destino.to_numpy(),
+            'tipo_match': tipo_match,
+            'chave_usada': chaves.to_numpy(),
+            'confianca': confianca,
+        })
+        return cls(df)
+    
+    @classmethod
+    def concatenar(cls, tabelas: Iterable['MatchTable']) -> 'MatchTable':
+        """Concatena várias tabelas de matches em uma só"""
+        dfs = [t.df for t in tabelas if len(t)]
+        if not dfs:
+            return cls()
+        return cls(pd.concat(dfs, ignore_index=True))
+    
+    def __len__(self) -> int:
+        return len(self.df)
+    
+    def __iter__(self) -> Iterator[MatchResult]:
+        for linha in self.df.itertuples(index=False):
+            yield MatchResult(
+                id_origem=linha.id_origem,
+                id_destino=linha.id_destino,
+                tipo_match=linha.tipo_match,
+                chave_usada=linha.chave_usada,
+                confianca=float(linha.confianca)
+            )
+    
+    def __getitem__(self, posicao: int) -> MatchResult:
+        linha = self.df.iloc[posicao]
+        return MatchResult(
+            id_origem=linha['id_origem'],
+            id_destino=linha['id_destino'],
+            tipo_match=linha['tipo_match'],
+            chave_usada=linha['chave_usada'],
+            confianca=float(linha['confianca'])
+        )
+    
+    def __add__(self, outra: 'MatchTable') -> 'MatchTable':
+        return MatchTable.concatenar([self, outra])
+    
+    @property
+    def ids_origem(self) -> pd.Series:
+        """IDs de origem presentes na tabela"""
+        return self.df['id_origem']
+    
+    @property
+    def ids_destino(self) -> pd.Series:
+        """IDs de destino presentes na tabela"""
+        return self.df['id_destino']
+    
+    def para_lista(self) -> List[MatchResult]:
+        """Materializa todos os matches como lista de MatchResult"""
+        return list(self)
+
+
+def _coluna_juncao(df_origem: pd.DataFrame, df_destino: pd.DataFrame, col_chave: str) -> str:
+    """
+    Define a coluna usada no join: a versão uint64 da chave (col_chave + '_hash')
+    quando existe nos dois lados, senão a própria chave em texto.
+    """
+    col_hash = f'{col_chave}_hash'
+    if col_hash in df_origem.columns and col_hash in df_destino.columns:
+        return col_hash
+    return col_chave
+
+
+def _preparar_lado(
+    df: pd.DataFrame,
+    col_chave: str,
+    col_id: str,
+    nome_id: str,
+    col_juncao: Optional[str] = None,
+    manter_chave: bool = True,
+    colunas_extras: Optional[List[str]] = None,
+    excluir_ids: Optional[Iterable] = None
+) -> pd.DataFrame:
+    """
+    Seleciona apenas as colunas necessárias para o merge, já renomeando o ID.
+    
+    Evita copiar o DataFrame inteiro e o conflito de nomes quando origem e
+    destino usam a mesma coluna de ID (ex.: 'id_unico'). Quando o join é feito
+    pelo hash, a chave em texto só é mantida em um dos lados (para relatório).
+    """
+    col_juncao = col_juncao or col_chave
+    
+    mask = df[col_chave].notna()
+    if col_juncao != col_chave:
+        mask &= df[col_juncao].notna()
+    if excluir_ids is not None and len(excluir_ids) > 0:
+        mask &= ~df[col_id].isin(excluir_ids)
+    
+    colunas = [col_id, col_juncao]
+    if manter_chave and col_juncao != col_chave:
+        colunas.append(col_chave)
+    colunas += colunas_extras or []
+    
+    lado = df.loc[mask, colunas].rename(columns={col_id: nome_id})
+    if col_juncao != col_chave:
+        # Sem nulos após o filtro: uint64 puro é mais rápido no merge
+        lado[col_juncao] = lado[col_juncao].to_numpy(dtype='uint64')
+    
+    return lado
+
+
+def codigo_primeiro_nome(nome: str) -> str:
+    """
+    Código de bloco do primeiro nome: seu código fonético (utils.fonetica).
+
+    Variações de grafia ('luis'/'luiz', 'thiago'/'tiago', 'walter'/'valter')
+    caem no mesmo bloco.
+    """
+    partes = nome.split(maxsplit=1)
+    return codificar_palavra(partes[0]) if partes else ''
+
+
+def _preparar_lado_fuzzy(
+    df: pd.DataFrame,
+    col_nome: str,
+    col_id: str,
+    nome_id: str,
+    excluir_ids: Optional[Iterable] = None
+) -> pd.DataFrame:
+    """
+    Registros com nome e ano de nascimento, com as colunas de bloco.
+
+    Sexo ignorado ('IGN') não pode restringir o bloco: o registro é
+    repetido nos blocos 'M' e 'F'.
+    """
+    mask = df[col_nome].notna() & (df[col_nome] != '') & df['ano_nascimento'].notna()
+    if excluir_ids is not None and len(excluir_ids) > 0:
+        mask &= ~df[col_id].isin(excluir_ids)
+
+    colunas = [col_id, col_nome, 'ano_nascimento', 'sexo']
+    lado = df.loc[mask, colunas].rename(columns={col_id: nome_id, col_nome: 'nome'})
+    lado['ano_nascimento'] = lado['ano_nascimento'].astype('int64')
+
+    # Código calculado uma vez por nome distinto
+    nomes = lado['nome'].drop_duplicates()
+    codigos = pd.Series([codigo_primeiro_nome(n) for n in nomes], index=nomes.to_numpy())
+    lado['codigo_nome'] = lado['nome'].map(codigos)
+
+    sexo = lado['sexo'].where(lado['sexo'].isin(['M', 'F']), 'IGN')
+    ignorado = sexo == 'IGN'
+    lado['sexo_bloco'] = sexo
+    if ignorado.any():
+        masculino = lado[ignorado].assign(sexo_bloco='M')
+        lado = pd.concat([lado[~ignorado], masculino, masculino.assign(sexo_bloco='F')])
+
+    return lado.drop(columns='sexo')
+
+
 class MatchingEngine:
     """Engine para fazer matching entre datasets"""
     
     def __init__(self):
-        self.matches_fortes: List[MatchResult] = []
-        self.matches_moderados: List[MatchResult] = []
-        self.matches_fracos: List[MatchResult] = []
+        self.matches_fortes = MatchTable()
+        self.matches_moderados = MatchTable()
+        self.matches_foneticos = MatchTable()
+        self.matches_fracos = MatchTable()
+        self.matches_fuzzy = MatchTable()
+        self.estatisticas_fuzzy: Dict[str, float] = {}
     
     def fazer_match_forte(
         self, 
@@ -29,7 +249,7 @@ class MatchingEngine:
         col_chave: str = 'chave_forte',
         col_id_origem: str = 'id_unico',
         col_id_destino: str = 'id_unico'
-    ) -> List[MatchResult]:
+    ) -> MatchTable:
         """
         Faz match forte (nome + data nascimento completa).
         
@@ -41,81 +261,73 @@ class MatchingEngine:
             col_id_destino: Nome da coluna com ID no destino
         
         Returns:
-            Lista de MatchResult
+            MatchTable com os pares encontrados
         """
-        matches = []
+        col_juncao = _coluna_juncao(df_origem, df_destino, col_chave)
         
         # Filtrar registros com chave forte
-        df_origem_com_chave = df_origem[df_origem[col_chave].notna()].copy()
-        df_destino_com_chave = df_destino[df_destino[col_chave].notna()].copy()
+        df_origem_com_chave = _preparar_lado(
+            df_origem, col_chave, col_id_origem, 'id_origem', col_juncao=col_juncao
+        )
+        df_destino_com_chave = _preparar_lado(
+            df_destino, col_chave, col_id_destino, 'id_destino',
+            col_juncao=col_juncao, manter_chave=False
+        )
         
         print(f"[Match Forte] Origem: {len(df_origem_com_chave)} registros com chave")
         print(f"[Match Forte] Destino: {len(df_destino_com_chave)} registros com chave")
         
         # Fazer merge
         merged = pd.merge(
-            df_origem_com_chave[[col_id_origem, col_chave]],
-            df_destino_com_chave[[col_id_destino, col_chave]],
-            on=col_chave,
+            df_origem_com_chave,
+            df_destino_com_chave,
+            on=col_juncao,
             how='inner'
         )
         
         print(f"[Match Forte] Encontrados {len(merged)} matches")
         
-        # Converter para MatchResult
-        for _, row in merged.iterrows():
-            match = MatchResult(
-                id_origem=row[col_id_origem],
-                id_destino=row[col_id_destino],
-                tipo_match='forte',
-                chave_usada=row[col_chave],
-                confianca=0.95
-            )
-            matches.append(match)
-            self.matches_fortes.append(match)
+        matches = MatchTable.de_pares(
+            merged['id_origem'], merged['id_destino'], merged[col_chave],
+            tipo_match='forte', confianca=0.95
+        )
+        self.matches_fortes = self.matches_fortes + matches
         
         return matches
     
-    def fazer_match_moderado(
+    def _match_com_sexo(
         self,
         df_origem: pd.DataFrame,
         df_destino: pd.DataFrame,
-        col_chave: str = 'chave_moderada',
-        col_id_origem: str = 'id_unico',
-        col_id_destino: str = 'id_unico',
-        excluir_ids_origem: set = None,
-        excluir_ids_destino: set = None
-    ) -> List[MatchResult]:
-        """
-        Faz match moderado (nome + ano nascimento).
-        Exclui registros que já tiveram match forte.
-        """
-        matches = []
+        col_chave: str,
+        col_id_origem: str,
+        col_id_destino: str,
+        excluir_ids_origem: Optional[Iterable],
+        excluir_ids_destino: Optional[Iterable],
+        rotulo: str
+    ) -> pd.DataFrame:
+        """Join pela chave, excluindo IDs já pareados e exigindo sexo compatível"""
+        col_juncao = _coluna_juncao(df_origem, df_destino, col_chave)
         
         # Filtrar registros já matchados
-        if excluir_ids_origem is None:
-            excluir_ids_origem = set()
-        if excluir_ids_destino is None:
-            excluir_ids_destino = set()
-        
-        df_origem_filtrado = df_origem[
-            (df_origem[col_chave].notna()) &
-            (~df_origem[col_id_origem].isin(excluir_ids_origem))
-        ].copy()
-        
-        df_destino_filtrado = df_destino[
-            (df_destino[col_chave].notna()) &
-            (~df_destino[col_id_destino].isin(excluir_ids_destino))
-        ].copy()
+        df_origem_filtrado = _preparar_lado(
+            df_origem, col_chave, col_id_origem, 'id_origem', col_juncao=col_juncao,
+            colunas_extras=['sexo'], excluir_ids=excluir_ids_origem
+        )
+        df_destino_filtrado = _preparar_lado(
+            df_destino, col_chave, col_id_destino, 'id_destino',
+            col_juncao=col_juncao, manter_chave=False,
+            colunas_extras=['sexo'], excluir_ids=excluir_ids_destino
+        )
         
-        print(f"[Match Moderado] Origem: {len(df_origem_filtrado)} registros disponíveis")
-        print(f"[Match Moderado] Destino: {len(df_destino_filtrado)} registros disponíveis")
+        print(f"[Match {rotulo}] Origem: {len(df_origem_filtrado)} registros disponíveis")
+        print(f"[Match {rotulo}] Destino: {len(df_destino_filtrado)} registros disponíveis")
         
         # Fazer merge
         merged = pd.merge(
-            df_origem_filtrado[[col_id_origem, col_chave, 'sexo']],
-            df_destino_filtrado[[col_id_destino, col_chave, 'sexo']],
-            on=col_chave,
+            df_origem_filtrado,
+            df_destino_filtrado,
+            on=col_juncao,
             how='inner',
             suffixes=('_origem', '_destino')
         )
@@ -127,18 +339,62 @@ class MatchingEngine:
             (merged['sexo_destino'] == 'IGN')
         ]
         
-        print(f"[Match Moderado] Encontrados {len(merged)} matches")
+        print(f"[Match {rotulo}] Encontrados {len(merged)} matches")
+        return merged
+    
+    def fazer_match_moderado(
+        self,
+        df_origem: pd.DataFrame,
+        df_destino: pd.DataFrame,
+        col_chave: str = 'chave_moderada',
+        col_id_origem: str = 'id_unico',
+        col_id_destino: str = 'id_unico',
+        excluir_ids_origem: Optional[Iterable] = None,
+        excluir_ids_destino: Optional[Iterable] = None
+    ) -> MatchTable:
+        """
+        Faz match moderado (nome + ano nascimento).
+        Exclui registros que já tiveram match forte.
+        """
+        merged = self._match_com_sexo(
+            df_origem, df_destino, col_chave, col_id_origem, col_id_destino,
+            excluir_ids_origem, excluir_ids_destino, 'Moderado'
+        )
         
-        for _, row in merged.iterrows():
-            match = MatchResult(
-                id_origem=row[col_id_origem],
-                id_destino=row[col_id_destino],
-                tipo_match='moderado',
-                chave_usada=row[col_chave],
-                confianca=0.75
-            )
-            matches.append(match)
-            self.matches_moderados.append(match)
+        matches = MatchTable.de_pares(
+            merged['id_origem'], merged['id_destino'], merged[col_chave],
+            tipo_match='moderado', confianca=0.75
+        )
+        self.matches_moderados = self.matches_moderados + matches
+        
+        return matches
+    
+    def fazer_match_fonetico(
+        self,
+        df_origem: pd.DataFrame,
+        df_destino: pd.DataFrame,
+        col_chave: str = 'chave_fonetica',
+        col_id_origem: str = 'id_unico',
+        col_id_destino: str = 'id_unico',
+        excluir_ids_origem: Optional[Iterable] = None,
+        excluir_ids_destino: Optional[Iterable] = None
+    ) -> MatchTable:
+        """
+        Faz match fonético (código fonético do nome + ano nascimento).
+        
+        Pareia grafias diferentes do mesmo nome ('Luiz Souza'/'Luis Sousa')
+        que as chaves exatas não pegam. Exclui registros já pareados.
+        """
+        merged = self._match_com_sexo(
+            df_origem, df_destino, col_chave, col_id_origem, col_id_destino,
+            excluir_ids_origem, excluir_ids_destino, 'Fonético'
+        )
+        
+        matches = MatchTable.de_pares(
+            merged['id_origem'], merged['id_destino'], merged[col_chave],
+            tipo_match='fonetico', confianca=0.65
+        )
+        self.matches_foneticos = self.matches_foneticos + matches
         
         return matches
     
@@ -149,47 +405,42 @@ class MatchingEngine:
         col_chave: str = 'chave_fraca',
         col_id_origem: str = 'id_unico',
         col_id_destino: str = 'id_unico',
-        excluir_ids_origem: Optional[Set] = None,
-        excluir_ids_destino: Optional[Set] = None,
+        excluir_ids_origem: Optional[Iterable] = None,
+        excluir_ids_destino: Optional[Iterable] = None,
         validar_idade: bool = True
-    ) -> List[MatchResult]:
+    ) -> MatchTable:
         """
         Faz match fraco (apenas nome).
         Exclui registros já matchados e valida idade se possível.
         """
-        matches = []
+        # Preparar colunas para merge
+        extras_origem = ['sexo']
+        extras_destino = ['sexo']
         
-        if excluir_ids_origem is None:
-            excluir_ids_origem = set()
-        if excluir_ids_destino is None:
-            excluir_ids_destino = set()
+        if validar_idade and 'idade_estimativa' in df_origem.columns:
+            extras_origem.append('idade_estimativa')
+        if validar_idade and 'idade_estimativa' in df_destino.columns:
+            extras_destino.append('idade_estimativa')
         
-        df_origem_filtrado = df_origem[
-            (df_origem[col_chave].notna()) &
-            (~df_origem[col_id_origem].isin(excluir_ids_origem))
-        ].copy()
+        col_juncao = _coluna_juncao(df_origem, df_destino, col_chave)
         
-        df_destino_filtrado = df_destino[
-            (df_destino[col_chave].notna()) &
-            (~df_destino[col_id_destino].isin(excluir_ids_destino))
-        ].copy()
+        df_origem_filtrado = _preparar_lado(
+            df_origem, col_chave, col_id_origem, 'id_origem', col_juncao=col_juncao,
+            colunas_extras=extras_origem, excluir_ids=excluir_ids_origem
+        )
+        df_destino_filtrado = _preparar_lado(
+            df_destino, col_chave, col_id_destino, 'id_destino',
+            col_juncao=col_juncao, manter_chave=False,
+            colunas_extras=extras_destino, excluir_ids=excluir_ids_destino
+        )
         
         print(f"[Match Fraco] Origem: {len(df_origem_filtrado)} registros disponíveis")
         print(f"[Match Fraco] Destino: {len(df_destino_filtrado)} registros disponíveis")
         
-        # Preparar colunas para merge
-        cols_origem = [col_id_origem, col_chave, 'sexo']
-        cols_destino = [col_id_destino, col_chave, 'sexo']
-        
-        if validar_idade and 'idade_estimativa' in df_origem.columns:
-            cols_origem.append('idade_estimativa')
-        if validar_idade and 'idade_estimativa' in df_destino.columns:
-            cols_destino.append('idade_estimativa')
-        
         merged = pd.merge(
-            df_origem_filtrado[cols_origem],
-            df_destino_filtrado[cols_destino],
-            on=col_chave,
+            df_origem_filtrado,
+            df_destino_filtrado,
+            on=col_juncao,
             how='inner',
             suffixes=('_origem', '_destino')
         )
@@ -211,16 +462,111 @@ class MatchingEngine:
         
         print(f"[Match Fraco] Encontrados {len(merged)} matches após validações")
         
-        for _, row in merged.iterrows():
-            match = MatchResult(
-                id_origem=row[col_id_origem],
-                id_destino=row[col_id_destino],
-                tipo_match='fraco',
-                chave_usada=row[col_chave],
-                confianca=0.50
-            )
-            matches.append(match)
-            self.matches_fracos.append(match)
+        matches = MatchTable.de_pares(
+            merged['id_origem'], merged['id_destino'], merged[col_chave],
+            tipo_match='fraco', confianca=0.50
+        )
+        self.matches_fracos = self.matches_fracos + matches
+        
+        return matches
+    
+    def fazer_match_fuzzy(
+        self,
+        df_origem: pd.DataFrame,
+        df_destino: pd.DataFrame,
+        col_nome: str = 'nome_normalizado',
+        col_id_origem: str = 'id_unico',
+        col_id_destino: str = 'id_unico',
+        excluir_ids_origem: Optional[Iterable] = None,
+        excluir_ids_destino: Optional[Iterable] = None,
+        limiar: float = LIMIAR_FUZZY
+    ) -> MatchTable:
+        """
+        Faz match aproximado do nome dentro de blocos.
+        
+        Só são comparados registros do mesmo bloco (ano de nascimento +
+        código do primeiro nome + sexo), o que evita o produto cartesiano
+        das bases. Cada par distinto de nomes é pontuado uma única vez
+        (razão de indel, ver utils.similaridade), e ficam os pares com
+        similaridade >= limiar. A confiança é
+        FATOR_CONFIANCA_FUZZY x similaridade.
+        
+        As contagens de candidatos e a taxa de redução ficam em
+        self.estatisticas_fuzzy, para ajuste dos blocos.
+        
+        Args:
+            df_origem: DataFrame de origem
+            df_destino: DataFrame de destino
+            col_nome: Coluna com o nome normalizado
+            col_id_origem: Nome da coluna com ID na origem
+            col_id_destino: Nome da coluna com ID no destino
+            excluir_ids_origem: IDs de origem já pareados
+            excluir_ids_destino: IDs de destino já pareados
+            limiar: Similaridade mínima (0.0 a 1.0)
+        
+        Returns:
+            MatchTable com os pares encontrados
+        """
+        df_origem_filtrado = _preparar_lado_fuzzy(
+            df_origem, col_nome, col_id_origem, 'id_origem', excluir_ids_origem
+        )
+        df_destino_filtrado = _preparar_lado_fuzzy(
+            df_destino, col_nome, col_id_destino, 'id_destino', excluir_ids_destino
+        )
+        
+        n_origem = df_origem_filtrado['id_origem'].nunique()
+        n_destino = df_destino_filtrado['id_destino'].nunique()
+        print(f"[Match Fuzzy] Origem: {n_origem} registros disponíveis")
+        print(f"[Match Fuzzy] Destino: {n_destino} registros disponíveis")
+        
+        # Pares candidatos: apenas dentro do mesmo bloco
+        candidatos = pd.merge(
+            df_origem_filtrado,
+            df_destino_filtrado,
+            on=['ano_nascimento', 'codigo_nome', 'sexo_bloco'],
+            how='inner',
+            suffixes=('_origem', '_destino')
+        )
+        # Registros IGN dos dois lados se encontram nos blocos M e F
+        candidatos = candidatos.drop_duplicates(['id_origem', 'id_destino'])
+        
+        # Pontuar cada par distinto de nomes uma vez
+        pares = candidatos[['nome_origem', 'nome_destino']].drop_duplicates()
+        pares['similaridade'] = similaridade_nomes_em_lote(
+            pares['nome_origem'].to_numpy(), pares['nome_destino'].to_numpy()
+        )
+        candidatos = candidatos.merge(pares, on=['nome_origem', 'nome_destino'], how='left')
+        merged = candidatos[candidatos['similaridade'] >= limiar]
+        
+        total_pares = n_origem * n_destino
+        tamanho_blocos = df_origem_filtrado.groupby(
+            ['ano_nascimento', 'codigo_nome', 'sexo_bloco'], sort=False
+        ).size()
+        self.estatisticas_fuzzy = {
+            'registros_origem': n_origem,
+            'registros_destino': n_destino,
+            'pares_possiveis': total_pares,
+            'pares_candidatos': len(candidatos),
+            'pares_nomes_pontuados': len(pares),
+            'taxa_reducao': 1 - len(candidatos) / total_pares if total_pares else 0.0,
+            'blocos_origem': len(tamanho_blocos),
+            'maior_bloco_origem': int(tamanho_blocos.max()) if len(tamanho_blocos) else 0,
+            'matches': len(merged),
+        }
+        print(f"[Match Fuzzy] Pares candidatos: {len(candidatos):,} de {total_pares:,} possíveis "
+              f"(redução de {self.estatisticas_fuzzy['taxa_reducao']:.2%})")
+        print(f"[Match Fuzzy] Pares de nomes pontuados: {len(pares):,}")
+        print(f"[Match Fuzzy] Encontrados {len(merged)} matches (similaridade >= {limiar:.2f})")
+        
+        chaves = merged['nome_origem'] + '~' + merged['nome_destino'] + '|' + merged['ano_nascimento'].astype(str)
+        matches = MatchTable(pd.DataFrame({
+            'id_origem': merged['id_origem'].to_numpy(),
+            'id_destino': merged['id_destino'].to_numpy(),
+            'tipo_match': 'fuzzy',
+            'chave_usada': chaves.to_numpy(),
+            'confianca': (FATOR_CONFIANCA_FUZZY * merged['similaridade']).round(4).to_numpy(),
+        }))
+        self.matches_fuzzy = self.matches_fuzzy + matches
         
         return matches
     
@@ -229,13 +575,21 @@ class MatchingEngine:
         df_origem: pd.DataFrame,
         df_destino: pd.DataFrame,
         nome_origem: str = "Origem",
-        nome_destino: str = "Destino"
-    ) -> Dict[str, List[MatchResult]]:
+        nome_destino: str = "Destino",
+        incluir_fuzzy: bool = True
+    ) -> Dict[str, MatchTable]:
         """
-        Executa o processo completo de matching (forte -> moderado -> fraco).
+        Executa o processo completo de matching (forte -> moderado -> fonético -> fraco -> fuzzy).
+        
+        Args:
+            df_origem: DataFrame de origem
+            df_destino: DataFrame de destino
+            nome_origem: Nome da origem (para o relatório)
+            nome_destino: Nome do destino (para o relatório)
+            incluir_fuzzy: Executar o match aproximado sobre o que sobrou
         
         Returns:
-            Dict com listas de matches por tipo
+            Dict com uma MatchTable por tipo
         """
         print(f"\n{'='*80}")
         print(f"MATCHING: {nome_origem} <-> {nome_destino}")
@@ -245,8 +599,8 @@ class MatchingEngine:
         matches_fortes = self.fazer_match_forte(df_origem, df_destino)
         
         # IDs já matchados
-        ids_origem_matchados = {m.id_origem for m in matches_fortes}
-        ids_destino_matchados = {m.id_destino for m in matches_fortes}
+        ids_origem_matchados = matches_fortes.ids_origem
+        ids_destino_matchados = matches_fortes.ids_destino
         
         # Match moderado (excluindo já matchados)
         matches_moderados = self.fazer_match_moderado(
@@ -256,8 +610,19 @@ class MatchingEngine:
         )
         
         # Atualizar matchados
-        ids_origem_matchados.update({m.id_origem for m in matches_moderados})
-        ids_destino_matchados.update({m.id_destino for m in matches_moderados})
+        ids_origem_matchados = pd.concat([ids_origem_matchados, matches_moderados.ids_origem])
+        ids_destino_matchados = pd.concat([ids_destino_matchados, matches_moderados.ids_destino])
+        
+        # Match fonético (nome com grafia diferente + ano nascimento)
+        matches_foneticos = MatchTable()
+        if 'chave_fonetica' in df_origem.columns and 'chave_fonetica' in df_destino.columns:
+            matches_foneticos = self.fazer_match_fonetico(
+                df_origem, df_destino,
+                excluir_ids_origem=ids_origem_matchados,
+                excluir_ids_destino=ids_destino_matchados
+            )
+            ids_origem_matchados = pd.concat([ids_origem_matchados, matches_foneticos.ids_origem])
+            ids_destino_matchados = pd.concat([ids_destino_matchados, matches_foneticos.ids_destino])
         
         # Match fraco
         matches_fracos = self.fazer_match_fraco(
@@ -266,24 +631,43 @@ class MatchingEngine:
             excluir_ids_destino=ids_destino_matchados
         )
         
+        resultado = {
+            'fortes': matches_fortes,
+            'moderados': matches_moderados,
+            'foneticos': matches_foneticos,
+            'fracos': matches_fracos
+        }
+        
+        # Match fuzzy (apenas o que nenhuma chave exata pareou)
+        if incluir_fuzzy:
+            ids_origem_matchados = pd.concat([ids_origem_matchados, matches_fracos.ids_origem])
+            ids_destino_matchados = pd.concat([ids_destino_matchados, matches_fracos.ids_destino])
+            resultado['fuzzy'] = self.fazer_match_fuzzy(
+                df_origem, df_destino,
+                excluir_ids_origem=ids_origem_matchados,
+                excluir_ids_destino=ids_destino_matchados
+            )
+        
         print(f"\n{'='*80}")
         print(f"RESUMO DO MATCHING")
         print(f"{'='*80}")
         print(f"Matches fortes: {len(matches_fortes)}")
         print(f"Matches moderados: {len(matches_moderados)}")
+        print(f"Matches fonéticos: {len(matches_foneticos)}")
         print(f"Matches fracos: {len(matches_fracos)}")
-        print(f"Total: {len(matches_fortes) + len(matches_moderados) + len(matches_fracos)}")
+        if incluir_fuzzy:
+            print(f"Matches fuzzy: {len(resultado['fuzzy'])}")
+        print(f"Total: {sum(len(tabela) for tabela in resultado.values())}")
         print(f"{'='*80}\n")
         
-        return {
-            'fortes': matches_fortes,
-            'moderados': matches_moderados,
-            'fracos': matches_fracos
-        }
+        return resultado
     
-    def obter_todos_matches(self) -> List[MatchResult]:
+    def obter_todos_matches(self) -> MatchTable:
         """Retorna todos os matches realizados"""
-        return self.matches_fortes + self.matches_moderados + self.matches_fracos
+        return MatchTable.concatenar([
+            self.matches_fortes, self.matches_moderados, self.matches_foneticos,
+            self.matches_fracos, self.matches_fuzzy
+        ])
     
     def criar_mapeamento_ids(self) -> Dict[str, List[str]]:
         """
@@ -292,11 +676,8 @@ class MatchingEngine:
         Returns:
             Dict[id_origem, List[id_destino]]
         """
-        mapeamento = {}
-        
-        for match in self.obter_todos_matches():
-            if match.id_origem not in mapeamento:
-                mapeamento[match.id_origem] = []
-            mapeamento[match.id_origem].append(match.id_destino)
+        todos = self.obter_todos_matches().df
+        if todos.empty:
+            return {}
         
-        return mapeamento
+        return todos.groupby('id_origem', sort=False)['id_destino'].agg(list).to_dict()
@@ -1,13 +1,19 @@
 """Módulo para padronizar campos dos CSVs"""
+import numpy as np
 import pandas as pd
 import re
-from typing import Dict, Optional
+from typing import Dict, Optional, Union
 from config.config import FIELD_MAPPING
+from utils.instrumentacao import Instrumentacao, medir
 from utils.normalization import (
-    normalizar_nome, normalizar_sexo, parse_data, 
-    calcular_idade, extrair_ano, limpar_texto,
-    gerar_chave_forte, gerar_chave_moderada, gerar_chave_fraca
+    CacheNomes, normalizar_nomes_em_lote, normalizar_sexo, parse_datas_em_lote,
+    calcular_idades_em_lote, limpar_texto,
+    gerar_hash_chave
 )
+from utils.fonetica import codificar_nomes_em_lote
+
+# Versão da padronização: incrementar ao mudar regras, para invalidar o staging
+VERSAO_PADRONIZACAO = 4
 
 
 def limpar_nome_coluna(nome: str) -> str:
@@ -75,30 +81,43 @@ def padronizar_colunas(df: pd.DataFrame, mapping: Optional[Dict[str, str]] = Non
     return df_renamed
 
 
-def processar_campos_pessoa(df: pd.DataFrame) -> pd.DataFrame:
+def processar_campos_pessoa(
+    df: pd.DataFrame,
+    cache_nomes: Union[str, CacheNomes, None] = None,
+    formatos_data: Optional[Dict[str, Dict[str, int]]] = None
+) -> pd.DataFrame:
     """
     Processa e enriquece os campos relacionados à pessoa.
     
     Args:
         df: DataFrame com campos padronizados
+        cache_nomes: Arquivo opcional de cache de nomes normalizados entre
+            execuções (lido e gravado uma vez nesta chamada), ou um CacheNomes
+            já carregado, mantido pelo chamador (ex.: pipeline em blocos)
+        formatos_data: Dict opcional preenchido, por coluna de data, com o
+            número de células em cada formato (ver parse_datas_em_lote)
     
     Returns:
         DataFrame com campos processados
     """
     df = df.copy()
+    cache = cache_nomes if cache_nomes is None or isinstance(cache_nomes, CacheNomes) else CacheNomes(cache_nomes)
     
     # Normalizar nome
     if 'nome' in df.columns:
-        df['nome_normalizado'] = df['nome'].apply(normalizar_nome)
+        df['nome_normalizado'] = normalizar_nomes_em_lote(df['nome'], cache)
     else:
         df['nome_normalizado'] = ''
     
     # Normalizar nome da mãe
     if 'nome_mae' in df.columns:
-        df['nome_mae_normalizado'] = df['nome_mae'].apply(normalizar_nome)
+        df['nome_mae_normalizado'] = normalizar_nomes_em_lote(df['nome_mae'], cache)
     else:
         df['nome_mae_normalizado'] = ''
     
+    if cache is not None and cache is not cache_nomes:
+        cache.salvar()
+    
     # Normalizar sexo
     if 'sexo' in df.columns:
         df['sexo'] = df['sexo'].apply(normalizar_sexo)
@@ -107,35 +126,27 @@ def processar_campos_pessoa(df: pd.DataFrame) -> pd.DataFrame:
     
     # Processar data de nascimento
     if 'data_nascimento' in df.columns:
-        df['data_nascimento_dt'] = df['data_nascimento'].apply(parse_data)
-        df['ano_nascimento'] = df['data_nascimento_dt'].apply(extrair_ano)
+        contagem = formatos_data.setdefault('data_nascimento', {}) if formatos_data is not None else None
+        df['data_nascimento_dt'] = parse_datas_em_lote(df['data_nascimento'], contagem=contagem)
     else:
-        df['data_nascimento_dt'] = None
-        df['ano_nascimento'] = None
+        df['data_nascimento_dt'] = pd.Series(pd.NaT, index=df.index, dtype='datetime64[ns]')
+    df['ano_nascimento'] = df['data_nascimento_dt'].dt.year.astype('Int64')
     
     # Processar data do fato
     if 'data_fato' in df.columns:
-        df['data_fato_dt'] = df['data_fato'].apply(parse_data)
+        contagem = formatos_data.setdefault('data_fato', {}) if formatos_data is not None else None
+        df['data_fato_dt'] = parse_datas_em_lote(df['data_fato'], contagem=contagem)
     else:
-        df['data_fato_dt'] = None
-    
-    # Calcular idade
-    def calc_idade_row(row):
-        if pd.notna(row.get('data_nascimento_dt')) and pd.notna(row.get('data_fato_dt')):
-            return calcular_idade(row['data_nascimento_dt'], row['data_fato_dt'])
-        elif pd.notna(row.get('data_nascimento_dt')):
-            return calcular_idade(row['data_nascimento_dt'])
-        return None
+        df['data_fato_dt'] = pd.Series(pd.NaT, index=df.index, dtype='datetime64[ns]')
     
-    df['idade_calculada'] = df.apply(calc_idade_row, axis=1)
+    # Calcular idade (referência: data do fato, ou hoje quando ausente)
+    df['idade_calculada'] = calcular_idades_em_lote(df['data_nascimento_dt'], df['data_fato_dt'])
     
     # Usar idade da ocorrência se não temos calculada
     if 'idade_ocorrencia' in df.columns:
-        df['idade_estimativa'] = df.apply(
-            lambda row: row['idade_calculada'] if pd.notna(row.get('idade_calculada')) 
-                        else row.get('idade_ocorrencia'),
-            axis=1
-        )
+        idade_ocorrencia = np.floor(pd.to_numeric(df['idade_ocorrencia'], errors='coerce'))
+        idade_ocorrencia = idade_ocorrencia.where(np.isfinite(idade_ocorrencia))
+        df['idade_estimativa'] = df['idade_calculada'].fillna(idade_ocorrencia.astype('Int64'))
     else:
         df['idade_estimativa'] = df['idade_calculada']
     
@@ -152,6 +163,11 @@ def criar_chaves_matching(df: pd.DataFrame) -> pd.DataFrame:
     """
     Cria as chaves para matching entre bases.
     
+    Além das chaves legíveis (usadas em relatórios), gera as colunas
+    chave_*_hash (UInt64), que são as usadas nos joins do MatchingEngine.
+    A chave fonética (código fonético do nome + ano de nascimento) aproxima
+    grafias diferentes do mesmo nome ('Luiz'/'Luis', 'Souza'/'Sousa').
+    
     Args:
         df: DataFrame com campos processados
     
@@ -160,52 +176,111 @@ def criar_chaves_matching(df: pd.DataFrame) -> pd.DataFrame:
     """
     df = df.copy()
     
+    if 'nome_normalizado' in df.columns:
+        nome = df['nome_normalizado']
+    else:
+        nome = pd.Series('', index=df.index, dtype=object)
+    tem_nome = nome.notna() & (nome != '')
+    
     # Chave forte: nome + data nascimento completa
-    df['chave_forte'] = df.apply(
-        lambda row: gerar_chave_forte(
-            row.get('nome_normalizado', ''),
-            row.get('data_nascimento_dt')
-        ),
-        axis=1
+    if 'data_nascimento_dt' in df.columns:
+        datas = pd.to_datetime(df['data_nascimento_dt'], errors='coerce')
+    else:
+        datas = pd.Series(pd.NaT, index=df.index, dtype='datetime64[ns]')
+    df['chave_forte'] = (nome + '|' + datas.dt.strftime('%Y-%m-%d')).where(
+        tem_nome & datas.notna(), None
     )
     
     # Chave moderada: nome + ano nascimento
-    df['chave_moderada'] = df.apply(
-        lambda row: gerar_chave_moderada(
-            row.get('nome_normalizado', ''),
-            row.get('ano_nascimento')
-        ),
-        axis=1
-    )
+    if 'ano_nascimento' in df.columns:
+        anos = pd.to_numeric(df['ano_nascimento'], errors='coerce')
+    else:
+        anos = pd.Series(np.nan, index=df.index)
+    anos_validos = anos.notna()
+    df['chave_moderada'] = (
+        nome + '|' + anos.where(anos_validos, 0).astype('int64').astype(str)
+    ).where(tem_nome & anos_validos, None)
     
     # Chave fraca: apenas nome
-    df['chave_fraca'] = df['nome_normalizado'].apply(gerar_chave_fraca)
+    df['chave_fraca'] = nome.where(tem_nome, None)
+    
+    # Chave fonética: código fonético do nome + ano nascimento
+    df['nome_fonetico'] = codificar_nomes_em_lote(nome.where(tem_nome))
+    df['chave_fonetica'] = (
+        df['nome_fonetico'] + '|' + anos.where(anos_validos, 0).astype('int64').astype(str)
+    ).where(df['nome_fonetico'].notna() & anos_validos, None)
+    
+    # Codificação uint64 das chaves (calculada uma vez, usada nos joins)
+    for col in ['chave_forte', 'chave_moderada', 'chave_fraca', 'chave_fonetica']:
+        df[f'{col}_hash'] = gerar_hash_chave(df[col])
     
     return df
 
 
-def criar_id_unico(df: pd.DataFrame, prefixo: str = 'REG') -> pd.DataFrame:
+def hash_linhas(df: pd.DataFrame) -> np.ndarray:
+    """
+    Hash (uint64) do conteúdo bruto de cada linha do CSV.
+    
+    As colunas entram em ordem alfabética e como texto; floats com valor
+    inteiro viram inteiros antes, para que '123' e '123.0' (o pandas lê a
+    coluna como float quando há vazios) deem o mesmo hash de uma exportação
+    para outra. O hash de uma linha depende só dela (não do bloco lido).
+    
+    Args:
+        df: DataFrame lido do CSV, antes da padronização
+    
+    Returns:
+        Array uint64 alinhado às linhas
+    """
+    colunas = {}
+    for coluna in sorted(df.columns, key=str):
+        serie = df[coluna]
+        texto = serie.astype('string')
+        if pd.api.types.is_float_dtype(serie):
+            inteiro = (serie % 1 == 0) & (serie.abs() < 2 ** 63)
+            texto[inteiro] = serie[inteiro].astype('int64').astype('string')
+        colunas[str(coluna)] = texto
+    texto = pd.DataFrame(colunas, index=df.index)
+    return pd.util.hash_pandas_object(texto, index=False).to_numpy()
+
+
+def criar_id_unico(
+    df: pd.DataFrame,
+    prefixo: str = 'REG',
+    brutas: Optional[pd.DataFrame] = None,
+    ocorrencias: Optional[Dict[int, int]] = None
+) -> pd.DataFrame:
     """
     Cria IDs únicos para cada registro.
     
+    Usa codigo_envolvido ou sequencial quando existem; sem eles, o ID vem
+    do hash das colunas brutas da linha (hash_linhas), que não depende da
+    execução, da data corrente nem da posição da linha (é chave primária
+    do índice de pessoas). Linhas repetidas recebem o número da ocorrência.
+    
     Args:
         df: DataFrame
         prefixo: Prefixo para o ID (ex: 'DESAP', 'CAD', 'HOM')
+        brutas: Linhas como lidas do CSV, na mesma ordem de df (default: o
+            próprio df, que então não deve ter colunas derivadas)
+        ocorrencias: Hash -> ocorrências já numeradas; o mesmo dict
+            repassado a cada bloco numera repetições entre blocos
     
     Returns:
         DataFrame com coluna id_unico
     """
     df = df.copy()
+    brutas = df if brutas is None else brutas
+    ocorrencias = {} if ocorrencias is None else ocorrencias
     
-    # Usar índice + hash do nome para garantir unicidade
     def gerar_id(row):
         base = f"{prefixo}"
         
         # Tentar usar IDs existentes primeiro
         try:
-            if pd.notna(row.get('cd_envolvido')):
-                return f"{base}_{int(float(row['cd_envolvido']))}"
-        except (ValueError, TypeError):
+            if pd.notna(row.get('codigo_envolvido')):
+                return f"{base}_{int(float(row['codigo_envolvido']))}"
+        except (ValueError, TypeError, OverflowError):
             pass
         
         try:
@@ -213,14 +288,26 @@ def criar_id_unico(df: pd.DataFrame, prefixo: str = 'REG') -> pd.DataFrame:
                 val = row['sequencial']
                 if isinstance(val, (int, float)):
                     return f"{base}_{int(val)}"
-        except (ValueError, TypeError):
+        except (ValueError, TypeError, OverflowError):
             pass
         
-        # Fallback: usar hash do nome + index
-        nome_hash = abs(hash(row.get('nome_normalizado', ''))) % 1000000
-        return f"{base}_{row.name}_{nome_hash}"
+        return None
+    
+    ids = np.empty(len(df), dtype=object)
+    if len(df):
+        ids[:] = df.apply(gerar_id, axis=1).to_numpy()
+    
+    # Fallback: hash das colunas brutas (o hash() do Python muda a cada processo)
+    sem_id = pd.isna(ids)
+    if sem_id.any():
+        fallback = []
+        for h in hash_linhas(brutas[sem_id]).tolist():
+            n = ocorrencias.get(h, 0)
+            ocorrencias[h] = n + 1
+            fallback.append(f"{prefixo}_H{h:016x}" + (f"_{n}" if n else ''))
+        ids[sem_id] = fallback
     
-    df['id_unico'] = df.apply(gerar_id, axis=1)
+    df['id_unico'] = ids
     
     return df
 
@@ -228,7 +315,10 @@ def criar_id_unico(df: pd.DataFrame, prefixo: str = 'REG') -> pd.DataFrame:
 def pipeline_padronizacao_completa(
     df: pd.DataFrame, 
     prefixo_id: str = 'REG',
-    mapping: Optional[Dict[str, str]] = None
+    mapping: Optional[Dict[str, str]] = None,
+    cache_nomes: Union[str, CacheNomes, None] = None,
+    instrumentacao: Optional[Instrumentacao] = None,
+    ocorrencias_ids: Optional[Dict[int, int]] = None
 ) -> pd.DataFrame:
     """
     Pipeline completo de padronização.
@@ -237,32 +327,48 @@ def pipeline_padronizacao_completa(
         df: DataFrame original
         prefixo_id: Prefixo para IDs únicos
         mapping: Mapeamento de colunas (opcional)
+        cache_nomes: Arquivo de cache de nomes normalizados ou CacheNomes (opcional)
+        instrumentacao: Coletor das medições de cada passo (opcional)
+        ocorrencias_ids: Contagem de linhas repetidas compartilhada entre
+            blocos (ver criar_id_unico)
     
     Returns:
         DataFrame totalmente processado
     """
+    brutas = df
     print(f"[Pipeline] Iniciando padronização...")
     print(f"[Pipeline] Registros originais: {len(df)}")
     
     # 1. Padronizar colunas
     print("[Pipeline] Passo 1/4: Padronizando nomes de colunas...")
-    df = padronizar_colunas(df, mapping)
+    with medir(instrumentacao, 'colunas', len(df)) as medicao:
+        df = padronizar_colunas(df, mapping)
+        medicao.linhas_saida = len(df)
     
     # 2. Processar campos de pessoa
     print("[Pipeline] Passo 2/4: Processando campos de pessoa...")
-    df = processar_campos_pessoa(df)
+    with medir(instrumentacao, 'campos_pessoa', len(df)) as medicao:
+        formatos_data = {}
+        df = processar_campos_pessoa(df, cache_nomes, formatos_data)
+        medicao.linhas_saida = len(df)
+        medicao.extras['formatos_data'] = formatos_data
     
     # 3. Criar chaves de matching
     print("[Pipeline] Passo 3/4: Criando chaves de matching...")
-    df = criar_chaves_matching(df)
+    with medir(instrumentacao, 'chaves_matching', len(df)) as medicao:
+        df = criar_chaves_matching(df)
+        medicao.linhas_saida = len(df)
     
     # 4. Criar IDs únicos
     print("[Pipeline] Passo 4/4: Gerando IDs únicos...")
-    df = criar_id_unico(df, prefixo_id)
+    with medir(instrumentacao, 'ids_unicos', len(df)) as medicao:
+        df = criar_id_unico(df, prefixo_id, brutas=brutas, ocorrencias=ocorrencias_ids)
+        medicao.linhas_saida = len(df)
     
     print(f"[Pipeline] Padronização concluída!")
     print(f"[Pipeline] Registros com chave forte: {df['chave_forte'].notna().sum()}")
     print(f"[Pipeline] Registros com chave moderada: {df['chave_moderada'].notna().sum()}")
     print(f"[Pipeline] Registros com chave fraca: {df['chave_fraca'].notna().sum()}")
+    print(f"[Pipeline] Registros com chave fonética: {df['chave_fonetica'].notna().sum()}")
     
     return df
@@ -1,7 +1,11 @@
 """Pipeline principal de ETL"""
+import numpy as np
 import pandas as pd
 import sys
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import ExitStack
 from pathlib import Path
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
 
 # Adicionar diretórios ao path
 sys.path.insert(0, str(Path(__file__).parent.parent))
@@ -9,19 +13,77 @@ sys.path.insert(0, str(Path(__file__).parent.parent))
 from config.config import (
     NATUREZA_DESAPARECIMENTO, NATUREZA_LOCALIZACAO_CADAVER, NATUREZA_HOMICIDIO,
     CLASSIFICACAO_DESAPARECIDO_SIMPLES, CLASSIFICACAO_DESAPARECIDO_MORTO,
-    CLASSIFICACAO_DESAPARECIDO_VITIMA_HOMICIDIO, OUTPUT_DIR
+    CLASSIFICACAO_DESAPARECIDO_VITIMA_HOMICIDIO, CLASSIFICACAO_DESAPARECIDO_LOCALIZADO,
+    CLASSIFICACAO_CADAVER_SEM_DESAPARECIMENTO, CLASSIFICACAO_HOMICIDIO_SEM_DESAPARECIMENTO,
+    OUTPUT_DIR, CACHE_NOMES,
+    N_JOBS_DETECTOR, CHUNKSIZE_CSV, FIELD_MAPPING, PSYCHIATRIC_KEYWORDS,
+    RELATORIOS_DIR, PROMETHEUS_TEXTFILE, INDICE_PESSOAS,
+    CACHE_CLASSIFICACAO, REGRAS_NATUREZA_ALVO, REGRAS_PAPEL_PESSOA
 )
-from etl.padronizacao import pipeline_padronizacao_completa
-from etl.matching_engine import MatchingEngine, MatchResult
-from utils.psychiatric_detector import PsychiatricDetector
-from utils.chaves import enriquecer_com_chaves, filtrar_grupo_alvo
+from etl.padronizacao import padronizar_colunas, pipeline_padronizacao_completa, VERSAO_PADRONIZACAO
+from etl.staging import hash_arquivo, salvar_dataset
+from etl.estagios import Estagio, PipelineEstagios
+from etl.matching_engine import MatchingEngine, MatchResult, MatchTable, COLUNAS_MATCH, TIPOS_MATCH
+from etl.indice_pessoas import IndicePessoas, hash_linhas
+from utils.psychiatric_detector import (
+    PsychiatricDetector, NIVEIS_CONFIANCA, VERSAO_DETECTOR, MIN_TEXTOS_PARALELO,
+    TERMOS_ALTA_CONFIANCA, MEDICAMENTOS_CONFIANCA, CATEGORIAS_TRANSTORNO
+)
+from utils.chaves import enriquecer_com_chaves, filtrar_grupo_alvo, mascara_grupo_alvo, VERSAO_CHAVES
+from utils.classificacao import classificador_natureza, classificador_papel
+from utils.normalization import CacheNomes, VERSAO_NORMALIZACAO_NOME
+from utils.fonetica import VERSAO_FONETICA
+from utils.instrumentacao import Instrumentacao
 
 
-def carregar_csv(caminho: str, sep: str = ';', encoding: str = 'latin-1') -> pd.DataFrame:
-    """Carrega um CSV com tratamento de erros"""
+def carregar_csv(
+    caminho: str,
+    sep: str = ';',
+    encoding: str = 'latin-1',
+    chunksize: Optional[int] = None,
+    filtro: Optional[Callable[[pd.DataFrame], pd.DataFrame]] = None
+):
+    """
+    Carrega um CSV com tratamento de erros.
+    
+    Args:
+        caminho: Arquivo CSV
+        sep: Separador
+        encoding: Codificação do arquivo
+        chunksize: Se informado, devolve um iterador de DataFrames com até
+            `chunksize` linhas cada, em vez de ler o arquivo inteiro
+        filtro: Função aplicada a cada bloco bruto (ex.: filtrar_bloco_grupo_alvo).
+            Sem chunksize, o arquivo é lido em blocos de CHUNKSIZE_CSV e só as
+            linhas mantidas são concatenadas; com chunksize, cabe a quem itera
+            aplicá-lo (ver pipeline_streaming)
+    
+    Returns:
+        DataFrame (ou iterador de DataFrames), None em caso de erro
+    """
     print(f"[Carregamento] Lendo arquivo: {caminho}")
     
     try:
+        if chunksize:
+            leitor = pd.read_csv(
+                caminho, sep=sep, encoding=encoding, on_bad_lines='skip', chunksize=chunksize
+            )
+            print(f"[Carregamento] Leitura em blocos de {chunksize:,} registros")
+            return leitor
+        
+        if filtro is not None:
+            lidos = 0
+            blocos = []
+            with pd.read_csv(
+                caminho, sep=sep, encoding=encoding, on_bad_lines='skip', chunksize=CHUNKSIZE_CSV
+            ) as leitor:
+                for bloco in leitor:
+                    lidos += len(bloco)
+                    blocos.append(filtro(bloco))
+            # O índice segue a numeração das linhas do arquivo, como na leitura inteira
+            df = pd.concat(blocos) if blocos else pd.DataFrame()
+            print(f"[Carregamento] {len(df)} de {lidos} registros mantidos pelo filtro")
+            return df
+        
         df = pd.read_csv(caminho, sep=sep, encoding=encoding, on_bad_lines='skip')
         print(f"[Carregamento] {len(df)} registros carregados")
         return df
@@ -30,67 +92,184 @@ def carregar_csv(caminho: str, sep: str = ';', encoding: str = 'latin-1') -> pd.
         return None
 
 
-def separar_por_natureza(df: pd.DataFrame) -> dict:
-    """
-    Separa o DataFrame por tipo de natureza.
-    
-    Returns:
-        Dict com chaves: 'desaparecidos', 'cadaveres', 'homicidios'
+def filtrar_bloco_grupo_alvo(
+    bloco: pd.DataFrame,
+    apenas_vitimas: bool = True,
+    pasta_cache: Optional[str] = None
+) -> pd.DataFrame:
     """
-    print("\n[Separação] Separando registros por natureza...")
+    Mantém só o grupo-alvo de um bloco bruto, antes da padronização.
     
-    resultado = {
-        'desaparecidos': pd.DataFrame(),
-        'cadaveres': pd.DataFrame(),
-        'homicidios': pd.DataFrame(),
-        'outros': pd.DataFrame()
-    }
+    As colunas de origem são localizadas pelo mesmo mapeamento da
+    padronização (que só renomeia), e classificadas pelos mesmos
+    classificadores de enriquecer_com_chaves: as linhas mantidas são
+    exatamente as que filtrar_grupo_alvo manteria depois do enriquecimento.
     
-    if 'natureza_padronizada' not in df.columns and 'natureza' not in df.columns:
-        print("[AVISO] Coluna de natureza não encontrada")
-        return resultado
-    
-    col_natureza = 'natureza_padronizada' if 'natureza_padronizada' in df.columns else 'natureza'
+    Args:
+        bloco: DataFrame lido do CSV, com os nomes de coluna originais
+        apenas_vitimas: Se True, mantém apenas vítimas; se False, todos os papéis
+        pasta_cache: Pasta dos mapas valor -> classe (ver utils.classificacao)
     
-    # Desaparecidos
-    mask_desap = df[col_natureza].isin(NATUREZA_DESAPARECIMENTO)
-    resultado['desaparecidos'] = df[mask_desap].copy()
-    print(f"  - Desaparecidos: {len(resultado['desaparecidos'])} registros")
+    Returns:
+        Fatia do bloco com os registros do grupo-alvo (índice original preservado)
+    """
+    origem = dict(zip(padronizar_colunas(bloco.head(0)).columns, bloco.columns))
+    col_natureza = origem.get('natureza_padronizada', origem.get('natureza'))
+    col_papel = origem.get('tipo_vinculo')
+    ausente = pd.Series(None, index=bloco.index, dtype=object)
+    
+    classes = pd.DataFrame({
+        'natureza_alvo': classificador_natureza(pasta_cache).classificar(
+            bloco[col_natureza] if col_natureza else ausente
+        ),
+        'papel_pessoa': classificador_papel(pasta_cache).classificar(
+            bloco[col_papel] if col_papel else ausente
+        ),
+    }, index=bloco.index)
+    return bloco[mascara_grupo_alvo(classes, apenas_vitimas).to_numpy()]
+
+
+# Partições por natureza, na ordem dos códigos usados em ParticaoNatureza
+PARTICOES_NATUREZA = ['desaparecidos', 'cadaveres', 'homicidios', 'outros']
+_CODIGO_OUTROS = PARTICOES_NATUREZA.index('outros')
+_PARTICAO_DA_NATUREZA = {
+    **{natureza: 0 for natureza in NATUREZA_DESAPARECIMENTO},
+    **{natureza: 1 for natureza in NATUREZA_LOCALIZACAO_CADAVER},
+    **{natureza: 2 for natureza in NATUREZA_HOMICIDIO},
+}
+
+
+class ParticaoNatureza:
+    """
+    Partição preguiçosa de um DataFrame por natureza.
+    
+    A coluna de natureza vira categoria uma única vez e cada categoria é
+    mapeada para o código da sua partição, o que dá um código int8 por
+    registro em uma passada. Contagens saem de um bincount e cada partição
+    é só um array de posições; um DataFrame só é montado quando a partição
+    é pedida (particao['cadaveres']), e apenas para ela.
+    
+    Uso:
+        particao = ParticaoNatureza(df)
+        particao.contagem()              # {'desaparecidos': ..., ...}
+        particao.posicoes('homicidios')  # posições, sem cópia
+        df_cadaveres = particao['cadaveres']
+    """
     
-    # Cadáveres
-    mask_cadaver = df[col_natureza].isin(NATUREZA_LOCALIZACAO_CADAVER)
-    resultado['cadaveres'] = df[mask_cadaver].copy()
-    print(f"  - Cadáveres: {len(resultado['cadaveres'])} registros")
+    def __init__(self, df: pd.DataFrame):
+        self.df = df
+        self.coluna = next(
+            (c for c in ('natureza_padronizada', 'natureza') if c in df.columns), None
+        )
+        self.codigos = np.full(len(df), _CODIGO_OUTROS, dtype=np.int8)
+        
+        if self.coluna is not None:
+            natureza = df[self.coluna]
+            if not isinstance(natureza.dtype, pd.CategoricalDtype):
+                natureza = natureza.astype('category')
+            # Última posição do mapa atende o código -1 (natureza ausente)
+            mapa = np.array(
+                [_PARTICAO_DA_NATUREZA.get(c, _CODIGO_OUTROS) for c in natureza.cat.categories]
+                + [_CODIGO_OUTROS],
+                dtype=np.int8
+            )
+            self.codigos = mapa[natureza.cat.codes.to_numpy()]
+    
+    def contagem(self) -> Dict[str, int]:
+        """Registros em cada partição"""
+        totais = np.bincount(self.codigos, minlength=len(PARTICOES_NATUREZA))
+        return {nome: int(total) for nome, total in zip(PARTICOES_NATUREZA, totais)}
+    
+    def posicoes(self, nome: str) -> np.ndarray:
+        """Posições (para df.iloc / df.take) dos registros da partição"""
+        return np.flatnonzero(self.codigos == PARTICOES_NATUREZA.index(nome))
+    
+    def __getitem__(self, nome: str) -> pd.DataFrame:
+        return self.df.take(self.posicoes(nome))
+    
+    def __contains__(self, nome: str) -> bool:
+        return nome in PARTICOES_NATUREZA
+    
+    def keys(self) -> List[str]:
+        return list(PARTICOES_NATUREZA)
+    
+    def items(self) -> Iterator[Tuple[str, pd.DataFrame]]:
+        for nome in PARTICOES_NATUREZA:
+            yield nome, self[nome]
+
+
+def contar_por_natureza(df: pd.DataFrame) -> Dict[str, int]:
+    """Conta registros por tipo de natureza sem copiar as partições"""
+    return ParticaoNatureza(df).contagem()
+
+
+def separar_por_natureza(df: pd.DataFrame, copiar: bool = True):
+    """
+    Separa o DataFrame por tipo de natureza.
     
-    # Homicídios
-    mask_homicidio = df[col_natureza].isin(NATUREZA_HOMICIDIO)
-    resultado['homicidios'] = df[mask_homicidio].copy()
-    print(f"  - Homicídios: {len(resultado['homicidios'])} registros")
+    Args:
+        df: DataFrame padronizado
+        copiar: Se False, devolve uma ParticaoNatureza, que só monta cada
+            partição quando ela é pedida (para contagens nenhuma é montada)
     
-    # Outros
-    mask_outros = ~(mask_desap | mask_cadaver | mask_homicidio)
-    resultado['outros'] = df[mask_outros].copy()
-    print(f"  - Outros: {len(resultado['outros'])} registros")
+    Returns:
+        Dict com chaves: 'desaparecidos', 'cadaveres', 'homicidios', 'outros'
+        (ou ParticaoNatureza, com as mesmas chaves, se copiar=False)
+    """
+    print("\n[Separação] Separando registros por natureza...")
     
-    return resultado
+    particao = ParticaoNatureza(df)
+    if particao.coluna is None:
+        print("[AVISO] Coluna de natureza não encontrada")
+        if copiar:
+            return {nome: pd.DataFrame() for nome in PARTICOES_NATUREZA}
+    
+    contagem = particao.contagem()
+    print(f"  - Desaparecidos: {contagem['desaparecidos']} registros")
+    print(f"  - Cadáveres: {contagem['cadaveres']} registros")
+    print(f"  - Homicídios: {contagem['homicidios']} registros")
+    print(f"  - Outros: {contagem['outros']} registros")
+    
+    if not copiar:
+        return particao
+    return dict(particao.items())
 
 
-def aplicar_detector_psiquiatrico(df: pd.DataFrame) -> pd.DataFrame:
-    """Aplica o detector de transtornos psiquiátricos"""
+def aplicar_detector_psiquiatrico(
+    df: pd.DataFrame,
+    n_jobs: int = 1,
+    detector: Optional[PsychiatricDetector] = None,
+    pool: Optional[ProcessPoolExecutor] = None
+) -> pd.DataFrame:
+    """
+    Aplica o detector de transtornos psiquiátricos.
+    
+    Args:
+        df: DataFrame padronizado
+        n_jobs: Processos usados pelo detector (-1 = todos os núcleos)
+        detector: Detector já montado (default: um novo PsychiatricDetector)
+        pool: Pool de processos reaproveitado entre chamadas (ver
+            PsychiatricDetector.criar_pool)
+    """
     print("\n[Transtornos] Detectando menções a transtornos psiquiátricos...")
     
-    detector = PsychiatricDetector()
+    if detector is None:
+        detector = PsychiatricDetector()
     
     if 'historico_limpo' in df.columns:
-        df = detector.processar_dataframe(df, coluna_texto='historico_limpo')
+        df = detector.processar_dataframe(
+            df, coluna_texto='historico_limpo', n_jobs=n_jobs, pool=pool
+        )
     elif 'historico' in df.columns:
-        df = detector.processar_dataframe(df, coluna_texto='historico')
+        df = detector.processar_dataframe(df, coluna_texto='historico', n_jobs=n_jobs, pool=pool)
     else:
         print("[AVISO] Coluna de histórico não encontrada")
         df['tem_transtorno_psiquiatrico'] = False
         df['tipo_transtorno'] = ''
         df['evidencia_transtorno'] = ''
-        df['confianca_transtorno'] = 'inconclusivo'
+        df['confianca_transtorno'] = pd.Categorical(
+            ['inconclusivo'] * len(df), categories=NIVEIS_CONFIANCA
+        )
     
     qtd_detectados = df['tem_transtorno_psiquiatrico'].sum()
     print(f"[Transtornos] Detectados em {qtd_detectados} registros")
@@ -98,138 +277,343 @@ def aplicar_detector_psiquiatrico(df: pd.DataFrame) -> pd.DataFrame:
     return df
 
 
+# Colunas da base unificada: saída -> (coluna de entrada, valor se ela não existir)
+CAMPOS_PESSOA = {
+    'id_unico': ('id_unico', ''),
+    'nome': ('nome', ''),
+    'nome_normalizado': ('nome_normalizado', ''),
+    'data_nascimento': ('data_nascimento_dt', None),
+    'sexo': ('sexo', 'IGN'),
+    'idade_estimativa': ('idade_estimativa', None),
+    'nome_mae': ('nome_mae', ''),
+    'local_de_referencia': ('cidade_ra', ''),
+    'chave_ocorrencia': ('chave_ocorrencia', ''),
+    'chave_pessoa': ('chave_pessoa', ''),
+    'natureza_alvo': ('natureza_alvo', ''),
+    'papel_pessoa': ('papel_pessoa', ''),
+}
+CAMPOS_DESAPARECIMENTO = {
+    'data_desaparecimento': ('data_fato_dt', None),
+    'boletim_desaparecimento': ('cd_ocorrencia', ''),
+    'historico_desaparecimento': ('historico_limpo', ''),
+    'unidade_registro_desap': ('unidade_registro', ''),
+    'pessoa_localizada': ('pessoa_localizada', ''),
+}
+CAMPOS_CHAVES_TRANSTORNO = {
+    'chave_forte': ('chave_forte', ''),
+    'chave_moderada': ('chave_moderada', ''),
+    'chave_fraca': ('chave_fraca', ''),
+    'tem_transtorno_psiquiatrico': ('tem_transtorno_psiquiatrico', False),
+    'tipo_transtorno': ('tipo_transtorno', ''),
+    'evidencia_transtorno': ('evidencia_transtorno', ''),
+    'confianca_transtorno': ('confianca_transtorno', 'inconclusivo'),
+}
+CAMPOS_CADAVER = {
+    'data_localizacao_cadaver': ('data_fato_dt', None),
+    'boletim_localizacao': ('cd_ocorrencia', ''),
+    'local_cadaver': ('cidade_ra', ''),
+    'cod_iml_pessoa': ('cod_iml_pessoa', ''),
+    'possui_laudo_iml': ('possui_laudo_iml', ''),
+}
+CAMPOS_HOMICIDIO = {
+    'data_homicidio': ('data_fato_dt', None),
+    'boletim_homicidio': ('cd_ocorrencia', ''),
+    'local_homicidio': ('cidade_ra', ''),
+    'circunstancias_homicidio': ('historico_limpo', ''),
+}
+
+
+def _selecionar_campos(df: pd.DataFrame, campos: Dict[str, tuple]) -> pd.DataFrame:
+    """Colunas renomeadas conforme `campos`; as ausentes no DataFrame recebem o valor padrão"""
+    return pd.DataFrame({
+        saida: df[entrada] if entrada in df.columns else padrao
+        for saida, (entrada, padrao) in campos.items()
+    }, index=df.index)
+
+
+def _tabela_matches(matches) -> pd.DataFrame:
+    """DataFrame de matches a partir de uma MatchTable ou de uma lista de MatchResult"""
+    if isinstance(matches, MatchTable):
+        return matches.df
+    return pd.DataFrame(
+        [(m.id_origem, m.id_destino, m.tipo_match, m.chave_usada, m.confianca) for m in matches],
+        columns=COLUNAS_MATCH
+    )
+
+
+def _parear_desfecho(
+    ids_desaparecidos: pd.Series,
+    df_desfecho: pd.DataFrame,
+    matches,
+    campos: Dict[str, tuple],
+    sufixo: str
+) -> tuple:
+    """
+    Junta a cada desaparecido o registro de desfecho do seu melhor match.
+
+    Vale o match de maior confiança entre os que apontam para um registro
+    existente no desfecho (empate: o primeiro da tabela). Há uma flag
+    match_{tipo}_{sufixo} para cada tipo em TIPOS_MATCH.
+
+    Returns:
+        (colunas do desfecho alinhadas aos desaparecidos, máscara de quem teve
+        match, IDs do desfecho com match para algum desaparecido, seja ou não
+        o melhor dele)
+    """
+    desfecho = df_desfecho.drop_duplicates('id_unico', keep='last').set_index('id_unico')
+    pares = _tabela_matches(matches)
+    pares = pares[
+        pares['id_origem'].isin(ids_desaparecidos) & pares['id_destino'].isin(desfecho.index)
+    ]
+    melhor = (
+        pares.sort_values('confianca', ascending=False, kind='stable')
+        .drop_duplicates('id_origem')
+        .set_index('id_origem')
+        .reindex(ids_desaparecidos.to_numpy())
+    )
+    pareado = melhor['id_destino'].notna().to_numpy()
+
+    colunas = _selecionar_campos(desfecho, campos).reindex(melhor['id_destino'].to_numpy())
+    tipo = melhor['tipo_match'].astype(object)
+    for tipo_match in TIPOS_MATCH:
+        colunas[f'match_{tipo_match}_{sufixo}'] = pd.array(
+            (tipo == tipo_match).to_numpy(), dtype='boolean'
+        )
+        colunas.loc[~pareado, f'match_{tipo_match}_{sufixo}'] = pd.NA
+    colunas[f'tipo_match_{sufixo}'] = tipo.to_numpy()
+    colunas.index = ids_desaparecidos.index
+
+    return colunas, pareado, pares['id_destino'].unique()
+
+
 def unificar_registros(
     df_desaparecidos: pd.DataFrame,
     df_cadaveres: pd.DataFrame,
     df_homicidios: pd.DataFrame,
-    matches_desap_cad: list,
-    matches_desap_hom: list
+    matches_desap_cad,
+    matches_desap_hom
 ) -> pd.DataFrame:
     """
     Unifica os registros criando a base final.
     
+    Cada desaparecido recebe, por junção de colunas (sem laço por linha),
+    os dados do cadáver e do homicídio do seu melhor match. A classificação
+    segue a precedência homicídio > cadáver > localizado vivo > sem desfecho.
+    Cadáveres e homicídios que não foram pareados com nenhum desaparecido
+    entram ao final como registros órfãos.
+    
+    Args:
+        df_desaparecidos: Registros de desaparecimento
+        df_cadaveres: Registros de localização de cadáver
+        df_homicidios: Registros de homicídio
+        matches_desap_cad: MatchTable (ou lista de MatchResult) desaparecido -> cadáver
+        matches_desap_hom: MatchTable (ou lista de MatchResult) desaparecido -> homicídio
+    
     Returns:
         DataFrame unificado
     """
     print("\n[Unificação] Criando base unificada...")
     
-    registros_unificados = []
-    ids_processados = set()
+    desaparecidos = df_desaparecidos.reset_index(drop=True)
+    ids = desaparecidos['id_unico']
+    
+    cadaver, tem_cadaver, ids_cad = _parear_desfecho(
+        ids, df_cadaveres, matches_desap_cad, CAMPOS_CADAVER, 'cad'
+    )
+    homicidio, tem_homicidio, ids_hom = _parear_desfecho(
+        ids, df_homicidios, matches_desap_hom, CAMPOS_HOMICIDIO, 'hom'
+    )
+    
+    localizado = (
+        desaparecidos['pessoa_localizada'].astype(str).str.upper().str.contains('SIM').to_numpy()
+        if 'pessoa_localizada' in desaparecidos.columns
+        else np.zeros(len(desaparecidos), dtype=bool)
+    )
+    
+    df_unificado = pd.concat([
+        _selecionar_campos(desaparecidos, {
+            **CAMPOS_PESSOA, **CAMPOS_DESAPARECIMENTO, **CAMPOS_CHAVES_TRANSTORNO
+        }),
+        cadaver,
+        homicidio,
+    ], axis=1)
+    df_unificado['fonte_match'] = np.select(
+        [tem_homicidio, tem_cadaver],
+        ['desaparecido->homicidio', 'desaparecido->cadaver'],
+        default=None
+    )
+    df_unificado['classificacao_final'] = np.select(
+        [tem_homicidio, tem_cadaver, localizado],
+        [CLASSIFICACAO_DESAPARECIDO_VITIMA_HOMICIDIO, CLASSIFICACAO_DESAPARECIDO_MORTO,
+         CLASSIFICACAO_DESAPARECIDO_LOCALIZADO],
+        default=CLASSIFICACAO_DESAPARECIDO_SIMPLES
+    )
+    
+    # Cadáveres e homicídios sem desaparecimento correlacionado
+    orfaos = []
+    for df_desfecho, pareados, campos, classificacao in [
+        (df_cadaveres, ids_cad, CAMPOS_CADAVER, CLASSIFICACAO_CADAVER_SEM_DESAPARECIMENTO),
+        (df_homicidios, ids_hom, CAMPOS_HOMICIDIO, CLASSIFICACAO_HOMICIDIO_SEM_DESAPARECIMENTO),
+    ]:
+        if df_desfecho.empty:
+            continue
+        sem_par = df_desfecho[~df_desfecho['id_unico'].isin(pareados)]
+        orfao = _selecionar_campos(sem_par, {**CAMPOS_PESSOA, **CAMPOS_CHAVES_TRANSTORNO, **campos})
+        orfao['classificacao_final'] = classificacao
+        orfaos.append(orfao)
+        print(f"[Unificação] {classificacao}: {len(orfao)} registros")
+    
+    if orfaos:
+        df_unificado = pd.concat([df_unificado, *orfaos], ignore_index=True)[df_unificado.columns]
+    
+    print(f"[Unificação] {len(df_unificado)} registros unificados "
+          f"({int(tem_cadaver.sum())} com cadáver, {int(tem_homicidio.sum())} com homicídio)")
     
-    # Criar dicionários de lookup
-    dict_cadaveres = df_cadaveres.set_index('id_unico').to_dict('index')
-    dict_homicidios = df_homicidios.set_index('id_unico').to_dict('index')
+    return df_unificado
+
+
+def salvar_resultado(df_final: pd.DataFrame, output_path: str) -> None:
+    """Salva o dataset final em XLSX (com cópia Parquet) ou CSV, pelo sufixo do caminho"""
+    print(f"\n[Salvamento] Salvando resultado em: {output_path}")
+    
+    # Determinar formato pelo caminho
+    if output_path.endswith('.xlsx'):
+        from utils.excel_export import criar_relatorio_completo
+        criar_relatorio_completo(df_final, output_path, incluir_estatisticas=True)
+        
+        # Cópia Parquet para leitura rápida pelos scripts seguintes
+        caminho_rapido = salvar_dataset(df_final, Path(output_path))
+        print(f"[Salvamento] Cópia para leitura rápida: {caminho_rapido}")
+    else:
+        df_final.to_csv(output_path, index=False, sep=';', encoding='utf-8-sig')
     
-    # Mapear desaparecidos para cadáveres/homicídios
-    mapa_desap_cad = {m.id_origem: m for m in matches_desap_cad}
-    mapa_desap_hom = {m.id_origem: m for m in matches_desap_hom}
+    print("[Salvamento] Concluído!")
+
+
+def salvar_relatorio_execucao(instrumentacao: Instrumentacao) -> None:
+    """Grava o relatório JSON da execução (e o .prom, se PROMETHEUS_TEXTFILE estiver definido)"""
+    instrumentacao.imprimir_resumo()
     
-    # Processar desaparecidos
-    for _, desap in df_desaparecidos.iterrows():
-        id_desap = desap['id_unico']
-        
-        registro = {
-            # Dados básicos
-            'id_unico': id_desap,
-            'nome': desap.get('nome', ''),
-            'nome_normalizado': desap.get('nome_normalizado', ''),
-            'data_nascimento': desap.get('data_nascimento_dt'),
-            'sexo': desap.get('sexo', 'IGN'),
-            'idade_estimativa': desap.get('idade_estimativa'),
-            'nome_mae': desap.get('nome_mae', ''),
-            'local_de_referencia': desap.get('cidade_ra', ''),
-            
-            # Chaves de correlação (NOVO)
-            'chave_ocorrencia': desap.get('chave_ocorrencia', ''),
-            'chave_pessoa': desap.get('chave_pessoa', ''),
-            'natureza_alvo': desap.get('natureza_alvo', ''),
-            'papel_pessoa': desap.get('papel_pessoa', ''),
-            
-            # Desaparecimento
-            'data_desaparecimento': desap.get('data_fato_dt'),
-            'boletim_desaparecimento': desap.get('cd_ocorrencia', ''),
-            'historico_desaparecimento': desap.get('historico_limpo', ''),
-            'unidade_registro_desap': desap.get('unidade_registro', ''),
-            'pessoa_localizada': desap.get('pessoa_localizada', ''),
-            
-            # Chaves
-            'chave_forte': desap.get('chave_forte', ''),
-            'chave_moderada': desap.get('chave_moderada', ''),
-            'chave_fraca': desap.get('chave_fraca', ''),
-            
-            # Transtorno
-            'tem_transtorno_psiquiatrico': desap.get('tem_transtorno_psiquiatrico', False),
-            'tipo_transtorno': desap.get('tipo_transtorno', ''),
-            'evidencia_transtorno': desap.get('evidencia_transtorno', ''),
-            'confianca_transtorno': desap.get('confianca_transtorno', 'inconclusivo'),
-        }
-        
-        # Verificar match com cadáver
-        if id_desap in mapa_desap_cad:
-            match_cad = mapa_desap_cad[id_desap]
-            id_cad = match_cad.id_destino
-            
-            if id_cad in dict_cadaveres:
-                cadaver = dict_cadaveres[id_cad]
-                registro.update({
-                    'data_localizacao_cadaver': cadaver.get('data_fato_dt'),
-                    'boletim_localizacao': cadaver.get('cd_ocorrencia', ''),
-                    'local_cadaver': cadaver.get('cidade_ra', ''),
-                    'cod_iml_pessoa': cadaver.get('cod_iml_pessoa', ''),
-                    'possui_laudo_iml': cadaver.get('possui_laudo_iml', ''),
-                    'match_forte_cad': match_cad.tipo_match == 'forte',
-                    'match_moderado_cad': match_cad.tipo_match == 'moderado',
-                    'match_fraco_cad': match_cad.tipo_match == 'fraco',
-                    'fonte_match': 'desaparecido->cadaver',
-                    'classificacao_final': CLASSIFICACAO_DESAPARECIDO_MORTO
-                })
-                ids_processados.add(id_cad)
-        
-        # Verificar match com homicídio
-        if id_desap in mapa_desap_hom:
-            match_hom = mapa_desap_hom[id_desap]
-            id_hom = match_hom.id_destino
-            
-            if id_hom in dict_homicidios:
-                homicidio = dict_homicidios[id_hom]
-                registro.update({
-                    'data_homicidio': homicidio.get('data_fato_dt'),
-                    'boletim_homicidio': homicidio.get('cd_ocorrencia', ''),
-                    'local_homicidio': homicidio.get('cidade_ra', ''),
-                    'circunstancias_homicidio': homicidio.get('historico_limpo', ''),
-                    'match_forte_hom': match_hom.tipo_match == 'forte',
-                    'match_moderado_hom': match_hom.tipo_match == 'moderado',
-                    'match_fraco_hom': match_hom.tipo_match == 'fraco',
-                    'fonte_match': 'desaparecido->homicidio',
-                    'classificacao_final': CLASSIFICACAO_DESAPARECIDO_VITIMA_HOMICIDIO
-                })
-                ids_processados.add(id_hom)
-        
-        # Classificação se não teve match
-        if 'classificacao_final' not in registro:
-            if registro.get('pessoa_localizada') and 'SIM' in str(registro['pessoa_localizada']).upper():
-                registro['classificacao_final'] = "Desaparecido localizado vivo"
-            else:
-                registro['classificacao_final'] = CLASSIFICACAO_DESAPARECIDO_SIMPLES
-        
-        registros_unificados.append(registro)
+    nome = f"{instrumentacao.nome_execucao}_{instrumentacao.inicio:%Y%m%d_%H%M%S}.json"
+    caminho = instrumentacao.salvar_json(RELATORIOS_DIR / nome)
+    print(f"[Instrumentação] Relatório: {caminho}")
     
-    # TODO: Adicionar cadáveres e homicídios sem match
-    # (registros órfãos que não foram correlacionados)
+    if PROMETHEUS_TEXTFILE:
+        instrumentacao.salvar_prometheus(PROMETHEUS_TEXTFILE)
+
+
+def montar_estagios(
+    caminho_csv: str,
+    output_path: Optional[str] = None,
+    n_jobs: int = N_JOBS_DETECTOR,
+    instrumentacao: Optional[Instrumentacao] = None,
+    grupo_alvo: bool = False,
+    apenas_vitimas: bool = True
+) -> PipelineEstagios:
+    """
+    Monta o DAG do pipeline: bruto → padronizado → chaves → transtornos → exportar.
     
-    df_unificado = pd.DataFrame(registros_unificados)
-    print(f"[Unificação] {len(df_unificado)} registros unificados")
+    As impressões digitais combinam o hash do CSV com a versão e a
+    configuração de cada estágio (FIELD_MAPPING na padronização,
+    PSYCHIATRIC_KEYWORDS e listas do detector na detecção).
     
-    return df_unificado
+    Args:
+        caminho_csv: CSV de entrada
+        output_path: Arquivo de saída (sem ele não há estágio de exportação)
+        n_jobs: Processos do detector psiquiátrico (não afeta o resultado)
+        instrumentacao: Coletor das medições de cada estágio (opcional)
+        grupo_alvo: Mantém só o grupo-alvo já na leitura (ver filtrar_bloco_grupo_alvo)
+        apenas_vitimas: Com grupo_alvo, restringe às vítimas
+    """
+    dag = PipelineEstagios(instrumentacao)
+    
+    def carregar():
+        if not grupo_alvo:
+            return carregar_csv(caminho_csv)
+        return carregar_csv(caminho_csv, filtro=lambda bloco: filtrar_bloco_grupo_alvo(
+            bloco, apenas_vitimas, pasta_cache=str(CACHE_CLASSIFICACAO)
+        ))
+    
+    def padronizar(df_raw):
+        return pipeline_padronizacao_completa(
+            df_raw, prefixo_id='REG', cache_nomes=str(CACHE_NOMES), instrumentacao=instrumentacao
+        )
+    
+    def enriquecer(df):
+        print("\n[Enriquecimento] Gerando chaves de correlação...")
+        return enriquecer_com_chaves(df, pasta_cache=str(CACHE_CLASSIFICACAO))
+    
+    def detectar(df):
+        print("\n[Transtornos] Detectando transtornos psiquiátricos em todos os registros...")
+        return aplicar_detector_psiquiatrico(df, n_jobs=n_jobs)
+    
+    dag.adicionar(Estagio(
+        'bruto', carregar,
+        config={
+            'arquivo': hash_arquivo(caminho_csv),
+            'grupo_alvo': {
+                'apenas_vitimas': apenas_vitimas,
+                'REGRAS_NATUREZA_ALVO': REGRAS_NATUREZA_ALVO,
+                'REGRAS_PAPEL_PESSOA': REGRAS_PAPEL_PESSOA,
+            } if grupo_alvo else None,
+        },
+        esquema={}
+    ))
+    dag.adicionar(Estagio(
+        'padronizado', padronizar, ['bruto'],
+        versao=VERSAO_PADRONIZACAO,
+        config={
+            'FIELD_MAPPING': FIELD_MAPPING,
+            'VERSAO_NORMALIZACAO_NOME': VERSAO_NORMALIZACAO_NOME,
+            'VERSAO_FONETICA': VERSAO_FONETICA,
+        }
+    ))
+    dag.adicionar(Estagio(
+        'chaves', enriquecer, ['padronizado'],
+        versao=VERSAO_CHAVES,
+        config={
+            'REGRAS_NATUREZA_ALVO': REGRAS_NATUREZA_ALVO,
+            'REGRAS_PAPEL_PESSOA': REGRAS_PAPEL_PESSOA,
+        }
+    ))
+    dag.adicionar(Estagio(
+        'transtornos', detectar, ['chaves'],
+        versao=VERSAO_DETECTOR,
+        config={
+            'PSYCHIATRIC_KEYWORDS': PSYCHIATRIC_KEYWORDS,
+            'TERMOS_ALTA_CONFIANCA': TERMOS_ALTA_CONFIANCA,
+            'MEDICAMENTOS_CONFIANCA': MEDICAMENTOS_CONFIANCA,
+            'CATEGORIAS_TRANSTORNO': CATEGORIAS_TRANSTORNO,
+        }
+    ))
+    
+    if output_path:
+        dag.adicionar(Estagio(
+            'exportar', lambda df: salvar_resultado(df, output_path), ['transtornos'],
+            persistir=False, arquivo_saida=output_path
+        ))
+    
+    return dag
 
 
-def pipeline_completo(caminho_csv: str, output_path: str = None) -> pd.DataFrame:
+def pipeline_completo(
+    caminho_csv: str,
+    output_path: str = None,
+    grupo_alvo: bool = False,
+    apenas_vitimas: bool = True
+) -> pd.DataFrame:
     """
     Executa o pipeline completo de ETL.
     
+    Os estágios são reaproveitados do staging quando nem a entrada nem a
+    versão/configuração do estágio mudaram (ver montar_estagios).
+    
     Args:
         caminho_csv: Caminho para o CSV de entrada
         output_path: Caminho para salvar o resultado (opcional)
+        grupo_alvo: Descarta já na leitura os registros fora do grupo-alvo;
+            os estágios seguintes processam só o que filtrar_grupo_alvo manteria
+        apenas_vitimas: Com grupo_alvo, mantém apenas as vítimas
     
     Returns:
         DataFrame unificado final
@@ -238,52 +622,265 @@ def pipeline_completo(caminho_csv: str, output_path: str = None) -> pd.DataFrame
     print("INICIANDO PIPELINE COMPLETO DE CORRELAÇÃO")
     print("="*80 + "\n")
     
-    # 1. Carregar dados
-    df_raw = carregar_csv(caminho_csv)
-    if df_raw is None:
-        return None
-    
-    # 2. Padronizar
-    df_padronizado = pipeline_padronizacao_completa(df_raw, prefixo_id='REG')
-    
-    # 3. Enriquecer com chaves de correlação
-    print("\n[Enriquecimento] Gerando chaves de correlação...")
-    df_padronizado = enriquecer_com_chaves(df_padronizado)
+    instrumentacao = Instrumentacao('pipeline_completo')
+    dag = montar_estagios(
+        caminho_csv, output_path, instrumentacao=instrumentacao,
+        grupo_alvo=grupo_alvo, apenas_vitimas=apenas_vitimas
+    )
+    resultados = {}
     
-    # 4. Aplicar detector psiquiátrico em TODOS os registros
-    print("\n[Transtornos] Detectando transtornos psiquiátricos em todos os registros...")
-    df_padronizado = aplicar_detector_psiquiatrico(df_padronizado)
+    # 1-4. Carregar, padronizar, enriquecer com chaves e detectar transtornos
+    df_padronizado = dag.executar('transtornos', resultados)
+    if df_padronizado is None:
+        return None
     
     # 5. Separar por natureza (para estatísticas)
-    bases = separar_por_natureza(df_padronizado)
+    with instrumentacao.etapa('separar_natureza', len(df_padronizado)):
+        contagem = separar_por_natureza(df_padronizado, copiar=False).contagem()
     
     # 6. Usar TODO o dataset enriquecido como resultado final
     df_final = df_padronizado.copy()
     
     print(f"\n[Dataset Final] Total de registros processados: {len(df_final):,}")
-    print(f"  - Desaparecimentos: {len(bases['desaparecidos']):,}")
-    print(f"  - Cadáveres: {len(bases['cadaveres']):,}")
-    print(f"  - Homicídios: {len(bases['homicidios']):,}")
-    print(f"  - Outros: {len(bases['outros']):,}")
+    print(f"  - Desaparecimentos: {contagem['desaparecidos']:,}")
+    print(f"  - Cadáveres: {contagem['cadaveres']:,}")
+    print(f"  - Homicídios: {contagem['homicidios']:,}")
+    print(f"  - Outros: {contagem['outros']:,}")
     
-    # 7. Salvar resultado
+    # 7. Salvar resultado (pulado se nada mudou desde a última exportação)
     if output_path:
-        print(f"\n[Salvamento] Salvando resultado em: {output_path}")
+        dag.executar('exportar', resultados)
+    
+    print(f"\n[Estágios] Executados: {', '.join(dag.executados) or 'nenhum'}")
+    print(f"[Estágios] Reaproveitados: {', '.join(dag.reaproveitados) or 'nenhum'}")
+    
+    salvar_relatorio_execucao(instrumentacao)
+    
+    print("\n" + "="*80)
+    print("PIPELINE CONCLUÍDO COM SUCESSO")
+    print("="*80 + "\n")
+    
+    return df_final
+
+
+def pipeline_streaming(
+    caminho_csv: str,
+    output_path: str,
+    chunksize: int = CHUNKSIZE_CSV,
+    n_jobs: int = N_JOBS_DETECTOR,
+    grupo_alvo: bool = False,
+    apenas_vitimas: bool = True
+) -> Optional[Dict[str, int]]:
+    """
+    Executa o pipeline bloco a bloco, com memória limitada pelo tamanho do bloco.
+    
+    Cada bloco do CSV passa por padronização, chaves de correlação e detector
+    psiquiátrico e é acrescentado ao CSV de saída; apenas um bloco fica em
+    memória por vez. As etapas são todas por registro, então o resultado é
+    o mesmo de pipeline_completo com saída CSV.
+    
+    Args:
+        caminho_csv: Caminho para o CSV de entrada
+        output_path: CSV de saída (XLSX não permite escrita incremental)
+        chunksize: Registros por bloco
+        n_jobs: Processos usados pelo detector psiquiátrico
+        grupo_alvo: Descarta cada bloco fora do grupo-alvo logo após a leitura
+        apenas_vitimas: Com grupo_alvo, mantém apenas as vítimas
+    
+    Returns:
+        Dict com totais (registros lidos e processados, blocos e contagem por
+        natureza), None em caso de erro
+    """
+    if str(output_path).endswith('.xlsx'):
+        raise ValueError("pipeline_streaming grava CSV; use pipeline_completo para XLSX")
+    
+    print("\n" + "="*80)
+    print("INICIANDO PIPELINE EM BLOCOS (STREAMING)")
+    print("="*80 + "\n")
+    
+    leitor = carregar_csv(caminho_csv, chunksize=chunksize)
+    if leitor is None:
+        return None
+    
+    saida = Path(output_path)
+    saida.parent.mkdir(parents=True, exist_ok=True)
+    if saida.exists():
+        saida.unlink()
+    
+    totais = {'lidos': 0, 'registros': 0, 'blocos': 0, 'transtornos': 0,
+              'desaparecidos': 0, 'cadaveres': 0, 'homicidios': 0, 'outros': 0}
+    instrumentacao = Instrumentacao('pipeline_streaming')
+    # Cache de nomes lido uma vez e gravado ao final, não a cada bloco
+    cache_nomes = CacheNomes(CACHE_NOMES)
+    # Linhas repetidas em blocos diferentes recebem id_unico distintos
+    ocorrencias_ids = {}
+    # Detector e pool de processos montados uma vez para todos os blocos; o
+    # pool só é criado quando aparece um bloco grande o bastante para usá-lo
+    detector = PsychiatricDetector()
+    pool = None
+    
+    with leitor, ExitStack() as recursos:
+        blocos = iter(leitor)
+        while True:
+            with instrumentacao.etapa('leitura') as medicao:
+                bloco = next(blocos, None)
+                medicao.linhas_saida = 0 if bloco is None else len(bloco)
+            if bloco is None:
+                break
+            
+            numero = totais['blocos'] + 1
+            totais['blocos'] = numero
+            totais['lidos'] += len(bloco)
+            print(f"\n[Streaming] Bloco {numero}: {len(bloco):,} registros")
+            
+            if grupo_alvo:
+                with instrumentacao.etapa('grupo_alvo', len(bloco)) as medicao:
+                    bloco = filtrar_bloco_grupo_alvo(
+                        bloco, apenas_vitimas, pasta_cache=str(CACHE_CLASSIFICACAO)
+                    )
+                    medicao.linhas_saida = len(bloco)
+                print(f"[Streaming] Grupo-alvo: {len(bloco):,} registros mantidos")
+                if bloco.empty:
+                    continue
+            
+            with instrumentacao.etapa('padronizacao', len(bloco)) as medicao:
+                df = pipeline_padronizacao_completa(
+                    bloco, prefixo_id='REG', cache_nomes=cache_nomes,
+                    instrumentacao=instrumentacao, ocorrencias_ids=ocorrencias_ids
+                )
+                medicao.linhas_saida = len(df)
+            with instrumentacao.etapa('chaves', len(df)) as medicao:
+                df = enriquecer_com_chaves(df, pasta_cache=str(CACHE_CLASSIFICACAO))
+                medicao.linhas_saida = len(df)
+            with instrumentacao.etapa('transtornos', len(df)) as medicao:
+                if pool is None and len(df) >= MIN_TEXTOS_PARALELO:
+                    pool = detector.criar_pool(n_jobs)
+                    if pool is not None:
+                        recursos.enter_context(pool)
+                df = aplicar_detector_psiquiatrico(df, n_jobs=n_jobs, detector=detector, pool=pool)
+                medicao.linhas_saida = len(df)
+            
+            # Cabeçalho (e BOM) apenas no primeiro bloco gravado
+            primeiro = not saida.exists()
+            with instrumentacao.etapa('escrita', len(df)):
+                df.to_csv(
+                    saida, mode='w' if primeiro else 'a', header=primeiro, index=False,
+                    sep=';', encoding='utf-8-sig' if primeiro else 'utf-8'
+                )
+            
+            totais['registros'] += len(df)
+            totais['transtornos'] += int(df['tem_transtorno_psiquiatrico'].sum())
+            for chave, quantidade in contar_por_natureza(df).items():
+                totais[chave] += quantidade
+    
+    cache_nomes.salvar()
+    
+    print(f"\n[Dataset Final] Total de registros processados: {totais['registros']:,} "
+          f"em {totais['blocos']} blocos")
+    if grupo_alvo:
+        print(f"  - Lidos (antes do filtro de grupo-alvo): {totais['lidos']:,}")
+    print(f"  - Desaparecimentos: {totais['desaparecidos']:,}")
+    print(f"  - Cadáveres: {totais['cadaveres']:,}")
+    print(f"  - Homicídios: {totais['homicidios']:,}")
+    print(f"  - Outros: {totais['outros']:,}")
+    print(f"[Salvamento] Resultado gravado em: {saida}")
+    
+    salvar_relatorio_execucao(instrumentacao)
+    
+    print("\n" + "="*80)
+    print("PIPELINE CONCLUÍDO COM SUCESSO")
+    print("="*80 + "\n")
+    
+    return totais
+
+
+def pipeline_incremental(
+    caminho_csv: str,
+    output_path: Optional[str] = None,
+    caminho_indice: str = INDICE_PESSOAS,
+    reconstruir: bool = False
+) -> Optional[Dict]:
+    """
+    Incorpora uma nova exportação ao índice de pessoas, processando só o que mudou.
+    
+    As linhas do CSV já vistas em cargas anteriores são descartadas pelo hash
+    do conteúdo bruto; apenas as novas são padronizadas e pareadas contra o
+    índice (ver etl.indice_pessoas). Com o índice vazio (primeira carga ou
+    reconstruir=True) todo o histórico é processado uma vez.
+    
+    Args:
+        caminho_csv: CSV da exportação (pode conter o histórico inteiro)
+        output_path: CSV opcional com os pares novos e o pessoa_id dos registros novos
+        caminho_indice: Arquivo SQLite do índice
+        reconstruir: Descarta o índice existente e recomeça do zero
+    
+    Returns:
+        Dict com totais e os resultados de IndicePessoas.atualizar, None em caso de erro
+    """
+    print("\n" + "="*80)
+    print("INICIANDO PIPELINE INCREMENTAL (ÍNDICE DE PESSOAS)")
+    print("="*80 + "\n")
+    
+    instrumentacao = Instrumentacao('pipeline_incremental')
+    
+    with IndicePessoas(caminho_indice, reconstruir=reconstruir) as indice:
+        if not indice.compativel():
+            print("[ERRO] O índice foi gerado com outras regras de padronização; "
+                  "execute com reconstruir=True")
+            return None
         
-        # Determinar formato pelo caminho
-        if output_path.endswith('.xlsx'):
-            from utils.excel_export import criar_relatorio_completo
-            criar_relatorio_completo(df_final, output_path, incluir_estatisticas=True)
-        else:
-            df_final.to_csv(output_path, index=False, sep=';', encoding='utf-8-sig')
+        with instrumentacao.etapa('leitura') as medicao:
+            df_raw = carregar_csv(caminho_csv)
+            medicao.linhas_saida = 0 if df_raw is None else len(df_raw)
+        if df_raw is None:
+            return None
         
-        print("[Salvamento] Concluído!")
+        with instrumentacao.etapa('linhas_novas', len(df_raw)) as medicao:
+            hashes = hash_linhas(df_raw)
+            novas = ~indice.linhas_conhecidas(hashes) & ~pd.Series(hashes).duplicated().to_numpy()
+            df_raw = df_raw[novas]
+            medicao.linhas_saida = len(df_raw)
+        print(f"[Incremental] Linhas novas: {len(df_raw):,} de {len(novas):,}")
+        
+        totais = {'linhas': len(novas), 'linhas_novas': len(df_raw)}
+        if df_raw.empty:
+            print("[Incremental] Nada novo nesta exportação")
+            return totais
+        
+        with instrumentacao.etapa('padronizacao', len(df_raw)) as medicao:
+            df = pipeline_padronizacao_completa(
+                df_raw, prefixo_id='REG', cache_nomes=str(CACHE_NOMES),
+                instrumentacao=instrumentacao
+            )
+            medicao.linhas_saida = len(df)
+        
+        with instrumentacao.etapa('indice', len(df)) as medicao:
+            resultado = indice.atualizar(
+                df, hashes_linhas=hashes[novas], lote=Path(caminho_csv).name
+            )
+            medicao.linhas_saida = len(resultado['matches'])
+        
+        totais.update(resultado)
+        totais.update(indice.estatisticas())
+    
+    print(f"\n[Incremental] Índice: {totais['registros']:,} registros, "
+          f"{totais['pessoas']:,} pessoas")
+    
+    if output_path:
+        pessoas = resultado['pessoas'].set_index('id_unico')['pessoa_id']
+        pares = resultado['matches'].df.assign(
+            pessoa_id=lambda m: m['id_origem'].map(pessoas)
+        )
+        pares.to_csv(output_path, index=False, sep=';', encoding='utf-8-sig')
+        print(f"[Salvamento] Pares novos gravados em: {output_path}")
+    
+    salvar_relatorio_execucao(instrumentacao)
     
     print("\n" + "="*80)
     print("PIPELINE CONCLUÍDO COM SUCESSO")
     print("="*80 + "\n")
     
-    return df_final
+    return totais
 
 
 if __name__ == "__main__":
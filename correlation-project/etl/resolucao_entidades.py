@@ -0,0 +1,189 @@
+"""
+Resolução de entidades: agrupa todos os registros da mesma pessoa.
+
+O matching produz pares (A~B) por camada; aqui os pares de todas as
+camadas, e os grupos de registros que compartilham uma chave exata, viram
+arestas de um grafo cujas componentes conexas são as pessoas. Assim ligações
+transitivas (A~B, B~C) acabam no mesmo grupo, mesmo que A e C nunca tenham
+sido comparados.
+
+As componentes saem de uma união-busca (union-find) com compressão de
+caminho e união por tamanho sobre IDs codificados como inteiros: tempo
+praticamente linear no número de pares.
+
+O resultado é a coluna `pessoa_cluster_id`, que pode substituir
+`chave_pessoa` na correlação temporal:
+    gerar_correlacoes_temporais(df, col_pessoa='pessoa_cluster_id')
+"""
+import numpy as np
+import pandas as pd
+import sys
+from pathlib import Path
+from typing import Iterable, List, Optional, Union
+
+# Adicionar diretórios ao path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from etl.matching_engine import MatchTable
+
+# Camadas de match que ligam registros à mesma pessoa. O match fraco (só o
+# nome) fica de fora: homônimos encadeados pela transitividade juntariam
+# pessoas diferentes num mesmo grupo.
+TIPOS_RESOLUCAO = ['forte', 'moderado', 'fonetico', 'fuzzy']
+
+
+class UniaoBusca:
+    """
+    Conjuntos disjuntos sobre os inteiros 0..n-1.
+
+    Uso:
+        conjuntos = UniaoBusca(5)
+        conjuntos.unir(0, 1)
+        conjuntos.unir(1, 2)
+        conjuntos.raiz(2) == conjuntos.raiz(0)  # True
+    """
+
+    def __init__(self, n: int):
+        self.pai = list(range(n))
+        self.tamanho = [1] * n
+
+    def raiz(self, x: int) -> int:
+        """Representante do conjunto de x (com compressão de caminho por divisão)"""
+        pai = self.pai
+        while pai[x] != x:
+            pai[x] = pai[pai[x]]
+            x = pai[x]
+        return x
+
+    def unir(self, a: int, b: int) -> bool:
+        """Une os conjuntos de a e b; devolve False se já eram o mesmo"""
+        raiz_a, raiz_b = self.raiz(a), self.raiz(b)
+        if raiz_a == raiz_b:
+            return False
+        if self.tamanho[raiz_a] < self.tamanho[raiz_b]:
+            raiz_a, raiz_b = raiz_b, raiz_a
+        self.pai[raiz_b] = raiz_a
+        self.tamanho[raiz_a] += self.tamanho[raiz_b]
+        return True
+
+    def unir_pares(self, origens: np.ndarray, destinos: np.ndarray) -> int:
+        """
+        Une todos os pares (origens[i], destinos[i]).
+
+        Returns:
+            Número de uniões efetivas (pares que ligaram conjuntos distintos)
+        """
+        unioes = 0
+        for a, b in zip(origens.tolist(), destinos.tolist()):
+            if a != b and self.unir(a, b):
+                unioes += 1
+        return unioes
+
+    def raizes(self) -> np.ndarray:
+        """Representante de cada elemento"""
+        return np.fromiter((self.raiz(x) for x in range(len(self.pai))), dtype=np.int64, count=len(self.pai))
+
+
+def pares_por_chave(df: pd.DataFrame, col_chave: str, col_id: str = 'id_unico') -> pd.DataFrame:
+    """
+    Pares que ligam os registros com o mesmo valor de uma chave exata.
+
+    Cada registro é ligado ao primeiro do seu grupo (n-1 pares por grupo,
+    em vez dos n² de um self-join).
+
+    Args:
+        df: DataFrame com a chave e o ID
+        col_chave: Coluna da chave (ex.: 'chave_forte_hash', 'chave_pessoa')
+        col_id: Coluna de ID dos registros
+
+    Returns:
+        DataFrame com colunas id_origem e id_destino
+    """
+    com_chave = df.loc[df[col_chave].notna(), [col_chave, col_id]]
+    primeiro = com_chave.groupby(col_chave, sort=False)[col_id].transform('first')
+    ligados = primeiro != com_chave[col_id]
+    return pd.DataFrame({
+        'id_origem': primeiro[ligados].to_numpy(),
+        'id_destino': com_chave.loc[ligados, col_id].to_numpy(),
+    })
+
+
+def resolver_entidades(
+    df: pd.DataFrame,
+    matches: Union[MatchTable, Iterable[MatchTable], None] = None,
+    col_id: str = 'id_unico',
+    chaves_exatas: Optional[List[str]] = None,
+    tipos: Optional[List[str]] = None,
+    confianca_minima: float = 0.0,
+    col_saida: str = 'pessoa_cluster_id'
+) -> pd.DataFrame:
+    """
+    Atribui a cada registro o identificador do seu grupo de pessoa.
+
+    Args:
+        df: Registros (todos recebem um grupo; sem ligação = grupo próprio)
+        matches: MatchTable(s) de qualquer camada (ex.: engine.obter_todos_matches())
+        col_id: Coluna de ID dos registros, a mesma usada nos matches
+        chaves_exatas: Colunas cujo valor igual liga os registros (ex.: ['chave_forte_hash'])
+        tipos: Camadas de match consideradas (default: TIPOS_RESOLUCAO, sem 'fraco')
+        confianca_minima: Pares de match abaixo desta confiança são ignorados
+        col_saida: Nome da coluna de grupo
+
+    Returns:
+        Cópia rasa do DataFrame com col_saida (int64, 0..k-1 na ordem de
+        primeira aparição; registros sem ID recebem grupos próprios ao
+        final) e 'tamanho_cluster'
+    """
+    print("\n[Entidades] Agrupando registros da mesma pessoa...")
+
+    if isinstance(matches, MatchTable):
+        matches = [matches]
+    tabelas = [t.df for t in (matches or []) if len(t)]
+    tipos = TIPOS_RESOLUCAO if tipos is None else tipos
+
+    pares = [
+        t.loc[t['tipo_match'].isin(tipos) & (t['confianca'] >= confianca_minima),
+              ['id_origem', 'id_destino']]
+        for t in tabelas
+    ]
+    for col_chave in chaves_exatas or []:
+        if col_chave in df.columns:
+            pares.append(pares_por_chave(df, col_chave, col_id))
+    pares = (
+        pd.concat(pares, ignore_index=True) if pares
+        else pd.DataFrame({'id_origem': [], 'id_destino': []})
+    )
+
+    # IDs -> inteiros 0..n-1 (os do DataFrame primeiro, na ordem das linhas)
+    codigos, ids = pd.factorize(df[col_id], use_na_sentinel=True)
+    indice = pd.Index(ids)
+    origens = indice.get_indexer(pares['id_origem'])
+    destinos = indice.get_indexer(pares['id_destino'])
+    validos = (origens >= 0) & (destinos >= 0)
+    ignorados = int((~validos).sum())
+
+    conjuntos = UniaoBusca(len(ids))
+    unioes = conjuntos.unir_pares(origens[validos], destinos[validos])
+    raizes = conjuntos.raizes()
+
+    # Numeração densa dos grupos; ID ausente no registro = grupo próprio
+    grupo_por_id, _ = pd.factorize(raizes)
+    grupos = np.where(codigos >= 0, grupo_por_id[np.maximum(codigos, 0)], -1)
+    sem_id = grupos < 0
+    if sem_id.any():
+        grupos[sem_id] = grupo_por_id.max(initial=-1) + 1 + np.arange(sem_id.sum())
+
+    df = df.copy(deep=False)
+    df[col_saida] = grupos.astype('int64')
+    df['tamanho_cluster'] = df.groupby(col_saida, sort=False)[col_saida].transform('size').astype('int64')
+
+    n_grupos = df[col_saida].nunique()
+    multiplos = int((df['tamanho_cluster'] > 1).sum())
+    print(f"[Entidades] Pares considerados: {int(validos.sum()):,} ({ignorados:,} com ID fora da base)")
+    print(f"[Entidades] Uniões efetivas: {unioes:,}")
+    print(f"[Entidades] {len(df):,} registros -> {n_grupos:,} pessoas "
+          f"({multiplos:,} registros em grupos com mais de um registro)")
+    if len(df):
+        print(f"[Entidades] Maior grupo: {int(df['tamanho_cluster'].max())} registros")
+
+    return df
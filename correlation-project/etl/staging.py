@@ -0,0 +1,280 @@
+"""
+Camada de staging: DataFrames intermediários persistidos em Parquet.
+
+Cada arquivo é identificado por um nome de etapa ('bruto', 'padronizado') e
+por uma chave derivada do conteúdo da entrada, de modo que reexecuções com o
+mesmo CSV leem o resultado pronto em vez de reprocessar. As colunas recebem
+tipos explícitos antes da escrita (categorias, inteiros anuláveis, datas),
+e o Parquet preserva esses tipos na leitura.
+
+Sem pyarrow instalado, o staging usa pickle do pandas (mesma interface).
+"""
+import hashlib
+import sys
+from pathlib import Path
+from typing import Callable, Dict, Iterable, Optional
+
+import pandas as pd
+
+# Adicionar diretórios ao path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from config.config import OUTPUT_DIR, STAGING_DIR, STAGING_VERSOES_POR_ETAPA
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+    PYARROW_DISPONIVEL = True
+except ImportError:
+    PYARROW_DISPONIVEL = False
+
+
+# Colunas de baixa cardinalidade gravadas como categoria (dicionário no Parquet)
+COLUNAS_CATEGORICAS = [
+    'natureza', 'natureza_padronizada', 'natureza_envolvido', 'natureza_alvo',
+    'envolvimento', 'envolvimento_padronizado', 'papel_pessoa', 'contexto_pessoa',
+    'sexo', 'sexo_original', 'raca_iml', 'raca_padronizada',
+    'cidade_ra', 'unidade_registro', 'unidade_apuracao',
+    'uf_identidade', 'orgao_expedidor_identidade', 'nacionalidade', 'grau_instrucao',
+    'estado_civil_iml', 'estado_civil_sistema',
+    'faixa_etaria_padronizada', 'faixa_etaria_sistema',
+    'possui_laudo_iml', 'encaminhado_iml', 'pessoa_localizada', 'morador_rua',
+    'crime_tentado', 'flagrante', 'confianca_transtorno',
+]
+
+# Tipos das colunas geradas pela padronização / enriquecimento
+ESQUEMA_PADRONIZADO = {
+    'data_nascimento_dt': 'datetime64[ns]',
+    'data_fato_dt': 'datetime64[ns]',
+    'ano_nascimento': 'Int64',
+    'idade_calculada': 'Int64',
+    'idade_estimativa': 'Int64',
+    'chave_forte_hash': 'UInt64',
+    'chave_moderada_hash': 'UInt64',
+    'chave_fraca_hash': 'UInt64',
+    'chave_fonetica_hash': 'UInt64',
+    'tem_transtorno_psiquiatrico': 'bool',
+}
+
+EXTENSAO = '.parquet' if PYARROW_DISPONIVEL else '.pkl'
+
+
+def hash_arquivo(caminho: str, tamanho_bloco: int = 1 << 20) -> str:
+    """
+    Hash do conteúdo de um arquivo (BLAKE2b, 128 bits), lido em blocos.
+
+    Returns:
+        Hash hexadecimal
+    """
+    h = hashlib.blake2b(digest_size=16)
+    with open(caminho, 'rb') as f:
+        for bloco in iter(lambda: f.read(tamanho_bloco), b''):
+            h.update(bloco)
+    return h.hexdigest()
+
+
+def _uniformizar_texto(serie: pd.Series) -> pd.Series:
+    """Converte valores não-texto de uma coluna object em str (mantém nulos)"""
+    if pd.api.types.infer_dtype(serie, skipna=True) in ('string', 'empty'):
+        return serie
+    nao_texto = serie.notna() & ~serie.map(lambda v: isinstance(v, str))
+    if nao_texto.any():
+        serie = serie.copy()
+        serie[nao_texto] = serie[nao_texto].astype(str)
+    return serie
+
+
+def aplicar_esquema(
+    df: pd.DataFrame,
+    esquema: Optional[Dict[str, str]] = None,
+    categoricas: Iterable[str] = COLUNAS_CATEGORICAS
+) -> pd.DataFrame:
+    """
+    Aplica tipos explícitos antes da gravação.
+
+    Args:
+        df: DataFrame
+        esquema: Coluna -> dtype do pandas (default: ESQUEMA_PADRONIZADO)
+        categoricas: Colunas convertidas para category
+
+    Returns:
+        Cópia rasa do DataFrame com os tipos aplicados
+    """
+    esquema = ESQUEMA_PADRONIZADO if esquema is None else esquema
+    df = df.copy(deep=False)
+
+    for coluna, dtype in esquema.items():
+        if coluna in df.columns and str(df[coluna].dtype) != dtype:
+            df[coluna] = df[coluna].astype(dtype)
+
+    for coluna in categoricas:
+        if coluna in df.columns and not isinstance(df[coluna].dtype, pd.CategoricalDtype):
+            df[coluna] = _uniformizar_texto(df[coluna]).astype('category')
+
+    # Colunas texto com valores mistos (ex.: números e strings no CSV)
+    for coluna in df.columns[df.dtypes == object]:
+        df[coluna] = _uniformizar_texto(df[coluna])
+
+    return df
+
+
+def combinar_chaves(*partes) -> str:
+    """Chave única a partir de várias partes (hash da entrada, versão, ...)"""
+    h = hashlib.blake2b(digest_size=16)
+    for parte in partes:
+        h.update(str(parte).encode('utf-8'))
+        h.update(b'\x00')
+    return h.hexdigest()
+
+
+def caminho_staging(nome: str, chave: str) -> Path:
+    """Arquivo de staging de uma etapa para uma chave"""
+    return STAGING_DIR / f"{nome}_{chave[:16]}{EXTENSAO}"
+
+
+def remover_versoes_antigas(nome: str, manter: int = STAGING_VERSOES_POR_ETAPA) -> int:
+    """
+    Mantém só as `manter` versões da etapa usadas mais recentemente.
+
+    O uso é a data de modificação do arquivo, renovada a cada leitura
+    (carregar_staging), então a remoção segue a ordem LRU.
+
+    Returns:
+        Número de arquivos removidos
+    """
+    versoes = sorted(
+        STAGING_DIR.glob(f"{nome}_{'?' * 16}{EXTENSAO}"),
+        key=lambda caminho: caminho.stat().st_mtime,
+        reverse=True
+    )
+    # A versão recém-gravada é sempre a mais recente e nunca sai
+    removidas = versoes[max(manter, 1):]
+    for antigo in removidas:
+        antigo.unlink()
+    return len(removidas)
+
+
+def salvar_staging(
+    df: pd.DataFrame,
+    nome: str,
+    chave: str,
+    esquema: Optional[Dict[str, str]] = None
+) -> Path:
+    """
+    Grava o DataFrame no staging e remove as versões da mesma etapa além
+    de STAGING_VERSOES_POR_ETAPA (ver remover_versoes_antigas).
+
+    Args:
+        df: DataFrame a gravar
+        nome: Nome da etapa
+        chave: Chave de conteúdo (ex.: hash_arquivo do CSV)
+        esquema: Tipos explícitos (ver aplicar_esquema)
+
+    Returns:
+        Caminho do arquivo gravado
+    """
+    destino = caminho_staging(nome, chave)
+    destino.parent.mkdir(parents=True, exist_ok=True)
+    temporario = destino.with_name(destino.name + '.tmp')
+
+    df = aplicar_esquema(df, esquema)
+    if PYARROW_DISPONIVEL:
+        schema = pa.Schema.from_pandas(df, preserve_index=False)
+        tabela = pa.Table.from_pandas(df, schema=schema, preserve_index=False)
+        pq.write_table(tabela, temporario, compression='zstd')
+    else:
+        df.to_pickle(temporario)
+    temporario.replace(destino)
+
+    remover_versoes_antigas(nome)
+
+    print(f"[Staging] {nome}: {len(df):,} registros gravados em {destino.name}")
+    return destino
+
+
+def _ler(caminho: Path) -> pd.DataFrame:
+    if caminho.suffix == '.parquet':
+        return pd.read_parquet(caminho)
+    return pd.read_pickle(caminho)
+
+
+def carregar_staging(nome: str, chave: str) -> Optional[pd.DataFrame]:
+    """DataFrame da etapa para a chave, ou None se não estiver em staging"""
+    caminho = caminho_staging(nome, chave)
+    if not caminho.exists():
+        return None
+
+    df = _ler(caminho)
+    caminho.touch()  # Marca o uso, para a remoção das versões antigas
+    print(f"[Staging] {nome}: {len(df):,} registros lidos de {caminho.name}")
+    return df
+
+
+def carregar_ou_gerar(
+    nome: str,
+    chave: str,
+    gerar: Callable[[], pd.DataFrame],
+    esquema: Optional[Dict[str, str]] = None
+) -> pd.DataFrame:
+    """
+    Lê a etapa do staging ou a gera (e grava) se ainda não existir.
+
+    Args:
+        nome: Nome da etapa
+        chave: Chave de conteúdo
+        gerar: Função que produz o DataFrame quando não há staging
+        esquema: Tipos explícitos para a gravação
+
+    Returns:
+        DataFrame da etapa (None se gerar devolver None)
+    """
+    df = carregar_staging(nome, chave)
+    if df is not None:
+        return df
+
+    df = gerar()
+    if df is not None:
+        # Mesmos tipos da leitura do staging, para a execução seguinte ser idêntica
+        df = aplicar_esquema(df, esquema)
+        salvar_staging(df, nome, chave, esquema)
+    return df
+
+
+def salvar_dataset(df: pd.DataFrame, caminho: Path) -> Path:
+    """Grava um dataset de saída em Parquet (ou pickle) ao lado do XLSX"""
+    caminho = Path(caminho).with_suffix(EXTENSAO)
+    temporario = caminho.with_name(caminho.name + '.tmp')
+    df = aplicar_esquema(df)
+    if PYARROW_DISPONIVEL:
+        df.to_parquet(temporario, index=False, compression='zstd')
+    else:
+        df.to_pickle(temporario)
+    temporario.replace(caminho)
+    return caminho
+
+
+def carregar_dataset_unificado(caminho_xlsx: Optional[Path] = None) -> pd.DataFrame:
+    """
+    Lê o dataset unificado pela cópia Parquet, caindo para o XLSX.
+
+    Se só o XLSX existir (ou for mais novo que a cópia), ele é lido uma vez
+    e a cópia é gravada para as próximas leituras.
+
+    Args:
+        caminho_xlsx: Arquivo XLSX (default: output/dataset_unificado.xlsx)
+    """
+    caminho_xlsx = Path(caminho_xlsx or OUTPUT_DIR / "dataset_unificado.xlsx")
+    caminho_rapido = caminho_xlsx.with_suffix(EXTENSAO)
+
+    if caminho_rapido.exists() and (
+        not caminho_xlsx.exists()
+        or caminho_rapido.stat().st_mtime >= caminho_xlsx.stat().st_mtime
+    ):
+        return _ler(caminho_rapido)
+
+    df = pd.read_excel(caminho_xlsx)
+    try:
+        salvar_dataset(df, caminho_rapido)
+    except Exception as e:
+        print(f"[Staging] Aviso: não foi possível gravar {caminho_rapido.name}: {e}")
+    return df
@@ -0,0 +1,283 @@
+"""
+═══════════════════════════════════════════════════════════════════════════════
+BENCHMARK DO PIPELINE DE ETL
+═══════════════════════════════════════════════════════════════════════════════
+
+DESCRIÇÃO:
+    Mede cada etapa do pipeline sobre dados sintéticos
+    (scripts/gerar_dados_sinteticos.py) em um ou mais tamanhos:
+
+        leitura → padronização → chaves → detecção → matching
+                → correlação temporal → exportação
+
+    Os resultados (tempo, CPU, pico de memória, linhas/s) são gravados por
+    commit em output/benchmarks/, para comparação entre versões do código.
+
+USO:
+    python scripts/benchmark_pipeline.py                      (10k linhas)
+    python scripts/benchmark_pipeline.py --tamanhos 10k 1m --repeticoes 3
+    python scripts/benchmark_pipeline.py --comparar           (compara com o commit anterior)
+
+SAÍDA:
+    output/benchmarks/<commit>_<data>.json   (resultado completo da execução)
+    output/benchmarks/historico.jsonl         (uma linha por etapa/tamanho/execução)
+    output/benchmarks/dados/                  (CSVs sintéticos, reaproveitados)
+
+═══════════════════════════════════════════════════════════════════════════════
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import pandas as pd
+
+# Adicionar raiz do projeto e a pasta scripts ao path
+RAIZ = Path(__file__).parent.parent
+sys.path.insert(0, str(RAIZ))
+sys.path.insert(0, str(Path(__file__).parent))
+
+from config.config import OUTPUT_DIR
+from etl.pipeline import (
+    carregar_csv, separar_por_natureza, aplicar_detector_psiquiatrico, salvar_resultado
+)
+from etl.padronizacao import pipeline_padronizacao_completa
+from etl.matching_engine import MatchingEngine
+from etl.correlacao_temporal import gerar_correlacoes_temporais
+from etl.staging import salvar_dataset
+from utils.chaves import enriquecer_com_chaves
+from utils.instrumentacao import Instrumentacao
+from gerar_dados_sinteticos import TAMANHOS, gerar_csv
+
+
+BENCHMARKS_DIR = OUTPUT_DIR / "benchmarks"
+ARQUIVO_HISTORICO = BENCHMARKS_DIR / "historico.jsonl"
+ETAPAS = ['leitura', 'padronizacao', 'chaves', 'deteccao', 'matching', 'correlacao', 'exportacao']
+
+
+def info_git() -> Dict[str, object]:
+    """Commit atual e se há alterações não commitadas"""
+    def git(*args) -> str:
+        return subprocess.run(
+            ['git', *args], cwd=RAIZ, capture_output=True, text=True, check=True
+        ).stdout.strip()
+
+    try:
+        return {
+            'commit': git('rev-parse', '--short', 'HEAD'),
+            'assunto': git('log', '-1', '--format=%s'),
+            'alterado': bool(git('status', '--porcelain', '--untracked-files=no')),
+        }
+    except (OSError, subprocess.CalledProcessError):
+        return {'commit': 'desconhecido', 'assunto': '', 'alterado': None}
+
+
+def info_maquina() -> Dict[str, object]:
+    return {
+        'python': platform.python_version(),
+        'pandas': pd.__version__,
+        'sistema': platform.platform(),
+        'cpus': os.cpu_count(),
+    }
+
+
+def preparar_dados(linhas: int, taxa_duplicatas: float, semente: int) -> Path:
+    """CSV sintético do tamanho pedido (gerado uma vez e reaproveitado)"""
+    caminho = BENCHMARKS_DIR / "dados" / f"ocorrencias_{linhas}_d{taxa_duplicatas:g}_s{semente}.csv"
+    if not caminho.exists():
+        gerar_csv(caminho, linhas, taxa_duplicatas=taxa_duplicatas, semente=semente)
+    return caminho
+
+
+def executar_rodada(caminho_csv: Path, n_jobs: int, instrumentacao: Instrumentacao) -> None:
+    """Executa todas as etapas uma vez, medindo cada uma"""
+    with instrumentacao.etapa('leitura') as medicao:
+        df = carregar_csv(str(caminho_csv))
+        medicao.linhas_saida = len(df)
+
+    with instrumentacao.etapa('padronizacao', len(df)) as medicao:
+        # Sem cache de nomes: mede a normalização a frio
+        df = pipeline_padronizacao_completa(df, prefixo_id='REG')
+        medicao.linhas_saida = len(df)
+
+    with instrumentacao.etapa('chaves', len(df)) as medicao:
+        df = enriquecer_com_chaves(df)
+        medicao.linhas_saida = len(df)
+
+    with instrumentacao.etapa('deteccao', len(df)) as medicao:
+        df = aplicar_detector_psiquiatrico(df, n_jobs=n_jobs)
+        medicao.linhas_saida = int(df['tem_transtorno_psiquiatrico'].sum())
+
+    bases = separar_por_natureza(df, copiar=False)
+    desaparecidos, cadaveres = bases['desaparecidos'], bases['cadaveres']
+    with instrumentacao.etapa('matching', len(desaparecidos) + len(cadaveres)) as medicao:
+        engine = MatchingEngine()
+        matches = engine.executar_matching_completo(desaparecidos, cadaveres, "Desaparecidos", "Cadáveres")
+        medicao.linhas_saida = sum(len(tabela) for tabela in matches.values())
+
+    with instrumentacao.etapa('correlacao', len(df)) as medicao:
+        correlacoes = gerar_correlacoes_temporais(df)
+        medicao.linhas_saida = len(correlacoes)
+
+    with tempfile.TemporaryDirectory() as pasta, instrumentacao.etapa('exportacao', len(df)) as medicao:
+        # XLSX não comporta os tamanhos maiores; mede CSV + cópia Parquet/pickle
+        salvar_resultado(df, str(Path(pasta) / 'dataset.csv'))
+        salvar_dataset(df, Path(pasta) / 'dataset')
+        medicao.linhas_saida = len(df)
+
+
+def medir_tamanho(caminho_csv: Path, repeticoes: int, n_jobs: int, verboso: bool) -> Dict[str, Dict]:
+    """
+    Executa as rodadas e devolve, por etapa, o melhor tempo e a mediana.
+
+    Returns:
+        Dict etapa -> métricas
+    """
+    rodadas: List[Dict[str, Dict]] = []
+    for numero in range(1, repeticoes + 1):
+        instrumentacao = Instrumentacao(f'benchmark_{caminho_csv.stem}')
+        saida = contextlib.nullcontext() if verboso else contextlib.redirect_stdout(io.StringIO())
+        with saida:
+            executar_rodada(caminho_csv, n_jobs, instrumentacao)
+        resumo = instrumentacao.resumo()
+        rodadas.append({etapa: resumo[etapa] for etapa in ETAPAS})
+        total = sum(resumo[etapa]['tempo_s'] for etapa in ETAPAS)
+        print(f"[Benchmark]   rodada {numero}/{repeticoes}: {total:.2f}s")
+
+    resultado = {}
+    for etapa in ETAPAS:
+        tempos = sorted(rodada[etapa]['tempo_s'] for rodada in rodadas)
+        melhor = min(rodadas, key=lambda rodada: rodada[etapa]['tempo_s'])[etapa]
+        linhas = melhor['linhas_entrada'] or melhor['linhas_saida']
+        resultado[etapa] = {
+            'tempo_min_s': tempos[0],
+            'tempo_mediana_s': tempos[len(tempos) // 2],
+            'cpu_s': melhor['cpu_s'],
+            'delta_pico_rss_mb': max(rodada[etapa]['delta_pico_rss_mb'] for rodada in rodadas),
+            'linhas_entrada': melhor['linhas_entrada'],
+            'linhas_saida': melhor['linhas_saida'],
+            'linhas_por_segundo': (round(linhas / tempos[0], 1) if tempos[0] > 0 and linhas else None),
+        }
+    return resultado
+
+
+def carregar_historico() -> pd.DataFrame:
+    if not ARQUIVO_HISTORICO.exists():
+        return pd.DataFrame()
+    with open(ARQUIVO_HISTORICO, 'r', encoding='utf-8') as f:
+        return pd.DataFrame([json.loads(linha) for linha in f if linha.strip()])
+
+
+def registrar(execucao: Dict) -> Path:
+    """Grava o JSON da execução e acrescenta as linhas ao histórico"""
+    BENCHMARKS_DIR.mkdir(parents=True, exist_ok=True)
+    git = execucao['git']
+    caminho = BENCHMARKS_DIR / f"{git['commit']}_{execucao['inicio'].replace(':', '')}.json"
+    with open(caminho, 'w', encoding='utf-8') as f:
+        json.dump(execucao, f, ensure_ascii=False, indent=2)
+
+    with open(ARQUIVO_HISTORICO, 'a', encoding='utf-8') as f:
+        for linhas, etapas in execucao['resultados'].items():
+            for etapa, metricas in etapas.items():
+                f.write(json.dumps({
+                    'inicio': execucao['inicio'],
+                    'commit': git['commit'],
+                    'alterado': git['alterado'],
+                    'linhas': int(linhas),
+                    'etapa': etapa,
+                    **metricas,
+                }, ensure_ascii=False) + '\n')
+    return caminho
+
+
+def comparar(execucao: Dict, referencia: Optional[str] = None) -> None:
+    """
+    Compara a execução com a última medição de outro commit (ou de `referencia`).
+
+    A razão é tempo_atual / tempo_referência (< 1 = mais rápido).
+    """
+    historico = carregar_historico()
+    if historico.empty:
+        print("[Benchmark] Sem histórico para comparar")
+        return
+
+    commit_atual = execucao['git']['commit']
+    anteriores = historico[historico['inicio'] != execucao['inicio']]
+    if referencia:
+        anteriores = anteriores[anteriores['commit'] == referencia]
+    else:
+        anteriores = anteriores[anteriores['commit'] != commit_atual]
+    if anteriores.empty:
+        print("[Benchmark] Nenhuma medição de referência encontrada")
+        return
+
+    base = anteriores.sort_values('inicio').groupby(['linhas', 'etapa']).last()
+    print(f"\n[Benchmark] Comparação com {referencia or 'a última medição de outro commit'}")
+    print(f"  {'linhas':>10}  {'etapa':<14} {'ref (s)':>10} {'atual (s)':>10} {'razão':>7}  commit ref")
+    for linhas, etapas in execucao['resultados'].items():
+        for etapa, metricas in etapas.items():
+            chave = (int(linhas), etapa)
+            if chave not in base.index:
+                continue
+            ref = base.loc[chave]
+            razao = metricas['tempo_min_s'] / ref['tempo_min_s'] if ref['tempo_min_s'] > 0 else float('nan')
+            print(f"  {int(linhas):>10,}  {etapa:<14} {ref['tempo_min_s']:>10.3f} "
+                  f"{metricas['tempo_min_s']:>10.3f} {razao:>7.2f}  {ref['commit']}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark das etapas do pipeline de ETL')
+    parser.add_argument('--tamanhos', nargs='+', default=['10k'],
+                        help='Tamanhos (10k, 1m, 10m ou número de linhas)')
+    parser.add_argument('--repeticoes', type=int, default=1)
+    parser.add_argument('--n-jobs', type=int, default=1, help='Processos do detector psiquiátrico')
+    parser.add_argument('--taxa-duplicatas', type=float, default=0.3)
+    parser.add_argument('--semente', type=int, default=42)
+    parser.add_argument('--comparar', nargs='?', const='', default=None, metavar='COMMIT',
+                        help='Compara com a última medição de outro commit (ou do COMMIT indicado)')
+    parser.add_argument('--verboso', action='store_true', help='Mostra a saída das etapas')
+    args = parser.parse_args()
+
+    execucao = {
+        'inicio': datetime.now().isoformat(timespec='seconds'),
+        'git': info_git(),
+        'maquina': info_maquina(),
+        'parametros': {
+            'repeticoes': args.repeticoes, 'n_jobs': args.n_jobs,
+            'taxa_duplicatas': args.taxa_duplicatas, 'semente': args.semente,
+        },
+        'resultados': {},
+    }
+    alterado = ' (com alterações locais)' if execucao['git']['alterado'] else ''
+    print(f"[Benchmark] Commit {execucao['git']['commit']}{alterado}")
+
+    for tamanho in args.tamanhos:
+        linhas = TAMANHOS.get(tamanho.lower()) or int(tamanho)
+        caminho_csv = preparar_dados(linhas, args.taxa_duplicatas, args.semente)
+        print(f"\n[Benchmark] {linhas:,} linhas ({caminho_csv.name})")
+        resultado = medir_tamanho(caminho_csv, args.repeticoes, args.n_jobs, args.verboso)
+        execucao['resultados'][str(linhas)] = resultado
+
+        for etapa, metricas in resultado.items():
+            taxa = f"{metricas['linhas_por_segundo']:,.0f} linhas/s" if metricas['linhas_por_segundo'] else '-'
+            print(f"  {etapa:<14} {metricas['tempo_min_s']:>9.3f}s  cpu {metricas['cpu_s']:>8.2f}s  "
+                  f"Δpico {metricas['delta_pico_rss_mb']:>7.1f} MB  {taxa}")
+
+    caminho = registrar(execucao)
+    print(f"\n[Benchmark] Resultado gravado em: {caminho}")
+
+    if args.comparar is not None:
+        comparar(execucao, args.comparar or None)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,420 @@
+"""
+═══════════════════════════════════════════════════════════════════════════════
+GERADOR DE OCORRÊNCIAS SINTÉTICAS
+═══════════════════════════════════════════════════════════════════════════════
+
+DESCRIÇÃO:
+    Gera um CSV no formato da extração de ocorrências (separador ';',
+    latin-1), com os cabeçalhos de FIELD_MAPPING — inclusive as variantes
+    com mojibake ('HistÃ³rico', 'ï»¿Sequencial', ...). Serve de entrada
+    para o benchmark (scripts/benchmark_pipeline.py) e para testar o
+    pipeline sem dados reais.
+
+CARACTERÍSTICAS:
+    ✅ Nomes, datas e naturezas com distribuições próximas das reais
+    ✅ Taxa controlável de pessoas repetidas (mesma pessoa em vários BOs),
+       com variações de grafia (sem acento, minúsculas, letra faltando)
+    ✅ Datas de nascimento em formatos mistos e campos ausentes
+    ✅ Históricos com e sem menções a transtornos psiquiátricos
+    ✅ Geração vetorizada em blocos: 10 milhões de linhas em memória limitada
+
+USO:
+    python scripts/gerar_dados_sinteticos.py --tamanho 10k
+    python scripts/gerar_dados_sinteticos.py --tamanho 1m --taxa-duplicatas 0.4
+    python scripts/gerar_dados_sinteticos.py --linhas 250000 --cabecalho mojibake
+
+═══════════════════════════════════════════════════════════════════════════════
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+from typing import Dict, Optional
+
+import numpy as np
+import pandas as pd
+
+# Adicionar raiz do projeto ao path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from config.config import FIELD_MAPPING, OUTPUT_DIR, PSYCHIATRIC_KEYWORDS
+
+
+TAMANHOS = {'10k': 10_000, '1m': 1_000_000, '10m': 10_000_000}
+BLOCO_PADRAO = 250_000
+
+PRIMEIROS_NOMES_M = [
+    'JOSÉ', 'JOÃO', 'ANTÔNIO', 'FRANCISCO', 'CARLOS', 'PAULO', 'PEDRO', 'LUCAS',
+    'LUIZ', 'MARCOS', 'LUÍS', 'GABRIEL', 'RAFAEL', 'DANIEL', 'MARCELO', 'BRUNO',
+    'EDUARDO', 'FELIPE', 'RAIMUNDO', 'RODRIGO', 'SEBASTIÃO', 'MATHEUS', 'ANDRÉ',
+    'FERNANDO', 'FÁBIO', 'LEONARDO', 'GUSTAVO', 'GUILHERME', 'JÚLIO', 'CÉSAR',
+]
+PRIMEIROS_NOMES_F = [
+    'MARIA', 'ANA', 'FRANCISCA', 'ANTÔNIA', 'ADRIANA', 'JULIANA', 'MÁRCIA',
+    'FERNANDA', 'PATRÍCIA', 'ALINE', 'SANDRA', 'CAMILA', 'AMANDA', 'BRUNA',
+    'JÉSSICA', 'LETÍCIA', 'JÚLIA', 'LUCIANA', 'VANESSA', 'MARIANA', 'GABRIELA',
+    'VERA', 'VITÓRIA', 'LARISSA', 'CLÁUDIA', 'BEATRIZ', 'CONCEIÇÃO', 'LÚCIA',
+]
+SOBRENOMES = [
+    'DA SILVA', 'DOS SANTOS', 'OLIVEIRA', 'DE SOUZA', 'RODRIGUES', 'FERREIRA',
+    'ALVES', 'PEREIRA', 'LIMA', 'GOMES', 'COSTA', 'RIBEIRO', 'MARTINS',
+    'CARVALHO', 'DE ALMEIDA', 'LOPES', 'SOARES', 'FERNANDES', 'VIEIRA',
+    'BARBOSA', 'ROCHA', 'DIAS', 'NASCIMENTO', 'ANDRADE', 'MOREIRA', 'NUNES',
+    'MARQUES', 'MACHADO', 'MENDES', 'FREITAS', 'CARDOSO', 'RAMOS', 'GONÇALVES',
+    'SANTANA', 'TEIXEIRA', 'ARAÚJO', 'CONCEIÇÃO', 'BRANDÃO', 'MAGALHÃES', 'DE JESUS',
+]
+
+# Natureza -> peso relativo (as três naturezas-alvo são minoria na extração real)
+NATUREZAS = {
+    'DESAPARECIMENTO DE PESSOA': 0.06,
+    'LOCALIZAÇÃO DE CADÁVER': 0.025,
+    'HOMICÍDIO': 0.02,
+    'LATROCÍNIO': 0.003,
+    'FURTO': 0.25,
+    'ROUBO': 0.18,
+    'LESÃO CORPORAL': 0.14,
+    'AMEAÇA': 0.12,
+    'ESTELIONATO': 0.08,
+    'DANO': 0.05,
+    'VIOLÊNCIA DOMÉSTICA': 0.072,
+}
+NATUREZAS_MORTE = {'LOCALIZAÇÃO DE CADÁVER', 'HOMICÍDIO', 'LATROCÍNIO'}
+
+VINCULOS = {'VÍTIMA': 0.62, 'AUTOR': 0.18, 'TESTEMUNHA': 0.08, 'COMUNICANTE': 0.1, 'REPRESENTANTE': 0.02}
+CIDADES = [
+    'BRASÍLIA', 'CEILÂNDIA', 'TAGUATINGA', 'SAMAMBAIA', 'PLANALTINA', 'GAMA',
+    'SOBRADINHO', 'RECANTO DAS EMAS', 'SANTA MARIA', 'SÃO SEBASTIÃO', 'GUARÁ',
+    'ÁGUAS CLARAS', 'RIACHO FUNDO', 'PARANOÁ', 'BRAZLÂNDIA', 'ESTRUTURAL',
+]
+UNIDADES = [f'{n}ª DP' for n in range(1, 39)] + ['DPCA', 'DCCP', 'DEAM', 'CORPATRI']
+RACAS = {'PARDA': 0.47, 'BRANCA': 0.36, 'PRETA': 0.12, 'AMARELA': 0.01, 'INDÍGENA': 0.005, 'NÃO INFORMADA': 0.035}
+
+# Modelos de histórico por grupo de natureza
+HISTORICOS_DESAPARECIMENTO = [
+    'COMUNICANTE INFORMA QUE {nome} SAIU DE CASA PELA MANHÃ E NÃO RETORNOU. NÃO LEVOU DOCUMENTOS.',
+    'FAMILIARES DE {nome} PROCURARAM A DELEGACIA INFORMANDO QUE ELE(A) NÃO FAZ CONTATO HÁ TRÊS DIAS.',
+]
+HISTORICOS_MORTE = [
+    'GUARNIÇÃO ACIONADA VIA CIADE PARA ATENDER OCORRÊNCIA. NO LOCAL, ENCONTRADO CORPO DE {nome}, SEM SINAIS APARENTES DE VIOLÊNCIA.',
+    'VÍTIMA {nome} FOI ATINGIDA POR DISPAROS DE ARMA DE FOGO, VINDO A ÓBITO NO LOCAL. PERÍCIA ACIONADA.',
+]
+HISTORICOS_OUTROS = [
+    'RELATA A VÍTIMA QUE TEVE SEU APARELHO CELULAR SUBTRAÍDO EM VIA PÚBLICA POR INDIVÍDUO DESCONHECIDO.',
+    'NOTICIA O COMUNICANTE DISCUSSÃO ENTRE VIZINHOS, COM AMEAÇAS VERBAIS. AS PARTES FORAM ORIENTADAS.',
+    'REGISTRO DE FURTO EM RESIDÊNCIA. AUTORIA DESCONHECIDA. NÃO HÁ CÂMERAS NO LOCAL.',
+]
+HISTORICOS_PSIQUIATRICOS = [
+    'COMUNICANTE INFORMA QUE {nome} TEM {termo} E SAIU DE CASA DURANTE A MADRUGADA.',
+    'SEGUNDO A FAMÍLIA, {nome} FAZ USO DE {termo} E ESTAVA SEM A MEDICAÇÃO HÁ UMA SEMANA.',
+    'A MÃE RELATA QUE {nome} APRESENTOU {termo} NA NOITE ANTERIOR AO DESAPARECIMENTO.',
+    'VIZINHOS INFORMAM QUE A VÍTIMA {nome} TINHA HISTÓRICO DE {termo}, COM PASSAGENS PELO HOSPITAL.',
+]
+
+
+def _escolher(rng: np.random.Generator, opcoes, n: int, pesos=None) -> np.ndarray:
+    """Amostra n valores (object) de uma lista, com pesos opcionais"""
+    opcoes = np.asarray(list(opcoes), dtype=object)
+    if pesos is not None:
+        pesos = np.asarray(list(pesos), dtype=float)
+        pesos = pesos / pesos.sum()
+    return opcoes[rng.choice(len(opcoes), size=n, p=pesos)]
+
+
+def cabecalhos(variante: str = 'original', rng: Optional[np.random.Generator] = None) -> Dict[str, str]:
+    """
+    Cabeçalho do CSV para cada campo padronizado, a partir de FIELD_MAPPING.
+
+    Args:
+        variante: 'original' (acentos corretos), 'mojibake' (UTF-8 lido como
+            latin-1, como nas extrações com problema) ou 'misto' (sorteado por coluna)
+        rng: Gerador usado na variante 'misto'
+
+    Returns:
+        Dict campo padronizado -> cabeçalho
+    """
+    rng = rng or np.random.default_rng(0)
+    variantes: Dict[str, list] = {}
+    for cabecalho, campo in FIELD_MAPPING.items():
+        variantes.setdefault(campo, []).append(cabecalho)
+
+    resultado = {}
+    for campo, opcoes in variantes.items():
+        corrompidos = [c for c in opcoes if 'Ã' in c or c.startswith('ï»¿')]
+        originais = [c for c in opcoes if c not in corrompidos]
+        usar_mojibake = variante == 'mojibake' or (variante == 'misto' and rng.random() < 0.5)
+        if usar_mojibake and corrompidos:
+            resultado[campo] = corrompidos[0]
+        else:
+            resultado[campo] = (originais or opcoes)[0]
+    return resultado
+
+
+class GeradorOcorrencias:
+    """
+    Gera blocos de ocorrências sintéticas.
+
+    As pessoas ficam em uma tabela compacta (índices em listas de nomes e
+    data de nascimento em dias); cada linha sorteia uma pessoa, de modo que
+    a fração `taxa_duplicatas` das linhas repete pessoas já usadas.
+
+    Uso:
+        gerador = GeradorOcorrencias(linhas=1_000_000, taxa_duplicatas=0.3)
+        for bloco in gerador.blocos(250_000):
+            ...
+    """
+
+    def __init__(
+        self,
+        linhas: int,
+        taxa_duplicatas: float = 0.3,
+        taxa_transtorno: float = 0.15,
+        taxa_variacao_nome: float = 0.2,
+        semente: int = 42
+    ):
+        """
+        Args:
+            linhas: Total de linhas
+            taxa_duplicatas: Fração das linhas que repetem uma pessoa
+            taxa_transtorno: Fração dos históricos de naturezas-alvo com menção psiquiátrica
+            taxa_variacao_nome: Fração das repetições com grafia alterada do nome
+            semente: Semente do gerador (mesma semente = mesmo arquivo)
+        """
+        if not 0 <= taxa_duplicatas < 1:
+            raise ValueError("taxa_duplicatas deve estar em [0, 1)")
+
+        self.linhas = linhas
+        self.taxa_duplicatas = taxa_duplicatas
+        self.taxa_transtorno = taxa_transtorno
+        self.taxa_variacao_nome = taxa_variacao_nome
+        self.rng = np.random.default_rng(semente)
+
+        self.n_pessoas = max(1, int(round(linhas * (1 - taxa_duplicatas))))
+        self._gerar_pessoas()
+        self._acentos = str.maketrans('ÁÀÂÃÉÊÍÓÔÕÚÜÇ', 'AAAAEEIOOOUUC')
+
+    def _gerar_pessoas(self) -> None:
+        rng, n = self.rng, self.n_pessoas
+        self.sexo = rng.random(n) < 0.55  # True = masculino
+        self.primeiro = rng.integers(0, max(len(PRIMEIROS_NOMES_M), len(PRIMEIROS_NOMES_F)), n, dtype=np.int16)
+        self.sobrenome1 = rng.integers(0, len(SOBRENOMES), n, dtype=np.int16)
+        self.sobrenome2 = rng.integers(0, len(SOBRENOMES), n, dtype=np.int16)
+        self.mae_primeiro = rng.integers(0, len(PRIMEIROS_NOMES_F), n, dtype=np.int16)
+        self.mae_sobrenome = rng.integers(0, len(SOBRENOMES), n, dtype=np.int16)
+        # Nascimento entre 1940 e 2015, concentrado em adultos jovens
+        anos = np.clip(rng.normal(1988, 15, n), 1940, 2015)
+        self.nascimento = (
+            (anos - 1970) * 365.25 + rng.integers(0, 365, n)
+        ).astype('int32')  # dias desde 1970-01-01
+
+    def _nomes(self, pessoas: np.ndarray) -> np.ndarray:
+        masculino = self.sexo[pessoas]
+        nomes_m = np.asarray(PRIMEIROS_NOMES_M, dtype=object)
+        nomes_f = np.asarray(PRIMEIROS_NOMES_F, dtype=object)
+        sobrenomes = np.asarray(SOBRENOMES, dtype=object)
+        primeiro = np.where(
+            masculino,
+            nomes_m[self.primeiro[pessoas] % len(nomes_m)],
+            nomes_f[self.primeiro[pessoas] % len(nomes_f)],
+        )
+        return primeiro + ' ' + sobrenomes[self.sobrenome1[pessoas]] + ' ' + sobrenomes[self.sobrenome2[pessoas]]
+
+    def _variar_nomes(self, nomes: pd.Series, mascara: np.ndarray) -> pd.Series:
+        """Grafias alternativas: sem acento, minúsculas ou uma letra a menos"""
+        indices = np.flatnonzero(mascara)
+        if len(indices) == 0:
+            return nomes
+        tipo = self.rng.integers(0, 3, len(indices))
+        nomes = nomes.copy()
+
+        sem_acento = indices[tipo == 0]
+        nomes.iloc[sem_acento] = nomes.iloc[sem_acento].str.translate(self._acentos)
+        minusculas = indices[tipo == 1]
+        nomes.iloc[minusculas] = nomes.iloc[minusculas].str.title()
+
+        com_erro = indices[tipo == 2]
+        posicoes = self.rng.random(len(com_erro))
+        nomes.iloc[com_erro] = [
+            nome[:p] + nome[p + 1:]
+            for nome, p in zip(nomes.iloc[com_erro], (posicoes * nomes.iloc[com_erro].str.len()).astype(int))
+        ]
+        return nomes
+
+    @staticmethod
+    def _formatar_datas(dias: np.ndarray, rng: np.random.Generator, taxa_ausente: float) -> pd.Series:
+        """Datas em dd/mm/aaaa (maioria), aaaa-mm-dd e dd/mm/aaaa hh:mm, com ausentes"""
+        datas = pd.Series(pd.to_datetime(dias.astype('int64'), unit='D'))
+        formato = rng.choice(3, size=len(dias), p=[0.8, 0.12, 0.08])
+        texto = datas.dt.strftime('%d/%m/%Y').astype(object)
+        iso = formato == 1
+        texto[iso] = datas[iso].dt.strftime('%Y-%m-%d')
+        com_hora = formato == 2
+        texto[com_hora] = datas[com_hora].dt.strftime('%d/%m/%Y 00:00')
+        texto[rng.random(len(dias)) < taxa_ausente] = np.nan
+        return texto
+
+    def _historicos(self, nomes: pd.Series, natureza: np.ndarray) -> np.ndarray:
+        rng, n = self.rng, len(nomes)
+        desaparecimento = natureza == 'DESAPARECIMENTO DE PESSOA'
+        morte = np.isin(natureza, list(NATUREZAS_MORTE))
+        psiquiatrico = (desaparecimento | morte) & (rng.random(n) < self.taxa_transtorno)
+
+        modelos = _escolher(rng, HISTORICOS_OUTROS, n)
+        modelos[desaparecimento] = _escolher(rng, HISTORICOS_DESAPARECIMENTO, int(desaparecimento.sum()))
+        modelos[morte] = _escolher(rng, HISTORICOS_MORTE, int(morte.sum()))
+        modelos[psiquiatrico] = _escolher(rng, HISTORICOS_PSIQUIATRICOS, int(psiquiatrico.sum()))
+        termos = _escolher(rng, PSYCHIATRIC_KEYWORDS, n)
+
+        historicos = np.empty(n, dtype=object)
+        for i, (modelo, nome, termo) in enumerate(zip(modelos, nomes, termos)):
+            historicos[i] = modelo.format(nome=nome, termo=termo.upper())
+        historicos[rng.random(n) < 0.02] = np.nan
+        return historicos
+
+    def gerar_bloco(self, inicio: int, tamanho: int) -> pd.DataFrame:
+        """
+        Gera as linhas [inicio, inicio + tamanho).
+
+        Args:
+            inicio: Número da primeira linha (usado no sequencial)
+            tamanho: Quantidade de linhas
+
+        Returns:
+            DataFrame com colunas padronizadas (ver cabecalhos)
+        """
+        rng = self.rng
+        sequencial = np.arange(inicio, inicio + tamanho)
+
+        # Primeira aparição de cada pessoa em ordem; demais linhas repetem pessoas
+        pessoas = np.where(
+            sequencial < self.n_pessoas,
+            sequencial,
+            rng.integers(0, self.n_pessoas, tamanho)
+        ) % self.n_pessoas
+        repetida = sequencial >= self.n_pessoas
+
+        natureza = _escolher(rng, NATUREZAS, tamanho, NATUREZAS.values())
+        vinculo = _escolher(rng, VINCULOS, tamanho, VINCULOS.values())
+        masculino = self.sexo[pessoas]
+
+        nomes = pd.Series(self._nomes(pessoas))
+        nomes = self._variar_nomes(nomes, repetida & (rng.random(tamanho) < self.taxa_variacao_nome))
+        nomes_f = np.asarray(PRIMEIROS_NOMES_F, dtype=object)
+        sobrenomes = np.asarray(SOBRENOMES, dtype=object)
+        maes = nomes_f[self.mae_primeiro[pessoas]] + ' ' + sobrenomes[self.mae_sobrenome[pessoas]]
+        maes[rng.random(tamanho) < 0.25] = np.nan
+
+        # Fatos entre 2019 e 2024; registro até 10 dias depois
+        dias_fato = rng.integers(17897, 19967, tamanho)
+        dias_registro = dias_fato + rng.integers(0, 11, tamanho)
+        datas_registro = pd.to_datetime(dias_registro.astype('int64'), unit='D')
+        idade = ((dias_fato - self.nascimento[pessoas]) / 365.25).astype(int)
+
+        localizada = np.where(
+            natureza == 'DESAPARECIMENTO DE PESSOA',
+            _escolher(rng, ['SIM', 'NÃO', ''], tamanho, [0.35, 0.5, 0.15]),
+            ''
+        )
+        morte = np.isin(natureza, list(NATUREZAS_MORTE))
+
+        return pd.DataFrame({
+            'sequencial': sequencial + 1,
+            'codigo_ocorrencia': 1_000_000 + sequencial,
+            'numero_ocorrencia': rng.integers(1, 40_000, tamanho),
+            'ano_registro': datas_registro.year,
+            'data_registro': datas_registro.strftime('%d/%m/%Y %H:%M'),
+            'data_fato': self._formatar_datas(dias_fato, rng, taxa_ausente=0.01),
+            'unidade_registro': _escolher(rng, UNIDADES, tamanho),
+            'cidade_ra': _escolher(rng, CIDADES, tamanho),
+            'natureza': natureza,
+            'natureza_envolvido': np.where(vinculo == 'VÍTIMA', natureza, ''),
+            'envolvimento': vinculo,
+            'tipo_vinculo': vinculo,
+            'nome': nomes.to_numpy(),
+            'nome_mae': maes,
+            'nome_pai': np.where(rng.random(tamanho) < 0.5, 'NÃO DECLARADO', ''),
+            'sexo_original': np.where(masculino, 'MASCULINO', 'FEMININO'),
+            'sexo': np.where(rng.random(tamanho) < 0.03, 'IGNORADO', np.where(masculino, 'M', 'F')),
+            'data_nascimento': self._formatar_datas(self.nascimento[pessoas], rng, taxa_ausente=0.12),
+            'idade_ocorrencia': idade,
+            'raca_padronizada': _escolher(rng, RACAS, tamanho, RACAS.values()),
+            'numero_identidade': np.where(
+                rng.random(tamanho) < 0.6, (1_000_000 + pessoas * 7 % 8_999_999).astype(str), ''
+            ),
+            'orgao_expedidor_identidade': 'SSP',
+            'uf_identidade': _escolher(rng, ['DF', 'GO', 'MG', 'BA', 'SP'], tamanho, [0.7, 0.12, 0.08, 0.06, 0.04]),
+            'pessoa_localizada': localizada,
+            'possui_laudo_iml': np.where(morte, 'SIM', 'NÃO'),
+            'codigo_iml_pessoa': np.where(morte, (500_000 + sequencial).astype(str), ''),
+            'historico': self._historicos(nomes, natureza),
+        })
+
+    def blocos(self, tamanho_bloco: int = BLOCO_PADRAO):
+        """Itera sobre todos os blocos do arquivo"""
+        for inicio in range(0, self.linhas, tamanho_bloco):
+            yield self.gerar_bloco(inicio, min(tamanho_bloco, self.linhas - inicio))
+
+
+def gerar_csv(
+    caminho: str,
+    linhas: int,
+    taxa_duplicatas: float = 0.3,
+    taxa_transtorno: float = 0.15,
+    cabecalho: str = 'misto',
+    semente: int = 42,
+    tamanho_bloco: int = BLOCO_PADRAO
+) -> Path:
+    """
+    Gera o CSV sintético completo.
+
+    Args:
+        caminho: Arquivo de saída
+        linhas: Total de linhas
+        taxa_duplicatas: Fração das linhas que repetem uma pessoa
+        taxa_transtorno: Fração dos históricos de naturezas-alvo com menção psiquiátrica
+        cabecalho: Variante dos cabeçalhos ('original', 'mojibake' ou 'misto')
+        semente: Semente do gerador
+        tamanho_bloco: Linhas geradas/gravadas por vez
+
+    Returns:
+        Caminho do arquivo gerado
+    """
+    caminho = Path(caminho)
+    caminho.parent.mkdir(parents=True, exist_ok=True)
+    temporario = caminho.with_name(caminho.name + '.tmp')
+
+    gerador = GeradorOcorrencias(linhas, taxa_duplicatas, taxa_transtorno, semente=semente)
+    nomes_colunas = cabecalhos(cabecalho, np.random.default_rng(semente))
+
+    print(f"[Gerador] {linhas:,} linhas, {gerador.n_pessoas:,} pessoas distintas -> {caminho}")
+    inicio = time.perf_counter()
+    with open(temporario, 'w', encoding='latin-1', errors='replace', newline='') as f:
+        for numero, bloco in enumerate(gerador.blocos(tamanho_bloco)):
+            bloco = bloco.rename(columns=nomes_colunas)
+            bloco.to_csv(f, sep=';', index=False, header=numero == 0)
+            print(f"[Gerador] {min((numero + 1) * tamanho_bloco, linhas):,} linhas gravadas")
+    temporario.replace(caminho)
+
+    print(f"[Gerador] Concluído em {time.perf_counter() - inicio:.1f}s")
+    return caminho
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Gera CSV sintético de ocorrências')
+    parser.add_argument('--tamanho', choices=sorted(TAMANHOS), default='10k',
+                        help='Tamanho predefinido (10k, 1m, 10m)')
+    parser.add_argument('--linhas', type=int, help='Total de linhas (sobrepõe --tamanho)')
+    parser.add_argument('--saida', help='CSV de saída (default: output/sinteticos/ocorrencias_<linhas>.csv)')
+    parser.add_argument('--taxa-duplicatas', type=float, default=0.3)
+    parser.add_argument('--taxa-transtorno', type=float, default=0.15)
+    parser.add_argument('--cabecalho', choices=['original', 'mojibake', 'misto'], default='misto')
+    parser.add_argument('--semente', type=int, default=42)
+    args = parser.parse_args()
+
+    linhas = args.linhas or TAMANHOS[args.tamanho]
+    saida = args.saida or OUTPUT_DIR / 'sinteticos' / f'ocorrencias_{linhas}.csv'
+    gerar_csv(saida, linhas, args.taxa_duplicatas, args.taxa_transtorno, args.cabecalho, args.semente)
+
+
+if __name__ == "__main__":
+    main()
@@ -5,7 +5,8 @@ MONITOR DE PROGRESSO DA VALIDAÇÃO
 
 DESCRIÇÃO:
     Monitor visual LIMPO e SIMPLES do progresso da validação com IA.
-    Atualiza a cada 5 segundos automaticamente.
+    Atualiza a cada 5 segundos automaticamente, lendo o journal de vereditos
+    (output/validacao_journal.jsonl) em vez da planilha.
 
 USO:
     python scripts/monitor_progresso.py
@@ -15,14 +16,20 @@ USO:
 ═══════════════════════════════════════════════════════════════════════════════
 """
 
+import sys
 import pandas as pd
 import time
 import os
 from pathlib import Path
 from datetime import datetime
 
+# Adicionar pasta utils ao path
+sys.path.insert(0, str(Path(__file__).parent.parent / 'utils'))
 
-ARQUIVO_PROGRESSO = 'output/validacao_progresso.xlsx'
+from journal_validacao import JournalValidacao
+
+
+ARQUIVO_JOURNAL = 'output/validacao_journal.jsonl'
 TOTAL_CASOS = 86
 INTERVALO_ATUALIZACAO = 5  # segundos
 
@@ -35,7 +42,8 @@ def limpar_tela():
 def mostrar_progresso():
     """Exibe progresso em tempo real"""
     
-    arquivo = Path(ARQUIVO_PROGRESSO)
+    journal = JournalValidacao(ARQUIVO_JOURNAL)
+    arquivo = journal.caminho
     
     try:
         while True:
@@ -54,16 +62,24 @@ def mostrar_progresso():
             
             # Lê progresso
             try:
-                df = pd.read_excel(arquivo)
+                df = pd.DataFrame(list(journal.carregar().values()),
+                                  columns=['id_caso', 'nome', 'validado', 'mesma_pessoa',
+                                           'confianca', 'erro', 'registrado_em'])
+                df = df.rename(columns={
+                    'validado': 'ia_validado',
+                    'mesma_pessoa': 'ia_mesma_pessoa',
+                    'confianca': 'ia_confianca',
+                    'erro': 'ia_erro',
+                }).sort_values('registrado_em', kind='stable')
             except Exception as e:
                 print(f"⚠ Erro ao ler arquivo: {e}")
                 time.sleep(INTERVALO_ATUALIZACAO)
                 continue
             
             # Calcula estatísticas
-            validados = int(df['ia_validado'].sum())
-            confirmados = int((df['ia_mesma_pessoa'] == True).sum())
-            rejeitados = int((df['ia_mesma_pessoa'] == False).sum())
+            validados = int((df['ia_validado'] == True).sum())
+            confirmados = int(((df['ia_validado'] == True) & (df['ia_mesma_pessoa'] == True)).sum())
+            rejeitados = int(((df['ia_validado'] == True) & (df['ia_mesma_pessoa'] == False)).sum())
             erros = int(df['ia_erro'].notna().sum())
             
             # Progresso percentual
@@ -102,7 +118,9 @@ def mostrar_progresso():
                 if len(ultimos_validados) > 0:
                     ultimo = ultimos_validados.iloc[-1]
                     status = "✓" if ultimo['ia_mesma_pessoa'] else "✗"
-                    nome_curto = str(ultimo['nome'])[:40]
+                    # Journals antigos não têm o nome: mostra o par de BOs
+                    nome = ultimo['nome'] if pd.notna(ultimo['nome']) else ultimo['id_caso']
+                    nome_curto = str(nome)[:40]
                     print(f"\nÚltimo: {status} {nome_curto}")
             
             # Rodapé
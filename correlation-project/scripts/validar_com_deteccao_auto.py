@@ -5,7 +5,7 @@ Detecta se está no PC CASA ou TRABALHO e ajusta automaticamente:
 - Modelo Ollama
 - Timeout
 - Tamanho de histórico
-- Batch size (casos simultâneos)
+- Batch size (casos validados simultaneamente pelo pool de threads)
 """
 
 import sys
@@ -21,6 +21,10 @@ except ImportError:
     print("⚠️  Detector de hardware não disponível, usando config padrão")
     DETECTOR_DISPONIVEL = False
 
+from pool_validacao import validar_em_paralelo
+from journal_validacao import JournalValidacao, id_caso, aplicar_vereditos, exportar_progresso
+from cache_llm import CacheLLM
+
 import pandas as pd
 import ollama
 import json
@@ -67,22 +71,17 @@ def carregar_ou_criar_config():
     }
 
 
-def validar_caso_com_ia(caso, config):
+def montar_prompt(caso, config):
     """
-    Valida se dois BOs (desaparecimento e morte) referem-se à mesma pessoa.
+    Monta o prompt de validação conforme as opções da config.
     
     Args:
         caso: Série pandas com dados da correlação
-        config: Dict com configurações (modelo, temperatura, etc)
+        config: Dict com configurações (tamanho_historico, prompt_detalhes)
         
     Returns:
-        Dict com: validado, mesma_pessoa, confianca, justificativa, erro
+        str: Prompt renderizado
     """
-    
-    # Extrair configurações
-    modelo = config.get('modelo', 'qwen2.5-ptbr:7b')
-    temperatura = config.get('temperatura', 0.1)
-    timeout = config.get('timeout_segundos', 60)
     tam_hist = config.get('tamanho_historico', 800)
     prompt_det = config.get('prompt_detalhes', {})
     
@@ -150,34 +149,84 @@ Responda APENAS com o JSON abaixo (sem texto adicional):
     "justificativa": "Breve explicação"
 }}"""
     
+    return prompt_base
+
+
+def interpretar_resposta(resposta_texto):
+    """
+    Extrai o veredito do texto devolvido pelo modelo.
+    
+    Raises:
+        json.JSONDecodeError: Se a resposta não for JSON válido
+    """
+    # Limpar resposta
+    if '```json' in resposta_texto:
+        resposta_texto = resposta_texto.split('```json')[1].split('```')[0].strip()
+    elif '```' in resposta_texto:
+        resposta_texto = resposta_texto.split('```')[1].split('```')[0].strip()
+    
+    resultado = json.loads(resposta_texto)
+    
+    return {
+        'validado': True,
+        'mesma_pessoa': resultado.get('mesma_pessoa', False),
+        'confianca': int(resultado.get('confianca', 0)),
+        'justificativa': resultado.get('justificativa', ''),
+        'erro': None
+    }
+
+
+def validar_caso_com_ia(caso, config, cliente=None, cache=None):
+    """
+    Valida se dois BOs (desaparecimento e morte) referem-se à mesma pessoa.
+    
+    Args:
+        caso: Série pandas com dados da correlação
+        config: Dict com configurações (modelo, temperatura, etc)
+        cliente: ollama.Client a usar (default: cliente com o timeout da config)
+        cache: CacheLLM opcional; prompts já respondidos não voltam ao modelo
+        
+    Returns:
+        Dict com: validado, mesma_pessoa, confianca, justificativa, erro
+    """
+    
+    # Extrair configurações
+    modelo = config.get('modelo', 'qwen2.5-ptbr:7b')
+    temperatura = config.get('temperatura', 0.1)
+    timeout = config.get('timeout_segundos', 60)
+    
+    if cliente is None:
+        cliente = ollama.Client(timeout=timeout)
+    
+    prompt = montar_prompt(caso, config)
+    opcoes = {
+        'temperature': temperatura,
+        'num_predict': 300
+    }
+    
+    chave = None
+    if cache is not None:
+        chave = cache.chave(modelo, opcoes, prompt)
+        resultado = cache.obter(chave)
+        if resultado is not None:
+            return resultado
+    
+    resposta_texto = ''
     try:
-        response = ollama.chat(
+        response = cliente.chat(
             model=modelo,
-            messages=[{'role': 'user', 'content': prompt_base}],
-            options={
-                'temperature': temperatura,
-                'num_predict': 300
-            },
-            timeout=timeout
+            messages=[{'role': 'user', 'content': prompt}],
+            options=opcoes
         )
         
         resposta_texto = response['message']['content'].strip()
+        resultado = interpretar_resposta(resposta_texto)
         
-        # Limpar resposta
-        if '```json' in resposta_texto:
-            resposta_texto = resposta_texto.split('```json')[1].split('```')[0].strip()
-        elif '```' in resposta_texto:
-            resposta_texto = resposta_texto.split('```')[1].split('```')[0].strip()
-        
-        resultado = json.loads(resposta_texto)
+        # Só vereditos válidos entram no cache (erros são tentados de novo)
+        if cache is not None:
+            cache.guardar(chave, resultado, modelo)
         
-        return {
-            'validado': True,
-            'mesma_pessoa': resultado.get('mesma_pessoa', False),
-            'confianca': int(resultado.get('confianca', 0)),
-            'justificativa': resultado.get('justificativa', ''),
-            'erro': None
-        }
+        return resultado
         
     except json.JSONDecodeError:
         return {
@@ -218,6 +267,7 @@ def main():
     # Carregar dados
     input_file = Path('output/correlacoes_unicas_deduplicadas.xlsx')
     output_file = Path('output/validacao_progresso.xlsx')
+    journal = JournalValidacao('output/validacao_journal.jsonl')
     
     if not input_file.exists():
         print(f"[ERRO] Arquivo nao encontrado: {input_file}")
@@ -226,38 +276,45 @@ def main():
     df = pd.read_excel(input_file, sheet_name='FORTES - Únicas')
     print(f"[OK] {len(df)} casos carregados\n")
     
-    # Carregar progresso existente
-    if output_file.exists():
-        df_prog = pd.read_excel(output_file)
-        ja_validados = df_prog[df_prog['ia_validado'] == True].index.tolist()
-        print(f"[INFO] Progresso anterior: {len(ja_validados)} casos ja validados")
-    else:
-        # Criar DataFrame de progresso
-        df['ia_validado'] = False
-        df['ia_mesma_pessoa'] = None
-        df['ia_confianca'] = 0
-        df['ia_justificativa'] = ''
-        df['ia_erro'] = ''
-        ja_validados = []
+    # Carregar progresso existente (apenas o journal; planilha antiga é migrada uma vez)
+    if not journal.caminho.exists() and output_file.exists():
+        importados = journal.importar_progresso_xlsx(output_file)
+        print(f"[INFO] {importados} casos migrados de {output_file} para {journal.caminho}")
+    
+    df = aplicar_vereditos(df, journal.carregar())
+    ja_validados = int(df['ia_validado'].sum())
+    if ja_validados:
+        print(f"[INFO] Progresso anterior: {ja_validados} casos ja validados")
     
     # Processar casos não validados
-    pendentes = [i for i in range(len(df)) if i not in ja_validados]
+    pendentes = [i for i in range(len(df)) if not df.at[i, 'ia_validado']]
     
     if not pendentes:
         print("\n[OK] Todos os casos ja foram validados!")
         return
     
-    print(f"[EXEC] Processando {len(pendentes)} casos pendentes...\n")
+    concorrencia = max(1, int(config.get('batch_size', 1)))
+    print(f"[EXEC] Processando {len(pendentes)} casos pendentes ({concorrencia} simultaneos)...\n")
     
     confirmados = rejeitados = erros = 0
     conf_total = 0
+    cliente = ollama.Client(timeout=config.get('timeout_segundos', 60))
+    cache = CacheLLM('output/cache/llm_validacao.sqlite')
     
-    for idx in pendentes:
-        caso = df.iloc[idx]
+    # Linhas copiadas antes de iniciar: as threads não leem o df enquanto ele é atualizado
+    tarefas = [(idx, df.iloc[idx]) for idx in pendentes]
+    
+    def validar(tarefa):
+        return validar_caso_com_ia(tarefa[1], config, cliente, cache)
+    
+    def registrar(posicao, tarefa, resultado):
+        nonlocal confirmados, rejeitados, erros, conf_total
+        idx, caso = tarefa
         
-        print(f"[{idx+1}/{len(df)}] {caso['nome'][:30]}... ", end='', flush=True)
+        # Veredito gravado no journal (append + fsync) antes de qualquer outra coisa
+        journal.registrar(id_caso(caso), resultado, nome=caso.get('nome'))
         
-        resultado = validar_caso_com_ia(caso, config)
+        print(f"[{idx+1}/{len(df)}] {caso['nome'][:30]}... ", end='')
         
         if resultado['validado']:
             df.at[idx, 'ia_validado'] = True
@@ -277,9 +334,13 @@ def main():
             df.at[idx, 'ia_validado'] = False
             df.at[idx, 'ia_erro'] = resultado['erro']
             print(f"[!] ERRO: {resultado['erro'][:50]}")
-        
-        # Salvar progresso
-        df.to_excel(output_file, index=False)
+    
+    try:
+        validar_em_paralelo(tarefas, validar, concorrencia, ao_concluir=registrar)
+    finally:
+        # Planilha de progresso gerada uma única vez a partir do estado final
+        journal.fechar()
+        exportar_progresso(df, output_file)
     
     # Estatísticas finais
     print("\n" + "="*80)
@@ -292,7 +353,12 @@ def main():
     if confirmados > 0:
         print(f"[STAT] Confianca media (confirmadas): {conf_total/confirmados:.1f}%")
     
-    print(f"\n[SAVE] Progresso salvo em: {output_file}")
+    stats_cache = cache.estatisticas()
+    cache.fechar()
+    print(f"[CACHE] {stats_cache['acertos']} acertos / {stats_cache['falhas']} falhas "
+          f"({stats_cache['taxa_acerto']*100:.0f}%, {stats_cache['entradas']} entradas)")
+    
+    print(f"\n[SAVE] Progresso salvo em: {output_file} (journal: {journal.caminho})")
     print("="*80 + "\n")
 
 
@@ -8,9 +8,11 @@ DESCRIÇÃO:
     (Ollama qwen2.5-ptbr:7b otimizado para português brasileiro)
 
 CARACTERÍSTICAS:
-    ✅ Auto-save após cada caso (não perde progresso)
-    ✅ Retomada automática se interrompido
+    ✅ Journal append-only: cada veredito gravado ao concluir (não perde progresso)
+    ✅ Retomada automática se interrompido (lê apenas o journal)
     ✅ Timeout de 60 segundos por caso
+    ✅ Cache de respostas do LLM (prompts repetidos não voltam à GPU)
+    ✅ Validações simultâneas (pool de threads, ver CONCORRENCIA)
     ✅ Tratamento robusto de erros
     ✅ Encoding UTF-8 correto
 
@@ -19,7 +21,8 @@ ENTRADA:
     Aba: "FORTES - Únicas" (86 casos)
 
 SAÍDA:
-    output/validacao_progresso.xlsx (atualizado após cada caso)
+    output/validacao_journal.jsonl (uma linha por veredito, append-only)
+    output/validacao_progresso.xlsx (gerado do journal ao encerrar)
     output/RELATORIO_VALIDACAO_FINAL.xlsx (gerado ao concluir)
 
 TEMPO ESTIMADO:
@@ -27,6 +30,7 @@ TEMPO ESTIMADO:
 
 USO:
     python scripts/validar_com_ia.py
+    python scripts/validar_com_ia.py --exportar   (só regenera o XLSX de progresso)
 
 ═══════════════════════════════════════════════════════════════════════════════
 """
@@ -39,6 +43,13 @@ from pathlib import Path
 from datetime import datetime
 import time
 
+# Adicionar pasta utils ao path
+sys.path.insert(0, str(Path(__file__).parent.parent / 'utils'))
+
+from pool_validacao import validar_em_paralelo, concorrencia_padrao
+from journal_validacao import JournalValidacao, id_caso, aplicar_vereditos, exportar_progresso
+from cache_llm import CacheLLM
+
 
 # ═══════════════════════════════════════════════════════════════════════════
 # CONFIGURAÇÕES
@@ -47,9 +58,12 @@ import time
 MODELO = 'qwen2.5-ptbr:7b'  # Modelo português otimizado
 TEMPERATURA = 0.1           # Baixa temperatura = mais determinístico
 TIMEOUT = 60                # Timeout em segundos por validação
+CONCORRENCIA = None         # Casos simultâneos (None = batch_size do perfil de hardware)
 ARQUIVO_ENTRADA = 'output/correlacoes_unicas_deduplicadas.xlsx'
 ABA_ENTRADA = 'FORTES - Únicas'
 ARQUIVO_PROGRESSO = 'output/validacao_progresso.xlsx'
+ARQUIVO_JOURNAL = 'output/validacao_journal.jsonl'
+ARQUIVO_CACHE_LLM = 'output/cache/llm_validacao.sqlite'
 ARQUIVO_RELATORIO = 'output/RELATORIO_VALIDACAO_FINAL.xlsx'
 
 
@@ -94,27 +108,23 @@ def verificar_modelo():
         return False
 
 
-def validar_caso_com_ia(caso, num_caso, total_casos):
+def montar_prompt(caso):
     """
-    Valida um caso usando IA local.
+    Monta o prompt de validação de um caso.
     
     Args:
         caso: Série pandas com dados da correlação
-        num_caso: Número do caso atual
-        total_casos: Total de casos a validar
         
     Returns:
-        dict: {validado, mesma_pessoa, confianca, justificativa, erro}
+        str: Prompt renderizado
     """
+    # Prepara dados com fallback para valores ausentes
+    transtorno = 'Sim' if caso.get('tem_transtorno_psiquiatrico') else 'Não'
+    tipo_transtorno = caso.get('tipo_transtorno', 'Não informado')
+    rg = f"{caso['numero_rg']}" if pd.notna(caso.get('numero_rg')) else 'Não informado'
     
-    try:
-        # Prepara dados com fallback para valores ausentes
-        transtorno = 'Sim' if caso.get('tem_transtorno_psiquiatrico') else 'Não'
-        tipo_transtorno = caso.get('tipo_transtorno', 'Não informado')
-        rg = f"{caso['numero_rg']}" if pd.notna(caso.get('numero_rg')) else 'Não informado'
-        
-        # Monta prompt otimizado em português
-        prompt = f"""TAREFA: Analisar se os dois BOs são DA MESMA PESSOA.
+    # Monta prompt otimizado em português
+    return f"""TAREFA: Analisar se os dois BOs são DA MESMA PESSOA.
 
 ═══════════════════════════════════════════════════════════════════
 DESAPARECIMENTO
@@ -155,57 +165,112 @@ Responda APENAS com JSON (sem texto adicional):
     "justificativa": "Nome, mãe e data de nascimento idênticos..."
 }}"""
 
-        # Chama IA com timeout
-        print(f"\n[{num_caso}/{total_casos}] {caso['nome'][:50]}")
-        print(f"   BO: {caso['bo_desaparecimento']} → {caso['bo_morte']}")
-        print(f"   Intervalo: {caso['dias_entre_eventos']} dias")
-        print(f"   Validando com IA...", end=" ", flush=True)
+
+def interpretar_resposta(texto):
+    """
+    Extrai o veredito do texto devolvido pelo modelo.
+    
+    Args:
+        texto: Conteúdo da resposta
+        
+    Returns:
+        dict: {validado, mesma_pessoa, confianca, justificativa, erro}
+        
+    Raises:
+        json.JSONDecodeError: Se o trecho entre chaves não for JSON válido
+    """
+    if '{' not in texto or '}' not in texto:
+        return {
+            'validado': False,
+            'mesma_pessoa': False,
+            'confianca': 0,
+            'justificativa': '',
+            'erro': 'Resposta não contém JSON válido'
+        }
+    
+    inicio_json = texto.index('{')
+    fim_json = texto.rindex('}') + 1
+    resultado = json.loads(texto[inicio_json:fim_json])
+    
+    # Normaliza campo confiança (com ou sem acento)
+    confianca = resultado.get('confianca', resultado.get('confiança', 0))
+    
+    return {
+        'validado': True,
+        'mesma_pessoa': resultado.get('mesma_pessoa', False),
+        'confianca': confianca,
+        'justificativa': resultado.get('justificativa', ''),
+        'erro': None
+    }
+
+
+def validar_caso_com_ia(caso, num_caso, total_casos, cliente=None, cache=None):
+    """
+    Valida um caso usando IA local.
+    
+    Args:
+        caso: Série pandas com dados da correlação
+        num_caso: Número do caso atual
+        total_casos: Total de casos a validar
+        cliente: ollama.Client a usar (default: cliente com timeout TIMEOUT)
+        cache: CacheLLM opcional; prompts já respondidos não voltam ao modelo
         
+    Returns:
+        dict: {validado, mesma_pessoa, confianca, justificativa, erro}
+    """
+    if cliente is None:
+        cliente = ollama.Client(timeout=TIMEOUT)
+    
+    # Com validações simultâneas, cada caso imprime seu bloco de uma vez só
+    cabecalho = (
+        f"\n[{num_caso}/{total_casos}] {caso['nome'][:50]}\n"
+        f"   BO: {caso['bo_desaparecimento']} → {caso['bo_morte']}\n"
+        f"   Intervalo: {caso['dias_entre_eventos']} dias\n"
+        f"   Validação com IA:"
+    )
+    
+    try:
+        prompt = montar_prompt(caso)
+        opcoes = {'temperature': TEMPERATURA}
+        
+        chave = None
+        if cache is not None:
+            chave = cache.chave(MODELO, opcoes, prompt)
+            resultado = cache.obter(chave)
+            if resultado is not None:
+                status = "✓ CONFIRMADA" if resultado['mesma_pessoa'] else "✗ REJEITADA"
+                print(f"{cabecalho} {status} ({resultado['confianca']}%) [cache]")
+                return resultado
+        
+        # Chama IA (timeout configurado no cliente)
         inicio = time.time()
         
-        resposta = ollama.chat(
+        resposta = cliente.chat(
             model=MODELO,
             messages=[{'role': 'user', 'content': prompt}],
-            options={'temperature': TEMPERATURA}
+            options=opcoes
         )
         
         tempo_decorrido = time.time() - inicio
         
         # Extrai resposta
-        texto = resposta['message']['content'].strip()
+        resultado = interpretar_resposta(resposta['message']['content'].strip())
         
-        # Parse JSON
-        if '{' in texto and '}' in texto:
-            inicio_json = texto.index('{')
-            fim_json = texto.rindex('}') + 1
-            json_str = texto[inicio_json:fim_json]
-            resultado = json.loads(json_str)
-            
-            # Normaliza campo confiança (com ou sem acento)
-            confianca = resultado.get('confianca', resultado.get('confiança', 0))
-            
-            status = "✓ CONFIRMADA" if resultado.get('mesma_pessoa') else "✗ REJEITADA"
-            print(f"{status} ({confianca}%) [{tempo_decorrido:.1f}s]")
-            
-            return {
-                'validado': True,
-                'mesma_pessoa': resultado.get('mesma_pessoa', False),
-                'confianca': confianca,
-                'justificativa': resultado.get('justificativa', ''),
-                'erro': None
-            }
-        else:
-            print(f"❌ JSON inválido [{tempo_decorrido:.1f}s]")
-            return {
-                'validado': False,
-                'mesma_pessoa': False,
-                'confianca': 0,
-                'justificativa': '',
-                'erro': 'Resposta não contém JSON válido'
-            }
+        if not resultado['validado']:
+            print(f"{cabecalho} ❌ JSON inválido [{tempo_decorrido:.1f}s]")
+            return resultado
+        
+        # Só vereditos válidos entram no cache (erros são tentados de novo)
+        if cache is not None:
+            cache.guardar(chave, resultado, MODELO)
+        
+        status = "✓ CONFIRMADA" if resultado['mesma_pessoa'] else "✗ REJEITADA"
+        print(f"{cabecalho} {status} ({resultado['confianca']}%) [{tempo_decorrido:.1f}s]")
+        
+        return resultado
             
     except json.JSONDecodeError as e:
-        print(f"❌ Erro JSON: {str(e)[:50]}")
+        print(f"{cabecalho} ❌ Erro JSON: {str(e)[:50]}")
         return {
             'validado': False,
             'mesma_pessoa': False,
@@ -215,7 +280,7 @@ Responda APENAS com JSON (sem texto adicional):
         }
         
     except Exception as e:
-        print(f"❌ Erro: {str(e)[:50]}")
+        print(f"{cabecalho} ❌ Erro: {str(e)[:50]}")
         return {
             'validado': False,
             'mesma_pessoa': False,
@@ -225,21 +290,36 @@ Responda APENAS com JSON (sem texto adicional):
         }
 
 
+def carregar_vereditos(journal):
+    """
+    Lê o journal; na primeira execução migra o progresso de uma planilha antiga.
+    
+    Args:
+        journal: JournalValidacao
+        
+    Returns:
+        dict: id_caso -> veredito
+    """
+    if not journal.caminho.exists() and Path(ARQUIVO_PROGRESSO).exists():
+        try:
+            importados = journal.importar_progresso_xlsx(ARQUIVO_PROGRESSO)
+            print(f"(migrados {importados} casos de {ARQUIVO_PROGRESSO})", end=" ")
+        except Exception as e:
+            print(f"\n⚠ Erro ao migrar progresso antigo: {e}")
+    
+    return journal.carregar()
+
+
 def salvar_progresso(df, arquivo):
     """
-    Salva progresso com encoding UTF-8 correto.
+    Gera a planilha de progresso a partir do estado atual (uma vez por execução).
     
     Args:
         df: DataFrame com progresso
         arquivo: Caminho do arquivo
     """
     try:
-        # Garante diretório existe
-        Path(arquivo).parent.mkdir(parents=True, exist_ok=True)
-        
-        # Salva com UTF-8
-        df.to_excel(arquivo, index=False, engine='openpyxl')
-        
+        exportar_progresso(df, arquivo)
     except Exception as e:
         print(f"\n⚠ Erro ao salvar progresso: {e}")
 
@@ -294,6 +374,13 @@ def gerar_relatorio_final(df):
 def main():
     """Função principal"""
     
+    if '--exportar' in sys.argv[1:]:
+        df = pd.read_excel(ARQUIVO_ENTRADA, sheet_name=ABA_ENTRADA)
+        df = aplicar_vereditos(df, JournalValidacao(ARQUIVO_JOURNAL).carregar())
+        salvar_progresso(df, ARQUIVO_PROGRESSO)
+        print(f"✓ Progresso exportado: {ARQUIVO_PROGRESSO} ({df['ia_validado'].sum()} validados)")
+        return
+    
     print("=" * 70)
     print("VALIDAÇÃO DE CORRELAÇÕES COM IA")
     print(f"Modelo: {MODELO} | Temperatura: {TEMPERATURA}")
@@ -314,48 +401,39 @@ def main():
         print(f"\n❌ Erro ao carregar: {e}")
         sys.exit(1)
     
-    # 3. Verifica progresso existente
+    # 3. Verifica progresso existente (apenas o journal é lido)
     print(f"\n[3/4] Verificando progresso anterior...", end=" ")
-    arquivo_prog = Path(ARQUIVO_PROGRESSO)
-    
-    if arquivo_prog.exists():
-        try:
-            df_prog = pd.read_excel(arquivo_prog)
-            df = df_prog  # Usa progresso salvo
-            ja_validados = df['ia_validado'].sum()
-            print(f"✓ ({ja_validados} já validados)")
-        except Exception as e:
-            print(f"\n⚠ Erro ao ler progresso: {e}")
-            # Cria colunas novas
-            df['ia_validado'] = False
-            df['ia_mesma_pessoa'] = None
-            df['ia_confianca'] = 0
-            df['ia_justificativa'] = ''
-            df['ia_erro'] = None
+    journal = JournalValidacao(ARQUIVO_JOURNAL)
+    df = aplicar_vereditos(df, carregar_vereditos(journal))
+    ja_validados = df['ia_validado'].sum()
+    if ja_validados:
+        print(f"✓ ({ja_validados} já validados)")
     else:
         print("✓ (iniciando do zero)")
-        df['ia_validado'] = False
-        df['ia_mesma_pessoa'] = None
-        df['ia_confianca'] = 0
-        df['ia_justificativa'] = ''
-        df['ia_erro'] = None
     
     # 4. Processa casos pendentes
-    print(f"\n[4/4] Iniciando validações...")
+    concorrencia = CONCORRENCIA or concorrencia_padrao()
+    print(f"\n[4/4] Iniciando validações ({concorrencia} simultânea(s))...")
     print("=" * 70)
     
     total = len(df)
     inicio_geral = time.time()
+    cliente = ollama.Client(timeout=TIMEOUT)
+    cache = CacheLLM(ARQUIVO_CACHE_LLM)
     
-    for idx, caso in df.iterrows():
-        # Pula se já validado
-        if caso['ia_validado']:
-            continue
-        
-        num_caso = idx + 1
+    # Pula os já validados
+    # (as linhas são copiadas aqui: as threads não leem o df enquanto ele é atualizado)
+    pendentes = [(idx, caso) for idx, caso in df.iterrows() if not caso['ia_validado']]
+    
+    def validar(tarefa):
+        idx, caso = tarefa
+        return validar_caso_com_ia(caso, idx + 1, total, cliente, cache)
+    
+    def registrar(posicao, tarefa, resultado):
+        idx, caso = tarefa
         
-        # Valida com IA
-        resultado = validar_caso_com_ia(caso, num_caso, total)
+        # Grava o veredito no journal APÓS CADA CASO
+        journal.registrar(id_caso(caso), resultado, nome=caso.get('nome'))
         
         # Atualiza DataFrame
         df.at[idx, 'ia_validado'] = resultado['validado']
@@ -363,12 +441,13 @@ def main():
         df.at[idx, 'ia_confianca'] = resultado['confianca']
         df.at[idx, 'ia_justificativa'] = resultado['justificativa']
         df.at[idx, 'ia_erro'] = resultado['erro']
-        
-        # Salva progresso APÓS CADA CASO
+    
+    try:
+        validar_em_paralelo(pendentes, validar, concorrencia, ao_concluir=registrar)
+    finally:
+        # Planilha de progresso gerada uma única vez, mesmo se interrompido
+        journal.fechar()
         salvar_progresso(df, ARQUIVO_PROGRESSO)
-        
-        # Pequena pausa para não sobrecarregar
-        time.sleep(0.5)
     
     # 5. Finalização
     tempo_total = (time.time() - inicio_geral) / 60
@@ -381,13 +460,18 @@ def main():
     print(f"✓ Total processado: {validados}/{total}")
     print(f"✓ Confirmados: {confirmados} ({confirmados/validados*100:.1f}%)")
     print(f"✓ Tempo total: {tempo_total:.1f} minutos")
+    stats_cache = cache.estatisticas()
+    print(f"✓ Cache LLM: {stats_cache['acertos']} acertos / {stats_cache['falhas']} falhas "
+          f"({stats_cache['entradas']} entradas)")
+    cache.fechar()
     print("=" * 70)
     
     # Gera relatório final
     gerar_relatorio_final(df)
     
     print(f"\n📊 Ver resultados: {ARQUIVO_RELATORIO}")
-    print(f"📈 Ver progresso: {ARQUIVO_PROGRESSO}\n")
+    print(f"📈 Ver progresso: {ARQUIVO_PROGRESSO}")
+    print(f"🗒 Journal: {ARQUIVO_JOURNAL}\n")
 
 
 if __name__ == "__main__":
@@ -0,0 +1,124 @@
+"""
+Busca simultânea de várias palavras-chave (autômato de Aho-Corasick).
+
+O autômato é construído uma vez a partir dos padrões e percorre cada texto
+uma única vez, reportando todas as ocorrências de todos os padrões (inclusive
+sobrepostas). Se o pacote pyahocorasick estiver instalado, a varredura usa a
+implementação em C; caso contrário, a implementação em Python abaixo.
+"""
+
+from collections import deque
+from typing import Any, Dict, Iterator, List, Tuple
+
+try:
+    import ahocorasick
+    AHOCORASICK_DISPONIVEL = True
+except ImportError:
+    AHOCORASICK_DISPONIVEL = False
+
+
+class AutomatoPalavras:
+    """
+    Autômato de Aho-Corasick sobre strings.
+
+    Uso:
+        automato = AutomatoPalavras()
+        automato.adicionar('surto', 'surto')
+        automato.adicionar('surto psicotico', 'surto psicótico')
+        automato.construir()
+        for inicio, fim, valor in automato.buscar(texto):
+            ...
+    """
+
+    def __init__(self, usar_extensao: bool = True):
+        """
+        Args:
+            usar_extensao: Usar pyahocorasick quando disponível
+        """
+        self._padroes: Dict[str, List[Any]] = {}
+        self._usar_extensao = usar_extensao and AHOCORASICK_DISPONIVEL
+        self._construido = False
+
+    def adicionar(self, padrao: str, valor: Any) -> None:
+        """Registra um padrão; o mesmo padrão pode ter vários valores"""
+        if not padrao:
+            raise ValueError("Padrão vazio")
+        self._padroes.setdefault(padrao, []).append(valor)
+        self._construido = False
+
+    def construir(self) -> None:
+        """Monta as transições e os links de falha"""
+        if self._usar_extensao:
+            self._automato = ahocorasick.Automaton()
+            for padrao, valores in self._padroes.items():
+                self._automato.add_word(padrao, (len(padrao), tuple(valores)))
+            self._automato.make_automaton()
+        else:
+            self._construir_python()
+        self._construido = True
+
+    def _construir_python(self) -> None:
+        transicoes: List[Dict[str, int]] = [{}]
+        saidas: List[List[Tuple[int, Any]]] = [[]]
+
+        for padrao, valores in self._padroes.items():
+            estado = 0
+            for caractere in padrao:
+                proximo = transicoes[estado].get(caractere)
+                if proximo is None:
+                    proximo = len(transicoes)
+                    transicoes[estado][caractere] = proximo
+                    transicoes.append({})
+                    saidas.append([])
+                estado = proximo
+            saidas[estado].extend((len(padrao), valor) for valor in valores)
+
+        # Links de falha em largura; as saídas do estado de falha são herdadas
+        falhas = [0] * len(transicoes)
+        fila = deque(transicoes[0].values())
+        while fila:
+            estado = fila.popleft()
+            for caractere, proximo in transicoes[estado].items():
+                fila.append(proximo)
+                falha = falhas[estado]
+                while falha and caractere not in transicoes[falha]:
+                    falha = falhas[falha]
+                destino = transicoes[falha].get(caractere, 0)
+                falhas[proximo] = destino if destino != proximo else 0
+                saidas[proximo] = saidas[proximo] + saidas[falhas[proximo]]
+
+        self._transicoes = transicoes
+        self._falhas = falhas
+        self._saidas = saidas
+
+    def buscar(self, texto: str) -> Iterator[Tuple[int, int, Any]]:
+        """
+        Percorre o texto uma vez.
+
+        Yields:
+            (inicio, fim, valor) de cada ocorrência, em ordem de fim; `fim` é exclusivo
+        """
+        if not self._construido:
+            self.construir()
+
+        if self._usar_extensao:
+            for ultimo, (comprimento, valores) in self._automato.iter(texto):
+                for valor in valores:
+                    yield ultimo + 1 - comprimento, ultimo + 1, valor
+            return
+
+        transicoes = self._transicoes
+        falhas = self._falhas
+        saidas = self._saidas
+
+        estado = 0
+        for posicao, caractere in enumerate(texto):
+            proximo = transicoes[estado].get(caractere)
+            while proximo is None and estado:
+                estado = falhas[estado]
+                proximo = transicoes[estado].get(caractere)
+            estado = proximo if proximo is not None else 0
+
+            if saidas[estado]:
+                for comprimento, valor in saidas[estado]:
+                    yield posicao + 1 - comprimento, posicao + 1, valor
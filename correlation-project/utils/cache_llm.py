@@ -0,0 +1,154 @@
+"""
+Cache persistente de respostas do modelo de linguagem.
+
+As entradas são endereçadas pelo conteúdo: a chave é o SHA-256 de
+(modelo, opções de geração, prompt renderizado), e o valor é o veredito já
+interpretado. Repetir uma validação com o mesmo prompt (retomada após queda,
+ajuste em outra parte da config) não volta à GPU. O arquivo SQLite é
+compartilhado por todos os validadores; o tamanho é limitado por número de
+entradas, descartando as acessadas há mais tempo.
+"""
+
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Optional
+
+
+class CacheLLM:
+    """
+    Cache SQLite de vereditos do LLM, seguro para uso por várias threads.
+
+    Uso:
+        cache = CacheLLM('output/cache/llm_validacao.sqlite')
+        chave = cache.chave(modelo, opcoes, prompt)
+        veredito = cache.obter(chave)
+        if veredito is None:
+            veredito = ...  # chama o modelo
+            cache.guardar(chave, veredito)
+    """
+
+    def __init__(self, caminho: str, max_entradas: int = 50_000):
+        """
+        Args:
+            caminho: Arquivo SQLite (criado se não existir)
+            max_entradas: Limite de entradas; acima dele as menos recentes são removidas
+        """
+        self.caminho = Path(caminho)
+        self.max_entradas = max_entradas
+        self.acertos = 0
+        self.falhas = 0
+        self._trava = threading.Lock()
+
+        self.caminho.parent.mkdir(parents=True, exist_ok=True)
+        self._conexao = sqlite3.connect(str(self.caminho), check_same_thread=False)
+        self._conexao.execute('PRAGMA journal_mode=WAL')
+        self._conexao.execute(
+            'CREATE TABLE IF NOT EXISTS respostas ('
+            ' chave TEXT PRIMARY KEY,'
+            ' modelo TEXT,'
+            ' veredito TEXT NOT NULL,'
+            ' criado_em REAL NOT NULL,'
+            ' acessado_em REAL NOT NULL,'
+            ' acertos INTEGER NOT NULL DEFAULT 0)'
+        )
+        self._conexao.execute(
+            'CREATE INDEX IF NOT EXISTS idx_respostas_acesso ON respostas (acessado_em)'
+        )
+        self._conexao.commit()
+
+    @staticmethod
+    def chave(modelo: str, opcoes: Dict, prompt: str) -> str:
+        """
+        Chave de conteúdo de uma chamada ao modelo.
+
+        Args:
+            modelo: Nome do modelo no Ollama
+            opcoes: Opções de geração (temperature, num_predict, ...)
+            prompt: Prompt já renderizado
+
+        Returns:
+            SHA-256 hexadecimal
+        """
+        conteudo = json.dumps(
+            {'modelo': modelo, 'opcoes': opcoes, 'prompt': prompt},
+            sort_keys=True, ensure_ascii=False
+        )
+        return hashlib.sha256(conteudo.encode('utf-8')).hexdigest()
+
+    def obter(self, chave: str) -> Optional[Dict]:
+        """Veredito guardado para a chave, ou None (contabiliza acerto/falha)"""
+        with self._trava:
+            linha = self._conexao.execute(
+                'SELECT veredito FROM respostas WHERE chave = ?', (chave,)
+            ).fetchone()
+
+            if linha is None:
+                self.falhas += 1
+                return None
+
+            self.acertos += 1
+            self._conexao.execute(
+                'UPDATE respostas SET acessado_em = ?, acertos = acertos + 1 WHERE chave = ?',
+                (time.time(), chave)
+            )
+            self._conexao.commit()
+
+        return json.loads(linha[0])
+
+    def guardar(self, chave: str, veredito: Dict, modelo: Optional[str] = None) -> None:
+        """
+        Guarda o veredito e aplica o limite de tamanho.
+
+        Args:
+            chave: Resultado de chave()
+            veredito: Dict serializável em JSON
+            modelo: Nome do modelo (apenas informativo)
+        """
+        agora = time.time()
+        with self._trava:
+            self._conexao.execute(
+                'INSERT OR REPLACE INTO respostas (chave, modelo, veredito, criado_em, acessado_em)'
+                ' VALUES (?, ?, ?, ?, ?)',
+                (chave, modelo, json.dumps(veredito, ensure_ascii=False), agora, agora)
+            )
+            self._remover_excedentes()
+            self._conexao.commit()
+
+    def _remover_excedentes(self) -> None:
+        """Remove as entradas acessadas há mais tempo além de max_entradas"""
+        total = self._conexao.execute('SELECT COUNT(*) FROM respostas').fetchone()[0]
+        excedente = total - self.max_entradas
+        if excedente > 0:
+            self._conexao.execute(
+                'DELETE FROM respostas WHERE chave IN ('
+                ' SELECT chave FROM respostas ORDER BY acessado_em LIMIT ?)',
+                (excedente,)
+            )
+
+    def estatisticas(self) -> Dict:
+        """Acertos e falhas desta execução e tamanho atual do cache"""
+        with self._trava:
+            total = self._conexao.execute('SELECT COUNT(*) FROM respostas').fetchone()[0]
+
+        consultas = self.acertos + self.falhas
+        return {
+            'acertos': self.acertos,
+            'falhas': self.falhas,
+            'taxa_acerto': self.acertos / consultas if consultas else 0.0,
+            'entradas': total,
+            'max_entradas': self.max_entradas,
+        }
+
+    def fechar(self) -> None:
+        with self._trava:
+            self._conexao.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.fechar()
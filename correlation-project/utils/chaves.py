@@ -9,9 +9,24 @@ Este módulo fornece funções para:
 - Filtrar dataset para grupo-alvo de análise
 """
 
+import numpy as np
 import pandas as pd
 import re
-from typing import Optional
+from typing import Callable, Optional
+
+from config.config import REGRAS_NATUREZA_ALVO, REGRAS_PAPEL_PESSOA
+from utils.classificacao import classificador_natureza, classificador_papel, classificar_valor
+
+# Versão das regras de chaves/classificação: incrementar ao mudá-las (invalida o cache de estágios)
+VERSAO_CHAVES = 1
+
+# Regex das chaves, compiladas uma vez (usadas linha a linha e em lote)
+RE_NAO_ALFANUMERICO = re.compile(r'[^A-Za-z0-9]')
+RE_NOME_INVALIDO = re.compile(r'[^a-z0-9\s]')
+RE_ESPACOS = re.compile(r'\s+')
+
+# Colunas de data de nascimento, em ordem de preferência
+COLUNAS_DATA_NASCIMENTO = ['data_nascimento', 'data_nascimento_dt', 'dt_nascimento']
 
 
 def gerar_chave_ocorrencia(row: pd.Series) -> Optional[str]:
@@ -35,7 +50,7 @@ def gerar_chave_ocorrencia(row: pd.Series) -> Optional[str]:
             return None
             
         # Remove caracteres especiais da unidade
-        unidade = re.sub(r'[^A-Za-z0-9]', '', unidade)
+        unidade = RE_NAO_ALFANUMERICO.sub('', unidade)
         
         return f"{ano}_{unidade}_{numero}"
     except:
@@ -64,7 +79,7 @@ def gerar_chave_pessoa(row: pd.Series) -> Optional[str]:
         
         # Tenta diferentes nomes de coluna para data nascimento
         data_nasc = ''
-        for col in ['data_nascimento', 'data_nascimento_dt', 'dt_nascimento']:
+        for col in COLUNAS_DATA_NASCIMENTO:
             if col in row.index:
                 data_nasc = str(row.get(col, '')).strip()
                 if data_nasc and data_nasc != 'nan':
@@ -74,14 +89,114 @@ def gerar_chave_pessoa(row: pd.Series) -> Optional[str]:
             return None
         
         # Normaliza nome: remove acentos, caracteres especiais, espaços múltiplos
-        nome = re.sub(r'[^a-z0-9\s]', '', nome)
-        nome = re.sub(r'\s+', '_', nome)
+        nome = RE_NOME_INVALIDO.sub('', nome)
+        nome = RE_ESPACOS.sub('_', nome)
         
         return f"{nome}|{data_nasc}"
     except:
         return None
 
 
+def _por_valor_distinto(
+    serie: pd.Series,
+    transformar: Callable[[pd.Series], pd.Series] = lambda textos: textos
+) -> np.ndarray:
+    """
+    Texto de cada valor (como str(valor)), transformado uma vez por valor distinto.
+    
+    Equivale a aplicar str() e depois `transformar` linha a linha (mesmo
+    'nan', 'NaT' e '1985-03-15 00:00:00' que aparecem nas funções por
+    linha), mas o custo é proporcional ao número de valores distintos.
+    
+    Args:
+        serie: Coluna de qualquer tipo
+        transformar: Operação vetorizada sobre uma Series de textos (ex.: .str.strip())
+    
+    Returns:
+        Array object alinhado às linhas
+    """
+    codigos, distintos = pd.factorize(serie)
+    textos = pd.Series([str(valor) for valor in distintos] + [''], dtype=object)
+    resultado = transformar(textos).to_numpy(dtype=object)[codigos]
+    
+    # Ausentes ficam fora do factorize. Numa coluna tipada todos têm o mesmo
+    # texto ('nan', 'NaT', '<NA>'); numa coluna object podem ser None ou NaN
+    posicoes = np.flatnonzero(codigos < 0)
+    if len(posicoes):
+        nulos = serie.iloc[posicoes] if serie.dtype == object else serie.iloc[posicoes[:1]]
+        textos_nulos = transformar(
+            pd.Series([str(valor) for valor in nulos], dtype=object)
+        ).to_numpy(dtype=object)
+        resultado[posicoes] = textos_nulos if serie.dtype == object else textos_nulos[0]
+    return resultado
+
+
+def _texto_coluna(
+    df: pd.DataFrame,
+    coluna: str,
+    transformar: Callable[[pd.Series], pd.Series] = lambda textos: textos
+) -> np.ndarray:
+    """_por_valor_distinto da coluna, ou '' em todas as linhas se ela não existir"""
+    if coluna not in df.columns:
+        return np.full(len(df), transformar(pd.Series([''], dtype=object)).iloc[0], dtype=object)
+    return _por_valor_distinto(df[coluna], transformar)
+
+
+def gerar_chaves_ocorrencia(df: pd.DataFrame) -> pd.Series:
+    """
+    Versão vetorizada de gerar_chave_ocorrencia para o DataFrame inteiro.
+    
+    Returns:
+        Series com as mesmas chaves (None onde faltam dados)
+    """
+    ano = _texto_coluna(df, 'ano_registro', lambda t: t.str.strip())
+    unidade = _texto_coluna(df, 'unidade_registro', lambda t: t.str.strip())
+    numero = _texto_coluna(df, 'numero_ocorrencia', lambda t: t.str.strip())
+    unidade_limpa = _texto_coluna(
+        df, 'unidade_registro', lambda t: t.str.strip().str.replace(RE_NAO_ALFANUMERICO, '', regex=True)
+    )
+    
+    validas = (ano != '') & (unidade != '') & (numero != '')
+    chaves = pd.Series(ano, index=df.index) + '_' + unidade_limpa + '_' + numero
+    return chaves.where(validas, None)
+
+
+def gerar_chaves_pessoa(df: pd.DataFrame) -> pd.Series:
+    """
+    Versão vetorizada de gerar_chave_pessoa para o DataFrame inteiro.
+    
+    Returns:
+        Series com as mesmas chaves (None onde faltam dados)
+    """
+    def minusculo(textos: pd.Series) -> pd.Series:
+        return textos.str.strip().str.lower()
+    
+    # Nome normalizado, caindo para o nome original quando vazio ou 'nan'
+    nome = (
+        _texto_coluna(df, 'nome_normalizado', minusculo) if 'nome_normalizado' in df.columns
+        else np.full(len(df), '', dtype=object)
+    )
+    sem_nome = (nome == '') | (nome == 'nan')
+    if sem_nome.any():
+        nome = np.where(sem_nome, _texto_coluna(df, 'nome', minusculo), nome)
+    
+    # Primeira coluna de data (na ordem de preferência) com valor útil
+    data = np.full(len(df), '', dtype=object)
+    encontrada = np.zeros(len(df), dtype=bool)
+    for coluna in COLUNAS_DATA_NASCIMENTO:
+        if coluna in df.columns:
+            data = np.where(encontrada, data, _texto_coluna(df, coluna, lambda t: t.str.strip()))
+            encontrada = (data != '') & (data != 'nan')
+    
+    validas = (nome != '') & (nome != 'nan') & encontrada
+    nome_chave = _por_valor_distinto(
+        pd.Series(nome, index=df.index),
+        lambda t: t.str.replace(RE_NOME_INVALIDO, '', regex=True).str.replace(RE_ESPACOS, '_', regex=True)
+    )
+    chaves = pd.Series(nome_chave, index=df.index) + '|' + data
+    return chaves.where(validas, None)
+
+
 def identificar_natureza_alvo(natureza: str) -> Optional[str]:
     """
     Identifica se a natureza pertence ao grupo-alvo de análise.
@@ -97,19 +212,7 @@ def identificar_natureza_alvo(natureza: str) -> Optional[str]:
     Returns:
         String padronizada da natureza-alvo ou None
     """
-    if pd.isna(natureza):
-        return None
-        
-    natureza_upper = str(natureza).upper().strip()
-    
-    if 'DESAPARECIMENTO' in natureza_upper:
-        return 'DESAPARECIMENTO'
-    elif 'HOMICIDIO' in natureza_upper or 'HOMICÍDIO' in natureza_upper:
-        return 'HOMICIDIO'
-    elif 'CADAVER' in natureza_upper or 'CADÁVER' in natureza_upper:
-        return 'CADAVER'
-    
-    return None
+    return classificar_valor(natureza, REGRAS_NATUREZA_ALVO)
 
 
 def identificar_papel_pessoa(papel: str) -> Optional[str]:
@@ -129,23 +232,7 @@ def identificar_papel_pessoa(papel: str) -> Optional[str]:
     Returns:
         String padronizada do papel ou None
     """
-    if pd.isna(papel):
-        return None
-        
-    papel_upper = str(papel).upper().strip()
-    
-    if 'VITIMA' in papel_upper or 'VÍTIMA' in papel_upper:
-        return 'VITIMA'
-    elif 'AUTOR' in papel_upper:
-        return 'AUTOR'
-    elif 'TESTEMUNHA' in papel_upper:
-        return 'TESTEMUNHA'
-    elif 'COMUNICANTE' in papel_upper:
-        return 'COMUNICANTE'
-    elif 'REPRESENTANTE' in papel_upper:
-        return 'REPRESENTANTE'
-    
-    return None
+    return classificar_valor(papel, REGRAS_PAPEL_PESSOA)
 
 
 def eh_vitima_grupo_alvo(row: pd.Series) -> bool:
@@ -162,7 +249,7 @@ def eh_vitima_grupo_alvo(row: pd.Series) -> bool:
             row.get('papel_pessoa') == 'VITIMA')
 
 
-def enriquecer_com_chaves(df: pd.DataFrame) -> pd.DataFrame:
+def enriquecer_com_chaves(df: pd.DataFrame, pasta_cache: Optional[str] = None) -> pd.DataFrame:
     """
     Enriquece DataFrame com chaves de correlação e classificações.
     
@@ -173,36 +260,44 @@ def enriquecer_com_chaves(df: pd.DataFrame) -> pd.DataFrame:
     - contexto_pessoa: Classificação do contexto da PESSOA (DESAPARECIMENTO/HOMICIDIO/CADAVER)
     - papel_pessoa: Classificação do papel (VITIMA/AUTOR/TESTEMUNHA/etc)
     
+    As três classificações são Categorical, calculadas uma vez por valor
+    distinto (ver utils.classificacao).
+    
     Args:
         df: DataFrame com dados das ocorrências
+        pasta_cache: Pasta dos mapas valor -> classe entre execuções (opcional)
         
     Returns:
         DataFrame enriquecido com novas colunas
     """
     print("Gerando chaves de correlação...")
     
-    # Gera chaves
-    df['chave_ocorrencia'] = df.apply(gerar_chave_ocorrencia, axis=1)
-    df['chave_pessoa'] = df.apply(gerar_chave_pessoa, axis=1)
+    # Gera chaves (vetorizado; mesmas chaves de gerar_chave_ocorrencia/gerar_chave_pessoa)
+    df['chave_ocorrencia'] = gerar_chaves_ocorrencia(df)
+    df['chave_pessoa'] = gerar_chaves_pessoa(df)
+    
+    natureza = classificador_natureza(pasta_cache)
+    papel = classificador_papel(pasta_cache)
+    ausente = pd.Series(None, index=df.index, dtype=object)
     
     # Classifica natureza da OCORRÊNCIA (usa 'natureza' ou 'natureza_padronizada')
     col_natureza = 'natureza_padronizada' if 'natureza_padronizada' in df.columns else 'natureza'
     if col_natureza in df.columns:
-        df['natureza_alvo'] = df[col_natureza].apply(identificar_natureza_alvo)
+        df['natureza_alvo'] = natureza.classificar(df[col_natureza])
     else:
-        df['natureza_alvo'] = None
+        df['natureza_alvo'] = natureza.classificar(ausente)
     
     # Classifica contexto da PESSOA (usa 'natureza_envolvido')
     if 'natureza_envolvido' in df.columns:
-        df['contexto_pessoa'] = df['natureza_envolvido'].apply(identificar_natureza_alvo)
+        df['contexto_pessoa'] = natureza.classificar(df['natureza_envolvido'])
     else:
-        df['contexto_pessoa'] = None
+        df['contexto_pessoa'] = natureza.classificar(ausente)
     
     # Classifica papel (usa 'tipo_vinculo')
     if 'tipo_vinculo' in df.columns:
-        df['papel_pessoa'] = df['tipo_vinculo'].apply(identificar_papel_pessoa)
+        df['papel_pessoa'] = papel.classificar(df['tipo_vinculo'])
     else:
-        df['papel_pessoa'] = None
+        df['papel_pessoa'] = papel.classificar(ausente)
     
     # Estatísticas
     total_com_chave_ocorrencia = df['chave_ocorrencia'].notna().sum()
@@ -223,6 +318,28 @@ def enriquecer_com_chaves(df: pd.DataFrame) -> pd.DataFrame:
     return df
 
 
+def mascara_grupo_alvo(df: pd.DataFrame, apenas_vitimas: bool = True) -> pd.Series:
+    """
+    Máscara booleana do grupo-alvo (mesmo critério de eh_vitima_grupo_alvo, sem apply).
+    
+    Args:
+        df: DataFrame com natureza_alvo e papel_pessoa (coluna ausente = nenhum registro)
+        apenas_vitimas: Se True, exige papel_pessoa == 'VITIMA'
+        
+    Returns:
+        Series booleana alinhada ao índice do DataFrame
+    """
+    if 'natureza_alvo' not in df.columns:
+        return pd.Series(False, index=df.index)
+    
+    mascara = df['natureza_alvo'].notna()
+    if apenas_vitimas:
+        if 'papel_pessoa' not in df.columns:
+            return pd.Series(False, index=df.index)
+        mascara &= (df['papel_pessoa'] == 'VITIMA').fillna(False).astype(bool)
+    return mascara
+
+
 def filtrar_grupo_alvo(df: pd.DataFrame, apenas_vitimas: bool = True) -> pd.DataFrame:
     """
     Filtra DataFrame para manter apenas registros do grupo-alvo.
@@ -234,11 +351,10 @@ def filtrar_grupo_alvo(df: pd.DataFrame, apenas_vitimas: bool = True) -> pd.Data
     Returns:
         DataFrame filtrado
     """
+    df_filtrado = df[mascara_grupo_alvo(df, apenas_vitimas).to_numpy()].copy()
     if apenas_vitimas:
-        df_filtrado = df[df.apply(eh_vitima_grupo_alvo, axis=1)].copy()
         print(f"Filtrado para vítimas do grupo-alvo: {len(df_filtrado):,} registros")
     else:
-        df_filtrado = df[df['natureza_alvo'].notna()].copy()
         print(f"Filtrado para grupo-alvo (todos os papéis): {len(df_filtrado):,} registros")
     
     return df_filtrado
@@ -0,0 +1,162 @@
+"""
+Classificação de colunas de baixa cardinalidade por tabela de valores.
+
+Colunas como natureza, natureza_envolvido e tipo_vinculo têm poucas centenas
+de valores distintos em milhões de linhas. A regra (termos procurados no
+texto em maiúsculas, definidos em config) roda uma vez por valor distinto; o
+mapa valor -> classe fica em cache JSON entre execuções e pode ser auditado
+com Classificador.tabela(). A coluna resultante é Categorical, com as classes
+da regra como categorias.
+
+Uso:
+    classificador = Classificador('natureza_alvo', REGRAS_NATUREZA_ALVO, pasta_cache)
+    df['natureza_alvo'] = classificador.classificar(df['natureza'])
+    classificador.tabela(df['natureza'])  # valor, classe, registros
+"""
+
+import json
+import os
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from config.config import REGRAS_NATUREZA_ALVO, REGRAS_PAPEL_PESSOA
+
+# Versão do formato do cache: incrementar ao mudá-lo
+VERSAO_CLASSIFICACAO = 1
+
+
+def classificar_valor(valor, regras: Dict[str, List[str]]) -> Optional[str]:
+    """
+    Classe de um valor: a primeira (na ordem de `regras`) com algum termo no texto.
+
+    Args:
+        valor: Valor da coluna (qualquer tipo; ausente -> None)
+        regras: Classe -> termos procurados no texto em maiúsculas
+
+    Returns:
+        Classe ou None
+    """
+    if pd.isna(valor):
+        return None
+
+    texto = str(valor).upper().strip()
+    for classe, termos in regras.items():
+        if any(termo in texto for termo in termos):
+            return classe
+    return None
+
+
+class Classificador:
+    """
+    Classificação por valor distinto, com cache do mapa valor -> classe.
+
+    O cache é descartado quando as regras mudam (elas são gravadas junto
+    com o mapa).
+    """
+
+    def __init__(
+        self,
+        nome: str,
+        regras: Dict[str, List[str]],
+        pasta_cache: Optional[str] = None
+    ):
+        """
+        Args:
+            nome: Nome do classificador (nome do arquivo de cache)
+            regras: Classe -> termos (ver classificar_valor)
+            pasta_cache: Pasta dos caches JSON (None = sem cache em disco)
+        """
+        self.nome = nome
+        self.regras = {classe: list(termos) for classe, termos in regras.items()}
+        self.dtype = pd.CategoricalDtype(list(self.regras))
+        self.caminho_cache = Path(pasta_cache) / f"{nome}.json" if pasta_cache else None
+        self.mapa: Dict[str, Optional[str]] = self._carregar_cache()
+
+    def _carregar_cache(self) -> Dict[str, Optional[str]]:
+        """Mapa gravado em execuções anteriores; vazio se as regras mudaram"""
+        if self.caminho_cache is None:
+            return {}
+        try:
+            with open(self.caminho_cache, 'r', encoding='utf-8') as f:
+                conteudo = json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+        if conteudo.get('versao') != VERSAO_CLASSIFICACAO or conteudo.get('regras') != self.regras:
+            return {}
+        return conteudo.get('mapa', {})
+
+    def _salvar_cache(self) -> None:
+        """Grava o mapa de forma atômica (arquivo temporário + rename)"""
+        self.caminho_cache.parent.mkdir(parents=True, exist_ok=True)
+        temporario = self.caminho_cache.with_suffix('.json.tmp')
+        with open(temporario, 'w', encoding='utf-8') as f:
+            json.dump(
+                {'versao': VERSAO_CLASSIFICACAO, 'regras': self.regras, 'mapa': self.mapa},
+                f, ensure_ascii=False, indent=1, sort_keys=True
+            )
+        os.replace(temporario, self.caminho_cache)
+
+    def classificar(self, serie: pd.Series) -> pd.Series:
+        """
+        Classifica a coluna, aplicando a regra só aos valores ainda fora do mapa.
+
+        Args:
+            serie: Coluna a classificar
+
+        Returns:
+            Series Categorical (categorias = classes das regras; NaN sem classe)
+        """
+        codigos, distintos = pd.factorize(serie)
+        textos = [str(valor) for valor in distintos]
+
+        novos = [texto for texto in textos if texto not in self.mapa]
+        for texto in novos:
+            self.mapa[texto] = classificar_valor(texto, self.regras)
+        if novos and self.caminho_cache is not None:
+            self._salvar_cache()
+
+        # Código da categoria de cada valor distinto (-1 = sem classe / ausente)
+        categorias = {classe: i for i, classe in enumerate(self.dtype.categories)}
+        codigo_classe = np.array(
+            [categorias.get(self.mapa[texto], -1) for texto in textos] + [-1], dtype=np.int16
+        )
+        return pd.Series(
+            pd.Categorical.from_codes(codigo_classe[codigos], dtype=self.dtype),
+            index=serie.index
+        )
+
+    def tabela(self, serie: Optional[pd.Series] = None) -> pd.DataFrame:
+        """
+        Mapa valor -> classe para auditoria.
+
+        Args:
+            serie: Se informada, restringe aos valores da coluna e conta os registros de cada um
+
+        Returns:
+            DataFrame com valor, classe (e registros), ordenado por classe e valor
+        """
+        if serie is None:
+            tabela = pd.DataFrame(list(self.mapa.items()), columns=['valor', 'classe'])
+        else:
+            contagem = serie.astype(str).where(serie.notna()).value_counts()
+            self.classificar(pd.Series(contagem.index))
+            tabela = pd.DataFrame({
+                'valor': contagem.index,
+                'classe': [self.mapa[valor] for valor in contagem.index],
+                'registros': contagem.to_numpy(),
+            })
+        return tabela.sort_values(['classe', 'valor'], na_position='last').reset_index(drop=True)
+
+
+def classificador_natureza(pasta_cache: Optional[str] = None) -> Classificador:
+    """Classificador de natureza-alvo (DESAPARECIMENTO/HOMICIDIO/CADAVER)"""
+    return Classificador('natureza_alvo', REGRAS_NATUREZA_ALVO, pasta_cache)
+
+
+def classificador_papel(pasta_cache: Optional[str] = None) -> Classificador:
+    """Classificador de papel da pessoa (VITIMA/AUTOR/TESTEMUNHA/...)"""
+    return Classificador('papel_pessoa', REGRAS_PAPEL_PESSOA, pasta_cache)
@@ -0,0 +1,116 @@
+"""
+Codificação fonética de nomes em português (no estilo BuscaBR).
+
+Reduz cada palavra do nome a um código que ignora diferenças de grafia
+comuns em registros brasileiros: 'LUIZ'/'LUIS', 'SOUZA'/'SOUSA',
+'THIAGO'/'TIAGO', 'WALTER'/'VALTER', 'PHILIPE'/'FELIPE'. O código de um
+nome é a sequência dos códigos das palavras, sem as preposições.
+
+Nomes se repetem muito (e palavras mais ainda), então a codificação em lote
+trabalha sobre os valores distintos e guarda o código de cada palavra em
+cache de módulo: em milhões de registros só algumas dezenas de milhares de
+palavras são de fato codificadas.
+"""
+
+import re
+import unicodedata
+from typing import Dict, List, Tuple
+
+import pandas as pd
+
+# Versão das regras: incrementar ao mudá-las (invalida o cache de estágios)
+VERSAO_FONETICA = 1
+
+PREPOSICOES = frozenset({'DA', 'DE', 'DO', 'DAS', 'DOS', 'E'})
+
+# Substituições em ordem de aplicação (grupos do BuscaBR, com as consoantes
+# compostas tratadas antes das simples)
+_REGRAS: List[Tuple[re.Pattern, str]] = [
+    (re.compile(pattern), substituto) for pattern, substituto in [
+        (r'BL|BR', 'B'),
+        (r'PH', 'F'),
+        (r'GL|GR|MG|NG|RG', 'G'),
+        (r'Y', 'I'),
+        (r'GE|GI|RJ|MJ', 'J'),
+        (r'CA|CO|CU|CK|Q', 'K'),
+        (r'N', 'M'),
+        (r'AO|AUM|GM|MD|OM|ON', 'M'),
+        (r'PR', 'P'),
+        (r'L', 'R'),
+        (r'CE|CI|CH|CS|RS|TS|X|Z', 'S'),
+        (r'TR|TL|CT|RT|ST|PT', 'T'),
+        (r'C', 'K'),
+        (r'W', 'V'),
+    ]
+]
+_RE_TERMINACAO = re.compile(r'(?:S|R|M)+$')
+_RE_VOGAIS_H = re.compile(r'[AEIOUH]')
+_RE_REPETIDAS = re.compile(r'(.)\1+')
+
+# Código de cada palavra já vista (cresce até LIMITE_CACHE entradas)
+LIMITE_CACHE = 500_000
+_cache_palavras: Dict[str, str] = {}
+
+
+def _sem_acentos(texto: str) -> str:
+    decomposto = unicodedata.normalize('NFKD', texto)
+    return ''.join(c for c in decomposto if not unicodedata.combining(c))
+
+
+def codificar_palavra(palavra: str) -> str:
+    """
+    Código fonético de uma palavra.
+
+    Args:
+        palavra: Palavra (qualquer caixa, com ou sem acento)
+
+    Returns:
+        Código em maiúsculas ('' para palavra vazia)
+    """
+    codigo = _cache_palavras.get(palavra)
+    if codigo is not None:
+        return codigo
+
+    texto = re.sub(r'[^A-Z]', '', _sem_acentos(palavra).upper())
+    if texto:
+        for padrao, substituto in _REGRAS:
+            texto = padrao.sub(substituto, texto)
+        texto = _RE_TERMINACAO.sub('', texto) or texto[:1]
+        # A letra inicial fica; vogais e H somem do restante
+        texto = texto[0] + _RE_VOGAIS_H.sub('', texto[1:])
+        texto = _RE_REPETIDAS.sub(r'\1', texto)
+
+    if len(_cache_palavras) < LIMITE_CACHE:
+        _cache_palavras[palavra] = texto
+    return texto
+
+
+def codificar_nome(nome: str) -> str:
+    """
+    Código fonético de um nome: códigos das palavras separados por espaço.
+
+    Returns:
+        Código ('' para nome vazio ou só com preposições)
+    """
+    if not isinstance(nome, str):
+        return ''
+    codigos = (
+        codificar_palavra(palavra) for palavra in nome.split()
+        if palavra.upper() not in PREPOSICOES
+    )
+    return ' '.join(codigo for codigo in codigos if codigo)
+
+
+def codificar_nomes_em_lote(nomes: pd.Series) -> pd.Series:
+    """
+    Codifica uma coluna de nomes, uma vez por valor distinto.
+
+    Args:
+        nomes: Série de nomes (normalizados ou não)
+
+    Returns:
+        Série com o código de cada nome (None onde o nome falta ou não gera código)
+    """
+    distintos = pd.unique(nomes.dropna())
+    codigos = {nome: codificar_nome(nome) or None for nome in distintos}
+    return nomes.map(codigos).astype(object).where(nomes.notna(), None)
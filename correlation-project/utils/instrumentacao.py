@@ -0,0 +1,238 @@
+"""
+Instrumentação das etapas do ETL.
+
+Cada etapa medida registra tempo de relógio, tempo de CPU (do processo e
+dos processos filhos), pico de memória (RSS) e linhas de entrada/saída.
+O relatório da execução é gravado em JSON e, opcionalmente, em um arquivo
+texto no formato do Prometheus (coletor textfile do node_exporter).
+
+Uso:
+    instr = Instrumentacao('pipeline_completo')
+    with instr.etapa('padronizacao', linhas_entrada=len(df)) as medicao:
+        df = padronizar(df)
+        medicao.linhas_saida = len(df)
+    instr.salvar_json(OUTPUT_DIR / 'relatorios' / 'execucao.json')
+"""
+import json
+import os
+import sys
+import time
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional
+
+try:
+    import resource
+    RESOURCE_DISPONIVEL = True
+except ImportError:  # Windows
+    RESOURCE_DISPONIVEL = False
+
+try:
+    import psutil
+    PSUTIL_DISPONIVEL = True
+except ImportError:
+    PSUTIL_DISPONIVEL = False
+
+
+def _pico_rss() -> Optional[int]:
+    """Maior RSS do processo até agora, em bytes (None se não houver como medir)"""
+    if RESOURCE_DISPONIVEL:
+        pico = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # Linux informa em KB; macOS em bytes
+        return pico if sys.platform == 'darwin' else pico * 1024
+    if PSUTIL_DISPONIVEL:
+        memoria = psutil.Process().memory_info()
+        return getattr(memoria, 'peak_wset', memoria.rss)
+    return None
+
+
+def _tempo_cpu() -> float:
+    """CPU do processo + filhos já encerrados (os.times zera os filhos no Windows)"""
+    tempos = os.times()
+    return tempos.user + tempos.system + tempos.children_user + tempos.children_system
+
+
+class MedicaoEtapa:
+    """Medição de uma etapa; linhas_saida pode ser preenchida dentro do bloco"""
+
+    def __init__(self, nome: str, linhas_entrada: Optional[int] = None):
+        self.nome = nome
+        self.linhas_entrada = linhas_entrada
+        self.linhas_saida: Optional[int] = None
+        self.extras: Dict[str, object] = {}
+        self.tempo_s = 0.0
+        self.cpu_s = 0.0
+        self.pico_rss_mb: Optional[float] = None
+        self.delta_pico_rss_mb: Optional[float] = None
+        self.erro: Optional[str] = None
+
+    @property
+    def linhas_por_segundo(self) -> Optional[float]:
+        linhas = self.linhas_entrada if self.linhas_entrada is not None else self.linhas_saida
+        if linhas is None or self.tempo_s <= 0:
+            return None
+        return linhas / self.tempo_s
+
+    def para_dict(self) -> Dict:
+        dados = {
+            'etapa': self.nome,
+            'tempo_s': round(self.tempo_s, 4),
+            'cpu_s': round(self.cpu_s, 4),
+            'pico_rss_mb': self.pico_rss_mb,
+            'delta_pico_rss_mb': self.delta_pico_rss_mb,
+            'linhas_entrada': self.linhas_entrada,
+            'linhas_saida': self.linhas_saida,
+            'linhas_por_segundo': (round(self.linhas_por_segundo, 1)
+                                   if self.linhas_por_segundo is not None else None),
+        }
+        if self.extras:
+            dados['extras'] = self.extras
+        if self.erro:
+            dados['erro'] = self.erro
+        return dados
+
+
+class Instrumentacao:
+    """Coleta as medições das etapas de uma execução"""
+
+    def __init__(self, nome_execucao: str = 'pipeline'):
+        self.nome_execucao = nome_execucao
+        self.inicio = datetime.now()
+        self.etapas: List[MedicaoEtapa] = []
+        self._pilha: List[str] = []
+        self._relogio_inicio = time.perf_counter()
+
+    @contextmanager
+    def etapa(self, nome: str, linhas_entrada: Optional[int] = None) -> Iterator[MedicaoEtapa]:
+        """
+        Mede o bloco como uma etapa.
+
+        Etapas aninhadas recebem o nome da etapa externa como prefixo
+        ('padronizado/pessoa'). Exceções são registradas e repassadas.
+        """
+        nome_completo = '/'.join(self._pilha + [nome])
+        medicao = MedicaoEtapa(nome_completo, linhas_entrada)
+
+        pico_antes = _pico_rss()
+        cpu_antes = _tempo_cpu()
+        relogio_antes = time.perf_counter()
+        self._pilha.append(nome)
+        try:
+            yield medicao
+        except BaseException as e:
+            medicao.erro = f"{type(e).__name__}: {e}"[:200]
+            raise
+        finally:
+            self._pilha.pop()
+            medicao.tempo_s = time.perf_counter() - relogio_antes
+            medicao.cpu_s = _tempo_cpu() - cpu_antes
+            pico_depois = _pico_rss()
+            if pico_depois is not None:
+                medicao.pico_rss_mb = round(pico_depois / 2**20, 1)
+                medicao.delta_pico_rss_mb = round((pico_depois - pico_antes) / 2**20, 1)
+            self.etapas.append(medicao)
+
+    def resumo(self) -> Dict[str, Dict]:
+        """Totais por nome de etapa (etapas repetidas, ex.: blocos do streaming)"""
+        totais: Dict[str, Dict] = {}
+        for medicao in self.etapas:
+            total = totais.setdefault(medicao.nome, {
+                'execucoes': 0, 'tempo_s': 0.0, 'cpu_s': 0.0,
+                'linhas_entrada': 0, 'linhas_saida': 0, 'delta_pico_rss_mb': 0.0,
+            })
+            total['execucoes'] += 1
+            total['tempo_s'] += medicao.tempo_s
+            total['cpu_s'] += medicao.cpu_s
+            total['linhas_entrada'] += medicao.linhas_entrada or 0
+            total['linhas_saida'] += medicao.linhas_saida or 0
+            total['delta_pico_rss_mb'] += medicao.delta_pico_rss_mb or 0.0
+
+        for total in totais.values():
+            linhas = total['linhas_entrada'] or total['linhas_saida']
+            total['linhas_por_segundo'] = round(linhas / total['tempo_s'], 1) if total['tempo_s'] > 0 and linhas else None
+            total['tempo_s'] = round(total['tempo_s'], 4)
+            total['cpu_s'] = round(total['cpu_s'], 4)
+            total['delta_pico_rss_mb'] = round(total['delta_pico_rss_mb'], 1)
+        return totais
+
+    def relatorio(self) -> Dict:
+        """Relatório completo da execução (serializável em JSON)"""
+        pico = _pico_rss()
+        return {
+            'execucao': self.nome_execucao,
+            'inicio': self.inicio.isoformat(timespec='seconds'),
+            'tempo_total_s': round(time.perf_counter() - self._relogio_inicio, 4),
+            'pico_rss_mb': round(pico / 2**20, 1) if pico is not None else None,
+            'etapas': [medicao.para_dict() for medicao in self.etapas],
+            'resumo': self.resumo(),
+        }
+
+    def imprimir_resumo(self) -> None:
+        """Tabela curta no console"""
+        print(f"\n[Instrumentação] {self.nome_execucao}")
+        for nome, total in self.resumo().items():
+            taxa = f"{total['linhas_por_segundo']:,.0f} linhas/s" if total['linhas_por_segundo'] else '-'
+            print(f"  {nome:<35} {total['tempo_s']:>9.2f}s  cpu {total['cpu_s']:>9.2f}s  "
+                  f"Δpico {total['delta_pico_rss_mb']:>8.1f} MB  {taxa}")
+
+    def salvar_json(self, caminho) -> Path:
+        """Grava o relatório em JSON"""
+        caminho = Path(caminho)
+        caminho.parent.mkdir(parents=True, exist_ok=True)
+        with open(caminho, 'w', encoding='utf-8') as f:
+            json.dump(self.relatorio(), f, ensure_ascii=False, indent=2)
+        return caminho
+
+    def salvar_prometheus(self, caminho, prefixo: str = 'cerberus_etl') -> Path:
+        """
+        Grava as métricas no formato texto do Prometheus.
+
+        A escrita é atômica (arquivo temporário + rename), como exige o
+        coletor textfile do node_exporter.
+        """
+        metricas = {
+            'tempo_segundos': ('Tempo de relógio da etapa', 'tempo_s'),
+            'cpu_segundos': ('Tempo de CPU da etapa', 'cpu_s'),
+            'delta_pico_rss_megabytes': ('Aumento do pico de RSS durante a etapa', 'delta_pico_rss_mb'),
+            'linhas_entrada': ('Linhas recebidas pela etapa', 'linhas_entrada'),
+            'linhas_saida': ('Linhas produzidas pela etapa', 'linhas_saida'),
+            'linhas_por_segundo': ('Vazão da etapa', 'linhas_por_segundo'),
+        }
+        resumo = self.resumo()
+        execucao = self.nome_execucao.replace('"', "'")
+
+        linhas = []
+        for sufixo, (descricao, campo) in metricas.items():
+            nome_metrica = f"{prefixo}_etapa_{sufixo}"
+            linhas.append(f"# HELP {nome_metrica} {descricao}")
+            linhas.append(f"# TYPE {nome_metrica} gauge")
+            for etapa, total in resumo.items():
+                valor = total[campo]
+                if valor is None:
+                    continue
+                etapa = etapa.replace('"', "'")
+                linhas.append(f'{nome_metrica}{{execucao="{execucao}",etapa="{etapa}"}} {valor}')
+
+        nome_metrica = f"{prefixo}_execucao_timestamp_segundos"
+        linhas.append(f"# HELP {nome_metrica} Início da execução (epoch)")
+        linhas.append(f"# TYPE {nome_metrica} gauge")
+        linhas.append(f'{nome_metrica}{{execucao="{execucao}"}} {self.inicio.timestamp():.0f}')
+
+        caminho = Path(caminho)
+        caminho.parent.mkdir(parents=True, exist_ok=True)
+        temporario = caminho.with_name(caminho.name + '.tmp')
+        with open(temporario, 'w', encoding='utf-8') as f:
+            f.write('\n'.join(linhas) + '\n')
+        temporario.replace(caminho)
+        return caminho
+
+
+@contextmanager
+def medir(instrumentacao: Optional[Instrumentacao], nome: str,
+          linhas_entrada: Optional[int] = None) -> Iterator[MedicaoEtapa]:
+    """instrumentacao.etapa(...) se houver instrumentação; senão mede em uma descartável"""
+    if instrumentacao is None:
+        instrumentacao = Instrumentacao()
+    with instrumentacao.etapa(nome, linhas_entrada) as medicao:
+        yield medicao
@@ -0,0 +1,195 @@
+"""
+Journal de progresso da validação com IA.
+
+Cada veredito é acrescentado como uma linha JSON em um arquivo append-only,
+identificado por um id estável do caso (par de BOs). Registrar um caso custa
+uma escrita de poucas centenas de bytes, em vez de regravar a planilha
+inteira; a retomada lê apenas o journal. O XLSX de progresso é gerado uma
+única vez, ao final (ou sob demanda), a partir do journal.
+"""
+
+import json
+import os
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Optional
+
+import pandas as pd
+
+
+COLUNAS_IA = {
+    'validado': 'ia_validado',
+    'mesma_pessoa': 'ia_mesma_pessoa',
+    'confianca': 'ia_confianca',
+    'justificativa': 'ia_justificativa',
+    'erro': 'ia_erro',
+}
+
+
+def id_caso(caso) -> str:
+    """
+    Id estável de um caso de correlação: 'bo_desaparecimento|bo_morte'.
+
+    Não depende da posição da linha na planilha, então continua válido se
+    a entrada for reordenada ou regerada.
+    """
+    return f"{str(caso['bo_desaparecimento']).strip()}|{str(caso['bo_morte']).strip()}"
+
+
+def _valor_json(valor):
+    """Converte escalares numpy/pandas em tipos nativos serializáveis"""
+    if valor is None:
+        return None
+    if hasattr(valor, 'item'):
+        valor = valor.item()
+    if isinstance(valor, float) and valor != valor:
+        return None
+    return valor
+
+
+class JournalValidacao:
+    """
+    Arquivo JSONL append-only com os vereditos da validação.
+
+    Uso:
+        journal = JournalValidacao('output/validacao_journal.jsonl')
+        vereditos = journal.carregar()
+        journal.registrar(id_caso(caso), resultado, nome=caso['nome'])
+    """
+
+    def __init__(self, caminho: str):
+        self.caminho = Path(caminho)
+        self._trava = threading.Lock()
+        self._arquivo = None
+
+    def carregar(self) -> Dict[str, Dict]:
+        """
+        Lê o journal e devolve o último veredito de cada caso.
+
+        Uma linha final truncada (processo interrompido durante a escrita)
+        é ignorada.
+
+        Returns:
+            Dict id_caso -> registro
+        """
+        vereditos = {}
+        if not self.caminho.exists():
+            return vereditos
+
+        with open(self.caminho, 'r', encoding='utf-8') as f:
+            for linha in f:
+                linha = linha.strip()
+                if not linha:
+                    continue
+                try:
+                    registro = json.loads(linha)
+                except json.JSONDecodeError:
+                    continue
+                vereditos[registro['id_caso']] = registro
+
+        return vereditos
+
+    def registrar(self, id_caso: str, resultado: Dict, nome: Optional[str] = None) -> None:
+        """
+        Acrescenta um veredito ao journal (flush + fsync antes de retornar).
+
+        Args:
+            id_caso: Id estável do caso (ver id_caso())
+            resultado: Dict com validado, mesma_pessoa, confianca, justificativa, erro
+            nome: Nome da pessoa do caso (exibido pelo monitor de progresso)
+        """
+        registro = {'id_caso': id_caso, 'nome': _valor_json(nome)}
+        for campo in COLUNAS_IA:
+            registro[campo] = _valor_json(resultado.get(campo))
+        registro['registrado_em'] = datetime.now().isoformat(timespec='seconds')
+
+        linha = json.dumps(registro, ensure_ascii=False) + '\n'
+
+        with self._trava:
+            if self._arquivo is None:
+                self._abrir()
+            self._arquivo.write(linha)
+            self._arquivo.flush()
+            os.fsync(self._arquivo.fileno())
+
+    def _abrir(self) -> None:
+        """Abre para acréscimo, isolando uma eventual linha final truncada"""
+        self.caminho.parent.mkdir(parents=True, exist_ok=True)
+        self._arquivo = open(self.caminho, 'a', encoding='utf-8')
+
+        if self.caminho.stat().st_size > 0:
+            with open(self.caminho, 'rb') as f:
+                f.seek(-1, os.SEEK_END)
+                if f.read(1) != b'\n':
+                    self._arquivo.write('\n')
+
+    def importar_progresso_xlsx(self, caminho_xlsx: str) -> int:
+        """
+        Migra para o journal os casos já validados de uma planilha de progresso antiga.
+
+        Returns:
+            Número de casos importados
+        """
+        df = pd.read_excel(caminho_xlsx)
+        if 'ia_validado' not in df.columns:
+            return 0
+
+        importados = 0
+        for _, linha in df[df['ia_validado'] == True].iterrows():
+            resultado = {campo: _valor_json(linha.get(coluna)) for campo, coluna in COLUNAS_IA.items()}
+            # Colunas com vazios voltam do Excel como float (1.0/0.0)
+            if resultado['mesma_pessoa'] is not None:
+                resultado['mesma_pessoa'] = bool(resultado['mesma_pessoa'])
+            self.registrar(id_caso(linha), resultado, nome=linha.get('nome'))
+            importados += 1
+
+        return importados
+
+    def fechar(self) -> None:
+        with self._trava:
+            if self._arquivo is not None:
+                self._arquivo.close()
+                self._arquivo = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.fechar()
+
+
+def aplicar_vereditos(df: pd.DataFrame, vereditos: Dict[str, Dict]) -> pd.DataFrame:
+    """
+    Monta as colunas ia_* do DataFrame de casos a partir dos vereditos do journal.
+
+    Casos sem veredito ficam com ia_validado=False.
+
+    Args:
+        df: Casos de correlação (precisa de bo_desaparecimento e bo_morte)
+        vereditos: Resultado de JournalValidacao.carregar()
+
+    Returns:
+        Cópia do DataFrame com as colunas ia_validado, ia_mesma_pessoa,
+        ia_confianca, ia_justificativa e ia_erro
+    """
+    df = df.copy()
+    ids = df.apply(id_caso, axis=1) if len(df) else pd.Series([], dtype=object)
+    registros = ids.map(vereditos)
+
+    padroes = {'validado': False, 'mesma_pessoa': None, 'confianca': 0,
+               'justificativa': '', 'erro': None}
+
+    for campo, coluna in COLUNAS_IA.items():
+        padrao = padroes[campo]
+        df[coluna] = [r.get(campo, padrao) if isinstance(r, dict) else padrao
+                      for r in registros]
+
+    df['ia_validado'] = df['ia_validado'].fillna(False).astype(bool)
+    return df
+
+
+def exportar_progresso(df: pd.DataFrame, caminho_xlsx: str) -> None:
+    """Grava a planilha de progresso (uma única escrita, não por caso)"""
+    Path(caminho_xlsx).parent.mkdir(parents=True, exist_ok=True)
+    df.to_excel(caminho_xlsx, index=False, engine='openpyxl')
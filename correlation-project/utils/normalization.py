@@ -1,11 +1,25 @@
 """Funções utilitárias para normalização de dados"""
+import json
+import os
 import re
 import unicodedata
 from datetime import datetime
-from typing import Optional, Tuple
+from pathlib import Path
+from typing import Dict, Optional, Tuple, Union
+import numpy as np
 import pandas as pd
 
 
+# Versão das regras de normalização de nomes (invalida o cache em disco ao mudar)
+VERSAO_NORMALIZACAO_NOME = 1
+
+# Máximo de nomes guardados no cache em disco (nomes novos além disso não entram)
+LIMITE_CACHE_NOMES = 500_000
+
+_RE_PONTUACAO = re.compile(r'[^\w\s]')
+_RE_ESPACOS = re.compile(r'\s+')
+
+
 def limpar_texto_sujo(texto: str) -> str:
     """
     Remove caracteres de controle, lixo e corrige encoding incorreto.
@@ -60,6 +74,11 @@ def remover_acentos(texto: str) -> str:
     # Limpa antes de processar
     texto = limpar_texto_sujo(texto)
     
+    return _remover_combinantes(texto)
+
+
+def _remover_combinantes(texto: str) -> str:
+    """Decompõe (NFKD) e descarta os caracteres combinantes, sem limpeza prévia"""
     nfkd = unicodedata.normalize('NFKD', texto)
     return "".join([c for c in nfkd if not unicodedata.combining(c)])
 
@@ -84,14 +103,14 @@ def normalizar_nome(nome: str, remover_preposicoes: bool = False) -> str:
     # Converter para minúsculas
     nome = nome.lower().strip()
     
-    # Remover acentos
-    nome = remover_acentos(nome)
+    # Remover acentos (o texto já está limpo; limpar de novo não altera nada)
+    nome = _remover_combinantes(nome)
     
     # Remover pontuação
-    nome = re.sub(r'[^\w\s]', '', nome)
+    nome = _RE_PONTUACAO.sub('', nome)
     
     # Remover múltiplos espaços
-    nome = re.sub(r'\s+', ' ', nome)
+    nome = _RE_ESPACOS.sub(' ', nome)
     
     # Opcional: remover preposições
     if remover_preposicoes:
@@ -103,6 +122,116 @@ def normalizar_nome(nome: str, remover_preposicoes: bool = False) -> str:
     return nome.strip()
 
 
+def _carregar_cache_nomes(cache_path: Path) -> Dict[str, str]:
+    """Lê o cache de nomes normalizados; descarta se a versão das regras mudou"""
+    try:
+        with open(cache_path, 'r', encoding='utf-8') as f:
+            conteudo = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    
+    if conteudo.get('versao') != VERSAO_NORMALIZACAO_NOME:
+        return {}
+    return conteudo.get('nomes', {})
+
+
+def _salvar_cache_nomes(cache_path: Path, cache: Dict[str, str]) -> None:
+    """Grava o cache de forma atômica (arquivo temporário + rename)"""
+    cache_path.parent.mkdir(parents=True, exist_ok=True)
+    temporario = cache_path.with_suffix(cache_path.suffix + '.tmp')
+    with open(temporario, 'w', encoding='utf-8') as f:
+        json.dump({'versao': VERSAO_NORMALIZACAO_NOME, 'nomes': cache}, f, ensure_ascii=False)
+    os.replace(temporario, cache_path)
+
+
+class CacheNomes:
+    """
+    Cache de nomes normalizados, carregado uma vez e gravado quando pedido.
+    
+    Para processamento em blocos: o mesmo objeto é repassado a cada
+    chamada de normalizar_nomes_em_lote e salvar() roda uma vez no fim,
+    em vez de reler e regravar o arquivo inteiro a cada bloco. O cache
+    para de crescer ao atingir `limite` nomes.
+    
+    Uso:
+        cache = CacheNomes(CACHE_NOMES)
+        for bloco in blocos:
+            normalizar_nomes_em_lote(bloco['nome'], cache)
+        cache.salvar()
+    """
+    
+    def __init__(self, caminho: Union[str, Path], limite: int = LIMITE_CACHE_NOMES):
+        self.caminho = Path(caminho)
+        self.limite = limite
+        self.nomes = _carregar_cache_nomes(self.caminho)
+        self.novos = 0
+    
+    def adicionar(self, nome: str, normalizado: str) -> None:
+        """Guarda um nome novo, se ainda houver espaço"""
+        if len(self.nomes) < self.limite:
+            self.nomes[nome] = normalizado
+            self.novos += 1
+    
+    def salvar(self) -> None:
+        """Grava o cache se houver nomes novos desde a última gravação"""
+        if self.novos:
+            _salvar_cache_nomes(self.caminho, self.nomes)
+            self.novos = 0
+
+
+def normalizar_nomes_em_lote(
+    nomes: pd.Series,
+    cache_path: Union[str, CacheNomes, None] = None,
+    remover_preposicoes: bool = False
+) -> pd.Series:
+    """
+    Normaliza uma coluna inteira de nomes, processando cada valor distinto uma vez.
+    
+    A coluna é fatorizada, apenas os valores únicos passam por normalizar_nome
+    e o resultado é redistribuído pelos códigos. Nomes se repetem muito entre
+    ocorrências, então o custo passa a ser proporcional aos nomes distintos.
+    
+    Args:
+        nomes: Série com os nomes originais
+        cache_path: Arquivo JSON opcional com nomes já normalizados em execuções
+            anteriores (lido e atualizado nesta chamada), ou um CacheNomes já
+            carregado (atualizado em memória; quem o criou chama salvar())
+        remover_preposicoes: Repassado para normalizar_nome
+    
+    Returns:
+        Série com os nomes normalizados ('' para valores ausentes)
+    """
+    codigos, unicos = pd.factorize(nomes)
+    
+    # O cache só vale para a normalização padrão
+    if cache_path is None or remover_preposicoes:
+        cache = None
+    elif isinstance(cache_path, CacheNomes):
+        cache = cache_path
+    else:
+        cache = CacheNomes(cache_path)
+    conhecidos = cache.nomes if cache is not None else {}
+    
+    normalizados = []
+    for nome in unicos:
+        if isinstance(nome, str) and nome in conhecidos:
+            normalizados.append(conhecidos[nome])
+            continue
+        
+        normalizado = normalizar_nome(nome, remover_preposicoes)
+        normalizados.append(normalizado)
+        if cache is not None and isinstance(nome, str):
+            cache.adicionar(nome, normalizado)
+    
+    # Cache aberto nesta chamada: gravar agora
+    if cache is not None and cache is not cache_path:
+        cache.salvar()
+    
+    # Código -1 (valor ausente) aponta para o '' adicionado no final
+    tabela = np.array(normalizados + [''], dtype=object)
+    return pd.Series(tabela[codigos], index=nomes.index, name=nomes.name)
+
+
 def normalizar_sexo(sexo: str) -> str:
     """
     Normaliza o campo sexo.
@@ -123,6 +252,18 @@ def normalizar_sexo(sexo: str) -> str:
         return 'IGN'
 
 
+# Formatos aceitos por parse_data, na ordem em que são tentados, com a
+# expressão que identifica em lote os valores com o "formato" de cada um
+FORMATOS_DATA = {
+    '%d/%m/%Y': r'\d{1,2}/\d{1,2}/\d{4}',
+    '%d/%m/%Y %H:%M': r'\d{1,2}/\d{1,2}/\d{4} \d{1,2}:\d{1,2}',
+    '%d/%m/%Y %H:%M:%S': r'\d{1,2}/\d{1,2}/\d{4} \d{1,2}:\d{1,2}:\d{1,2}',
+    '%Y-%m-%d': r'\d{4}-\d{1,2}-\d{1,2}',
+    '%Y-%m-%d %H:%M:%S': r'\d{4}-\d{1,2}-\d{1,2} \d{1,2}:\d{1,2}:\d{1,2}',
+    '%d-%m-%Y': r'\d{1,2}-\d{1,2}-\d{4}',
+}
+
+
 def parse_data(data_str: str, formatos: Optional[list] = None) -> Optional[datetime]:
     """
     Tenta parsear uma data em diversos formatos.
@@ -138,14 +279,7 @@ def parse_data(data_str: str, formatos: Optional[list] = None) -> Optional[datet
         return None
     
     if formatos is None:
-        formatos = [
-            '%d/%m/%Y',
-            '%d/%m/%Y %H:%M',
-            '%d/%m/%Y %H:%M:%S',
-            '%Y-%m-%d',
-            '%Y-%m-%d %H:%M:%S',
-            '%d-%m-%Y',
-        ]
+        formatos = list(FORMATOS_DATA)
     
     for formato in formatos:
         try:
@@ -156,6 +290,97 @@ def parse_data(data_str: str, formatos: Optional[list] = None) -> Optional[datet
     return None
 
 
+def parse_datas_em_lote(
+    valores: pd.Series,
+    formatos: Optional[list] = None,
+    contagem: Optional[Dict[str, int]] = None
+) -> pd.Series:
+    """
+    Versão vetorizada de parse_data para uma coluna inteira.
+    
+    Cada valor distinto é classificado pelo "formato" (FORMATOS_DATA) e cada
+    grupo é convertido com uma única chamada a pd.to_datetime(format=...).
+    Valores fora dos grupos conhecidos, ou rejeitados por eles, caem em
+    parse_data, de modo que o resultado é o mesmo de aplicar parse_data
+    célula a célula.
+    
+    Única diferença, intencional: datas válidas para parse_data mas fora do
+    intervalo de datetime64[ns] (anos antes de 1677 ou depois de 2262, em
+    geral erros de digitação como '01/02/0020') viram NaT, porque a coluna
+    resultante não consegue representá-las; elas são contadas à parte em
+    'fora_intervalo'.
+    
+    Args:
+        valores: Série com as datas em texto
+        formatos: Lista de formatos a tentar (default: FORMATOS_DATA)
+        contagem: Dict opcional preenchido com o número de células por formato,
+            mais 'outros' (aceitas só pelo fallback), 'fora_intervalo',
+            'invalido' e 'ausente'
+    
+    Returns:
+        Série datetime64[ns] alinhada ao índice de entrada
+    """
+    if formatos is None:
+        formatos = list(FORMATOS_DATA)
+    
+    # Formatos resolvidos em grupo: os conhecidos até o primeiro desconhecido,
+    # para respeitar a ordem de tentativa de parse_data
+    formatos_grupo = []
+    for formato in formatos:
+        if formato not in FORMATOS_DATA:
+            break
+        formatos_grupo.append(formato)
+    
+    codigos, unicos = pd.factorize(valores)
+    unicos = pd.Series(unicos, dtype=object)
+    
+    datas = pd.Series(pd.NaT, index=unicos.index, dtype='datetime64[ns]')
+    origem = np.full(len(unicos), 'invalido', dtype=object)
+    eh_texto = unicos.map(lambda v: isinstance(v, str)).astype(bool)
+    origem[~eh_texto.to_numpy()] = 'ausente'
+    pendentes = eh_texto.copy()
+    
+    for formato in formatos_grupo:
+        no_grupo = pendentes & unicos.str.fullmatch(FORMATOS_DATA[formato], na=False)
+        if not no_grupo.any():
+            continue
+        
+        convertidas = pd.to_datetime(unicos[no_grupo], format=formato, errors='coerce')
+        convertidas = convertidas[convertidas.notna()]
+        datas[convertidas.index] = convertidas
+        origem[convertidas.index] = formato
+        pendentes[convertidas.index] = False
+    
+    # Fallback valor a valor (apenas distintos que nenhum grupo resolveu)
+    for i in pendentes.index[pendentes]:
+        data = parse_data(unicos[i], formatos)
+        if data is None:
+            continue
+        try:
+            data = pd.Timestamp(data)
+        except (ValueError, OverflowError):
+            origem[i] = 'fora_intervalo'
+            continue
+        # Fora do intervalo de datetime64[ns] (pandas >= 2 não recusa na criação)
+        if not pd.Timestamp.min <= data <= pd.Timestamp.max:
+            origem[i] = 'fora_intervalo'
+            continue
+        datas[i] = data
+        origem[i] = 'outros'
+    
+    if contagem is not None:
+        por_unico = np.bincount(codigos[codigos >= 0], minlength=len(unicos))
+        for rotulo, total in pd.Series(por_unico).groupby(origem).sum().items():
+            contagem[rotulo] = contagem.get(rotulo, 0) + int(total)
+        faltantes = int((codigos < 0).sum())
+        if faltantes:
+            contagem['ausente'] = contagem.get('ausente', 0) + faltantes
+    
+    # Código -1 (valor ausente) aponta para o NaT adicionado no final
+    tabela = np.append(datas.to_numpy(), np.datetime64('NaT', 'ns'))
+    return pd.Series(tabela[codigos], index=valores.index, name=valores.name)
+
+
 def calcular_idade(data_nascimento: datetime, data_referencia: Optional[datetime] = None) -> Optional[int]:
     """
     Calcula a idade com base na data de nascimento.
@@ -182,6 +407,46 @@ def calcular_idade(data_nascimento: datetime, data_referencia: Optional[datetime
     return idade if idade >= 0 else None
 
 
+def calcular_idades_em_lote(
+    nascimento: pd.Series,
+    referencia: Optional[pd.Series] = None,
+    data_padrao: Optional[datetime] = None
+) -> pd.Series:
+    """
+    Versão vetorizada de calcular_idade para colunas datetime64.
+    
+    Diferença de anos com ajuste de aniversário; onde não há data de
+    referência usa data_padrao (default: agora). Idades negativas e
+    nascimentos ausentes resultam em <NA>.
+    
+    Args:
+        nascimento: Datas de nascimento
+        referencia: Datas de referência alinhadas (opcional)
+        data_padrao: Referência usada quando a da linha está ausente
+    
+    Returns:
+        Série Int64 com as idades
+    """
+    nascimento = pd.to_datetime(nascimento, errors='coerce')
+    padrao = pd.Timestamp(data_padrao or datetime.now())
+    
+    if referencia is None:
+        referencia = pd.Series(padrao, index=nascimento.index)
+    else:
+        referencia = pd.to_datetime(referencia, errors='coerce').fillna(padrao)
+    
+    idade = referencia.dt.year - nascimento.dt.year
+    
+    # Ajustar se ainda não fez aniversário no ano
+    antes_aniversario = (
+        (referencia.dt.month < nascimento.dt.month) |
+        ((referencia.dt.month == nascimento.dt.month) & (referencia.dt.day < nascimento.dt.day))
+    )
+    idade = idade - antes_aniversario.astype(int)
+    
+    return idade.where(nascimento.notna() & (idade >= 0)).astype('Int64')
+
+
 def extrair_ano(data: datetime) -> Optional[int]:
     """Extrai o ano de uma data"""
     return data.year if data else None
@@ -232,6 +497,35 @@ def gerar_chave_fraca(nome_normalizado: str) -> Optional[str]:
     return nome_normalizado
 
 
+def gerar_hash_chave(chaves: pd.Series) -> pd.Series:
+    """
+    Codifica uma coluna de chaves de matching em inteiros de 64 bits.
+    
+    O hash é estável entre execuções (chave de hash fixa do pandas) e é
+    calculado uma única vez por valor distinto. Joins sobre a coluna uint64
+    são bem mais rápidos e leves que sobre as strings originais.
+    
+    Args:
+        chaves: Série com as chaves em texto (None/NaN quando ausente)
+    
+    Returns:
+        Série UInt64 com <NA> onde a chave está ausente
+    """
+    mascara = chaves.notna().to_numpy()
+    valores = np.zeros(len(chaves), dtype=np.uint64)
+    
+    if mascara.any():
+        valores[mascara] = pd.util.hash_pandas_object(
+            chaves[mascara], index=False, categorize=True
+        ).to_numpy()
+    
+    return pd.Series(
+        pd.arrays.IntegerArray(valores, ~mascara),
+        index=chaves.index,
+        name=f"{chaves.name}_hash" if chaves.name else None
+    )
+
+
 def limpar_texto(texto: str) -> str:
     """
     Limpa um texto removendo caracteres especiais e normalizando espaços.
@@ -0,0 +1,91 @@
+"""
+Execução concorrente das validações com IA.
+
+O Ollama atende requisições em paralelo (variável OLLAMA_NUM_PARALLEL no
+servidor), então os casos são enviados por um pool de threads em vez de um
+por vez. Os resultados voltam na ordem de entrada; o callback de conclusão
+roda sempre na thread principal, podendo atualizar DataFrames e arquivos
+sem travas.
+"""
+
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+
+def concorrencia_padrao() -> int:
+    """
+    Concorrência sugerida para o hardware atual.
+
+    Usa o batch_size do perfil de obter_config_otimizada; sem o detector
+    (psutil ausente, por exemplo) volta para 1 caso por vez.
+    """
+    try:
+        from detector_hardware import identificar_pc, obter_config_otimizada
+        return max(1, obter_config_otimizada(identificar_pc()).batch_size)
+    except Exception:
+        return 1
+
+
+def resultado_com_erro(erro: Exception) -> Dict:
+    """Resultado padrão para uma validação que levantou exceção"""
+    return {
+        'validado': False,
+        'mesma_pessoa': None,
+        'confianca': 0,
+        'justificativa': '',
+        'erro': str(erro)[:200]
+    }
+
+
+def validar_em_paralelo(
+    tarefas: Sequence[Any],
+    validar: Callable[[Any], Dict],
+    concorrencia: int = 1,
+    ao_concluir: Optional[Callable[[int, Any, Dict], None]] = None
+) -> List[Dict]:
+    """
+    Executa validar(tarefa) para cada tarefa com até `concorrencia` chamadas simultâneas.
+
+    Args:
+        tarefas: Itens a validar (ex.: tuplas (idx, caso))
+        validar: Função que recebe uma tarefa e devolve o dict de resultado
+        concorrencia: Número máximo de requisições simultâneas
+        ao_concluir: Callback (posição, tarefa, resultado) chamado na thread
+            principal assim que cada tarefa termina
+
+    Returns:
+        Lista de resultados na mesma ordem de `tarefas`
+    """
+    resultados: List[Optional[Dict]] = [None] * len(tarefas)
+
+    def concluir(posicao: int, resultado: Dict):
+        resultados[posicao] = resultado
+        if ao_concluir:
+            ao_concluir(posicao, tarefas[posicao], resultado)
+
+    if concorrencia <= 1:
+        for posicao, tarefa in enumerate(tarefas):
+            try:
+                resultado = validar(tarefa)
+            except Exception as e:
+                resultado = resultado_com_erro(e)
+            concluir(posicao, resultado)
+        return resultados
+
+    pool = ThreadPoolExecutor(max_workers=concorrencia)
+    try:
+        futuros = {pool.submit(validar, tarefa): posicao for posicao, tarefa in enumerate(tarefas)}
+
+        for futuro in as_completed(futuros):
+            try:
+                resultado = futuro.result()
+            except Exception as e:
+                resultado = resultado_com_erro(e)
+            concluir(futuros[futuro], resultado)
+    except BaseException:
+        # Ctrl+C: não esperar a fila inteira terminar
+        pool.shutdown(wait=False, cancel_futures=True)
+        raise
+
+    pool.shutdown(wait=True)
+    return resultados
@@ -1,9 +1,79 @@
 """Detector de transtornos psiquiátricos em textos narrativos"""
-import re
+import os
+from concurrent.futures import ProcessPoolExecutor
 from typing import Dict, List, Optional, Tuple, Any
+import numpy as np
 import pandas as pd
 from config.config import PSYCHIATRIC_KEYWORDS
-from utils.normalization import remover_acentos, limpar_texto
+from utils.normalization import limpar_texto, _remover_combinantes
+from utils.aho_corasick import AutomatoPalavras
+
+
+# Versão da lógica de detecção: incrementar ao mudá-la (invalida o cache de estágios)
+VERSAO_DETECTOR = 1
+
+# Termos que indicam diagnóstico específico (busca por substring no texto sem acentos)
+TERMOS_ALTA_CONFIANCA = [
+    'esquizofrenia', 'bipolar', 'psicose', 'internacao psiquiatrica',
+    'hospital psiquiatrico', 'transtorno mental', 'tratamento psiquiatrico'
+]
+
+# Medicamentos que elevam a confiança para 'media'
+MEDICAMENTOS_CONFIANCA = ['rivotril', 'haldol', 'olanzapina', 'risperidona',
+                          'quetiapina', 'clozapina', 'fluoxetina', 'sertralina']
+
+# Categoria -> trechos (sem acento) que, contidos na keyword, a classificam
+CATEGORIAS_TRANSTORNO = {
+    'esquizofrenia': ['esquizofrenia'],
+    'transtorno bipolar': ['bipolar', 'transtorno bipolar'],
+    'depressão': ['depressao', 'depressivo'],
+    'ansiedade': ['ansiedade', 'transtorno de ansiedade', 'ansiolitico'],
+    'psicose': ['psicose', 'psicotico', 'surto psicotico', 'crise psicotica'],
+    'comportamento suicida': ['tentativa de suicidio', 'ideacao suicida'],
+    'transtorno mental geral': ['transtorno mental', 'doenca mental',
+                               'problema psiquiatrico', 'disturbio mental'],
+}
+
+_KEYWORD = 0
+_ALTA_CONFIANCA = 1
+_MEDICAMENTO = 2
+
+
+class _TabelaDobra(dict):
+    """
+    Tabela de str.translate: minúsculas sem acento, um caractere por caractere.
+
+    Preserva o comprimento do texto, então as posições encontradas no texto
+    dobrado valem para o texto original. Caracteres cuja forma sem acento
+    teria outro tamanho (ligaduras, combinantes soltos) ficam como estão.
+    """
+
+    def __missing__(self, codigo: int) -> str:
+        caractere = chr(codigo)
+        dobrado = _remover_combinantes(caractere.lower())
+        valor = dobrado if len(dobrado) == 1 else caractere
+        self[codigo] = valor
+        return valor
+
+
+_TABELA_DOBRA = _TabelaDobra()
+
+
+def dobrar_texto(texto: str) -> str:
+    """Minúsculas e sem acentos, com o mesmo comprimento do original"""
+    return texto.translate(_TABELA_DOBRA)
+
+
+def _eh_palavra(caractere: str) -> bool:
+    """Mesma definição de \\w do módulo re para str"""
+    return caractere.isalnum() or caractere == '_'
+
+
+def _eh_fronteira(texto: str, posicao: int) -> bool:
+    """Equivalente a \\b na posição dada"""
+    antes = posicao > 0 and _eh_palavra(texto[posicao - 1])
+    depois = posicao < len(texto) and _eh_palavra(texto[posicao])
+    return antes != depois
 
 
 class PsychiatricDetector:
@@ -20,27 +90,34 @@ class PsychiatricDetector:
         self._prepare_patterns()
     
     def _prepare_patterns(self):
-        """Prepara os padrões regex para busca"""
-        # Criar padrões com e sem acentos
-        self.patterns = []
+        """Monta o autômato com keywords, termos de alta confiança e medicamentos"""
+        self.automato = AutomatoPalavras()
         for keyword in self.keywords:
-            # Versão original
-            pattern = re.compile(r'\b' + re.escape(keyword) + r'\b', re.IGNORECASE)
-            self.patterns.append((keyword, pattern))
-            
-            # Versão sem acentos
-            keyword_sem_acento = remover_acentos(keyword)
-            if keyword_sem_acento != keyword:
-                pattern_sem_acento = re.compile(
-                    r'\b' + re.escape(keyword_sem_acento) + r'\b', 
-                    re.IGNORECASE
-                )
-                self.patterns.append((keyword, pattern_sem_acento))
+            self.automato.adicionar(dobrar_texto(keyword), (_KEYWORD, keyword))
+        for termo in TERMOS_ALTA_CONFIANCA:
+            self.automato.adicionar(termo, (_ALTA_CONFIANCA, termo))
+        for medicamento in MEDICAMENTOS_CONFIANCA:
+            self.automato.adicionar(medicamento, (_MEDICAMENTO, medicamento))
+        self.automato.construir()
+        
+        # Categorias de cada keyword, calculadas uma única vez
+        self.categorias_keyword = {}
+        for keyword in self.keywords:
+            keyword_norm = dobrar_texto(keyword)
+            self.categorias_keyword[keyword] = frozenset(
+                categoria for categoria, trechos in CATEGORIAS_TRANSTORNO.items()
+                if any(trecho in keyword_norm for trecho in trechos)
+            )
     
     def detectar(self, texto: str) -> Dict[str, Any]:
         """
         Detecta transtornos psiquiátricos em um texto.
         
+        O texto é dobrado (minúsculas, sem acentos) e percorrido uma única vez
+        pelo autômato. Keywords exigem fronteira de palavra (\\b) nas duas
+        pontas, verificada no texto original; termos de confiança valem como
+        substring.
+        
         Args:
             texto: Texto a analisar
         
@@ -61,20 +138,33 @@ class PsychiatricDetector:
         
         # Limpar o texto de caracteres inválidos (limpar_texto já chama limpar_texto_sujo)
         texto_limpo = limpar_texto(texto)
-        texto_normalizado = remover_acentos(texto_limpo.lower())
         
         # Buscar matches
         matches = []
-        evidencias = set()
+        evidencias = {}  # dict como conjunto ordenado: trechos na ordem do texto
+        fim_anterior = {}
+        tem_termo_alta = False
+        tem_medicamento = False
         
-        for keyword, pattern in self.patterns:
-            for match in pattern.finditer(texto_limpo):
-                matches.append(keyword)
-                # Extrair contexto ao redor (50 caracteres antes e depois)
-                start = max(0, match.start() - 50)
-                end = min(len(texto_limpo), match.end() + 50)
-                evidencia = texto_limpo[start:end].strip()
-                evidencias.add(evidencia)
+        for inicio, fim, (tipo, termo) in self.automato.buscar(dobrar_texto(texto_limpo)):
+            if tipo == _ALTA_CONFIANCA:
+                tem_termo_alta = True
+                continue
+            if tipo == _MEDICAMENTO:
+                tem_medicamento = True
+                continue
+            
+            if not (_eh_fronteira(texto_limpo, inicio) and _eh_fronteira(texto_limpo, fim)):
+                continue
+            # Ocorrências da mesma keyword não se sobrepõem (como em finditer)
+            if inicio < fim_anterior.get(termo, 0):
+                continue
+            fim_anterior[termo] = fim
+            
+            matches.append(termo)
+            # Extrair contexto ao redor (50 caracteres antes e depois)
+            evidencia = texto_limpo[max(0, inicio - 50):fim + 50].strip()
+            evidencias[evidencia] = None
         
         # Se não encontrou nada
         if not matches:
@@ -86,7 +176,7 @@ class PsychiatricDetector:
             }
         
         # Classificar confiança
-        confianca = self._calcular_confianca(matches, texto_normalizado)
+        confianca = self._calcular_confianca(matches, tem_termo_alta, tem_medicamento)
         
         # Extrair tipos de transtorno
         tipos = self._extrair_tipos(matches)
@@ -98,40 +188,30 @@ class PsychiatricDetector:
             'confianca': confianca
         }
     
-    def _calcular_confianca(self, matches: List[str], texto_normalizado: str) -> str:
+    def _calcular_confianca(self, matches: List[str], tem_termo_alta: bool,
+                            tem_medicamento: bool) -> str:
         """
         Calcula o nível de confiança baseado nos matches.
         
         Args:
             matches: Lista de keywords encontradas
-            texto_normalizado: Texto normalizado
+            tem_termo_alta: Texto contém algum de TERMOS_ALTA_CONFIANCA
+            tem_medicamento: Texto contém algum de MEDICAMENTOS_CONFIANCA
         
         Returns:
             'alta', 'media' ou 'baixa'
         """
-        # Confiança alta: múltiplas menções ou termos específicos
-        termos_alta_confianca = [
-            'esquizofrenia', 'bipolar', 'psicose', 'internacao psiquiatrica',
-            'hospital psiquiatrico', 'transtorno mental', 'tratamento psiquiatrico'
-        ]
-        
-        matches_unicos = set(remover_acentos(m.lower()) for m in matches)
-        
         # Alta: menção a diagnóstico específico
-        for termo in termos_alta_confianca:
-            if termo in texto_normalizado:
-                return 'alta'
+        if tem_termo_alta:
+            return 'alta'
+        
+        matches_unicos = set(dobrar_texto(m) for m in matches)
         
         # Alta: múltiplas menções (3+)
         if len(matches_unicos) >= 3:
             return 'alta'
         
         # Média: 2 menções ou menção a medicamento específico
-        medicamentos = ['rivotril', 'haldol', 'olanzapina', 'risperidona', 
-                       'quetiapina', 'clozapina', 'fluoxetina', 'sertralina']
-        
-        tem_medicamento = any(med in texto_normalizado for med in medicamentos)
-        
         if len(matches_unicos) >= 2 or tem_medicamento:
             return 'media'
         
@@ -149,54 +229,163 @@ class PsychiatricDetector:
             Lista de tipos de transtorno (únicos e categorizados)
         """
         tipos = set()
-        
-        # Mapear keywords para categorias
-        categorias = {
-            'esquizofrenia': ['esquizofrenia'],
-            'transtorno bipolar': ['bipolar', 'transtorno bipolar'],
-            'depressão': ['depressao', 'depressivo'],
-            'ansiedade': ['ansiedade', 'transtorno de ansiedade', 'ansiolitico'],
-            'psicose': ['psicose', 'psicotico', 'surto psicotico', 'crise psicotica'],
-            'comportamento suicida': ['tentativa de suicidio', 'ideacao suicida'],
-            'transtorno mental geral': ['transtorno mental', 'doenca mental', 
-                                       'problema psiquiatrico', 'disturbio mental'],
-        }
-        
-        matches_norm = [remover_acentos(m.lower()) for m in matches]
-        
-        for categoria, keywords in categorias.items():
-            for keyword in keywords:
-                if any(keyword in match for match in matches_norm):
-                    tipos.add(categoria)
-                    break
+        for keyword in set(matches):
+            tipos.update(self.categorias_keyword[keyword])
         
         # Se não categorizou nada específico, usar "transtorno mental"
         if not tipos:
             tipos.add('transtorno mental')
         
-        return sorted(list(tipos))
+        return sorted(tipos)
+    
+    def detectar_lote(self, textos) -> Tuple[np.ndarray, list, list, list]:
+        """
+        Detecta transtornos em uma sequência de textos.
+        
+        Returns:
+            Tupla (tem_transtorno, tipo, evidencia, confianca): array bool e três listas
+        """
+        tem, tipos, evidencias, confiancas = [], [], [], []
+        for texto in textos:
+            resultado = self.detectar(texto)
+            tem.append(resultado['tem_transtorno_psiquiatrico'])
+            tipos.append(resultado['tipo_transtorno'])
+            evidencias.append(resultado['evidencia_transtorno'])
+            confiancas.append(resultado['confianca'])
+        return np.array(tem, dtype=bool), tipos, evidencias, confiancas
+    
+    def criar_pool(self, n_jobs: int = -1) -> Optional[ProcessPoolExecutor]:
+        """
+        Cria um pool de processos com o detector já montado em cada processo.
+        
+        Permite reaproveitar o mesmo pool em várias chamadas de
+        processar_dataframe (ex.: um pool para todos os blocos do streaming).
+        Quem cria o pool é responsável por encerrá-lo (shutdown ou with).
+        
+        Args:
+            n_jobs: Número de processos (-1 = todos os núcleos)
+        
+        Returns:
+            ProcessPoolExecutor, ou None se n_jobs resultar em um único processo
+        """
+        n_jobs = _resolver_n_jobs(n_jobs)
+        if n_jobs <= 1:
+            return None
+        return ProcessPoolExecutor(
+            max_workers=n_jobs,
+            initializer=_inicializar_worker,
+            initargs=(self.keywords,)
+        )
     
-    def processar_dataframe(self, df: pd.DataFrame, coluna_texto: str = 'historico') -> pd.DataFrame:
+    def processar_dataframe(
+        self,
+        df: pd.DataFrame,
+        coluna_texto: str = 'historico',
+        n_jobs: int = 1,
+        chunksize: Optional[int] = None,
+        pool: Optional[ProcessPoolExecutor] = None
+    ) -> pd.DataFrame:
         """
         Processa um DataFrame inteiro, detectando transtornos.
         
+        Com n_jobs > 1 (ou um pool recebido) a coluna de texto é dividida em
+        blocos processados por um pool de processos; cada processo monta o
+        detector uma única vez. Abaixo de MIN_TEXTOS_PARALELO textos a
+        detecção roda no próprio processo, já que subir o pool custa mais
+        que o ganho.
+        
         Args:
             df: DataFrame com os dados
             coluna_texto: Nome da coluna com o texto narrativo
+            n_jobs: Número de processos (1 = sem paralelismo, -1 = todos os núcleos)
+            chunksize: Textos por bloco (default: calcular_chunksize)
+            pool: Pool criado por criar_pool, reaproveitado entre chamadas
+                (sem ele, um pool é criado e encerrado nesta chamada)
         
         Returns:
             DataFrame com novas colunas adicionadas
         """
-        resultados = df[coluna_texto].apply(self.detectar)
+        textos = df[coluna_texto].tolist()
+        n_jobs = _resolver_n_jobs(n_jobs)
+        if chunksize is None:
+            chunksize = calcular_chunksize(len(textos), n_jobs)
+        
+        paralelo = (pool is not None or n_jobs > 1) and len(textos) >= MIN_TEXTOS_PARALELO
+        if not paralelo or len(textos) <= chunksize:
+            tem, tipos, evidencias, confiancas = self.detectar_lote(textos)
+        else:
+            blocos = [textos[i:i + chunksize] for i in range(0, len(textos), chunksize)]
+            tem, tipos, evidencias, confiancas = [], [], [], []
+            
+            pool_proprio = None
+            if pool is None:
+                pool = pool_proprio = self.criar_pool(min(n_jobs, len(blocos)))
+            try:
+                for resultado in pool.map(_detectar_bloco, blocos):
+                    tem.append(resultado[0])
+                    tipos.extend(resultado[1])
+                    evidencias.extend(resultado[2])
+                    confiancas.extend(resultado[3])
+            finally:
+                if pool_proprio is not None:
+                    pool_proprio.shutdown()
+            
+            tem = np.concatenate(tem)
         
-        df['tem_transtorno_psiquiatrico'] = resultados.apply(lambda x: x['tem_transtorno_psiquiatrico'])
-        df['tipo_transtorno'] = resultados.apply(lambda x: x['tipo_transtorno'])
-        df['evidencia_transtorno'] = resultados.apply(lambda x: x['evidencia_transtorno'])
-        df['confianca_transtorno'] = resultados.apply(lambda x: x['confianca'])
+        df['tem_transtorno_psiquiatrico'] = tem
+        df['tipo_transtorno'] = pd.array(tipos, dtype=object)
+        df['evidencia_transtorno'] = pd.array(evidencias, dtype=object)
+        df['confianca_transtorno'] = pd.Categorical(confiancas, categories=NIVEIS_CONFIANCA)
         
         return df
 
 
+# Níveis possíveis de confiança_transtorno
+NIVEIS_CONFIANCA = ['alta', 'media', 'baixa', 'inconclusivo']
+
+# Abaixo deste número de textos a detecção não usa processos
+MIN_TEXTOS_PARALELO = 20_000
+
+# Limites do tamanho de bloco no modo paralelo
+CHUNKSIZE_MIN = 1_000
+CHUNKSIZE_MAX = 50_000
+
+
+def _resolver_n_jobs(n_jobs: int) -> int:
+    """Converte n_jobs (-1 = todos os núcleos) em número de processos"""
+    if n_jobs is None or n_jobs == 0:
+        return 1
+    if n_jobs < 0:
+        return max(1, (os.cpu_count() or 1) + 1 + n_jobs)
+    return n_jobs
+
+
+def calcular_chunksize(n_textos: int, n_jobs: int) -> int:
+    """
+    Tamanho de bloco para o modo paralelo.
+    
+    Mira ~4 blocos por processo (equilibra a carga quando os textos têm
+    tamanhos muito diferentes), limitado entre CHUNKSIZE_MIN, que amortiza
+    o custo de serializar cada bloco, e CHUNKSIZE_MAX, que limita a memória
+    de cada resultado em trânsito.
+    """
+    alvo = -(-n_textos // (max(1, n_jobs) * 4))
+    return int(min(CHUNKSIZE_MAX, max(CHUNKSIZE_MIN, alvo)))
+
+
+# Detector de cada processo do pool (montado uma vez em _inicializar_worker)
+_detector_worker: Optional[PsychiatricDetector] = None
+
+
+def _inicializar_worker(keywords: List[str]) -> None:
+    global _detector_worker
+    _detector_worker = PsychiatricDetector(keywords)
+
+
+def _detectar_bloco(textos: list):
+    return _detector_worker.detectar_lote(textos)
+
+
 # Função standalone para uso direto
 def detectar_transtorno(texto: str) -> Dict[str, Any]:
     """
@@ -0,0 +1,84 @@
+"""
+Similaridade entre nomes para o matching aproximado (fuzzy).
+
+A medida é a razão de indel: 2 x LCS / (len(a) + len(b)), onde LCS é a
+maior subsequência comum. Ela penaliza proporcionalmente letras faltando,
+sobrando ou trocadas; em nomes completos longos é bem mais seletiva que
+Jaro-Winkler, cujo bônus de prefixo aproxima nomes que só compartilham o
+primeiro nome.
+
+Se o pacote rapidfuzz estiver instalado, o cálculo em lote usa a
+implementação em C; caso contrário, a implementação em Python abaixo
+(LCS bit-paralelo, mesmo resultado).
+"""
+
+from typing import Sequence
+
+import numpy as np
+
+try:
+    from rapidfuzz.distance import Indel
+    from rapidfuzz.process import cpdist
+    RAPIDFUZZ_DISPONIVEL = True
+except ImportError:
+    RAPIDFUZZ_DISPONIVEL = False
+
+
+def tamanho_lcs(a: str, b: str) -> int:
+    """
+    Tamanho da maior subsequência comum, com um inteiro como vetor de bits.
+
+    Cada bit de `linha` corresponde a uma posição de `a`; cada caractere de
+    `b` atualiza todos os bits com uma soma e operações lógicas (Hyyrö).
+    """
+    if not a or not b:
+        return 0
+    mascaras = {}
+    for posicao, caractere in enumerate(a):
+        mascaras[caractere] = mascaras.get(caractere, 0) | (1 << posicao)
+
+    todos = (1 << len(a)) - 1
+    linha = todos
+    for caractere in b:
+        casados = linha & mascaras.get(caractere, 0)
+        linha = ((linha + casados) | (linha - casados)) & todos
+    return len(a) - bin(linha).count('1')
+
+
+def similaridade_indel(a: str, b: str) -> float:
+    """
+    Razão de indel entre dois textos.
+
+    Returns:
+        Similaridade entre 0.0 e 1.0 (1.0 para textos iguais)
+    """
+    total = len(a) + len(b)
+    if not total:
+        return 1.0
+    return 2 * tamanho_lcs(a, b) / total
+
+
+def similaridade_nomes_em_lote(nomes_a: Sequence[str], nomes_b: Sequence[str]) -> np.ndarray:
+    """
+    Similaridade par a par (nomes_a[i] x nomes_b[i]).
+
+    Args:
+        nomes_a, nomes_b: Nomes normalizados, alinhados por posição
+
+    Returns:
+        Array float64 com valores entre 0.0 e 1.0
+    """
+    if len(nomes_a) != len(nomes_b):
+        raise ValueError("nomes_a e nomes_b precisam ter o mesmo tamanho")
+    if not len(nomes_a):
+        return np.empty(0, dtype=np.float64)
+
+    if RAPIDFUZZ_DISPONIVEL:
+        return cpdist(
+            list(nomes_a), list(nomes_b),
+            scorer=Indel.normalized_similarity, dtype=np.float64
+        )
+    return np.fromiter(
+        (similaridade_indel(a, b) for a, b in zip(nomes_a, nomes_b)),
+        dtype=np.float64, count=len(nomes_a)
+    )
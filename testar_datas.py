@@ -0,0 +1,124 @@
+"""
+Script de teste do parse de datas em lote.
+
+Compara parse_datas_em_lote com parse_data aplicado célula a célula em um
+conjunto de referência com formatos misturados, horários, datas inválidas,
+anos fora do intervalo de datetime64[ns] e valores ausentes.
+"""
+
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent / 'correlation-project'))
+
+import numpy as np
+import pandas as pd
+from utils.instrumentacao import Instrumentacao
+from utils.normalization import parse_data, parse_datas_em_lote
+from etl.padronizacao import pipeline_padronizacao_completa
+
+
+# Valor -> formato esperado na contagem de parse_datas_em_lote
+REFERENCIA = {
+    '15/03/1990': '%d/%m/%Y',
+    '1/2/2001': '%d/%m/%Y',
+    '15/03/1990 14:30': '%d/%m/%Y %H:%M',
+    '15/03/1990 14:30:59': '%d/%m/%Y %H:%M:%S',
+    '1990-03-15': '%Y-%m-%d',
+    '1990-03-15 08:05:00': '%Y-%m-%d %H:%M:%S',
+    '15-03-1990': '%d-%m-%Y',
+    '29/02/2000': '%d/%m/%Y',
+    # Rejeitadas por todos os formatos
+    '31/02/2020': 'invalido',
+    '29/02/2019': 'invalido',
+    '15/13/1990': 'invalido',
+    '1990-02-30': 'invalido',
+    '15/03/1990 25:00': 'invalido',
+    '15.03.1990': 'invalido',
+    '15/03/90': 'invalido',
+    'ignorado': 'invalido',
+    '': 'invalido',
+    ' 15/03/1990': 'invalido',
+    # Aceitas por parse_data, mas fora do intervalo de datetime64[ns]
+    '01/02/0020': 'fora_intervalo',
+    '01/01/1500': 'fora_intervalo',
+    '31/12/9999': 'fora_intervalo',
+    # Limites do intervalo representável
+    '22/09/1677': '%d/%m/%Y',
+    '11/04/2262': '%d/%m/%Y',
+}
+
+FORA_INTERVALO = {v for v, f in REFERENCIA.items() if f == 'fora_intervalo'}
+
+
+def _esperado(valor):
+    """parse_data célula a célula, com NaT onde datetime64[ns] não representa a data"""
+    data = parse_data(valor)
+    if data is None or valor in FORA_INTERVALO:
+        return pd.NaT
+    return pd.Timestamp(data)
+
+
+def testar_datas():
+    print("=" * 60)
+    print("TESTE DO PARSE DE DATAS EM LOTE")
+    print("=" * 60)
+
+    # Valores repetidos e ausentes de vários tipos, em ordem embaralhada
+    valores = list(REFERENCIA) * 3 + [None, np.nan, 19900315, pd.NA]
+    valores = pd.Series(valores, dtype=object).sample(frac=1, random_state=7)
+
+    contagem = {}
+    lote = parse_datas_em_lote(valores, contagem=contagem)
+
+    print("\n1. LOTE x PARSE_DATA CÉLULA A CÉLULA:")
+    print("-" * 60)
+    assert lote.dtype == 'datetime64[ns]' and lote.index.equals(valores.index)
+    esperado = pd.Series([_esperado(v) for v in valores], index=valores.index,
+                         dtype='datetime64[ns]')
+    diferentes = valores[~((lote == esperado) | (lote.isna() & esperado.isna()))]
+    assert diferentes.empty, diferentes.tolist()
+    print(f"   [OK] {len(valores)} valores com o mesmo resultado")
+
+    print("\n2. ANOS FORA DO INTERVALO DE DATETIME64[NS]:")
+    print("-" * 60)
+    for valor in sorted(FORA_INTERVALO):
+        assert parse_data(valor) is not None and pd.isna(lote[valores == valor]).all(), valor
+    print(f"   [OK] {sorted(FORA_INTERVALO)}: datas para parse_data, NaT no lote")
+
+    print("\n3. CONTAGEM POR FORMATO:")
+    print("-" * 60)
+    esperada = {}
+    for formato in REFERENCIA.values():
+        esperada[formato] = esperada.get(formato, 0) + 3
+    # 19900315 (int) não é texto: conta como ausente, junto de None/NaN/NA
+    esperada['ausente'] = 4
+    assert contagem == esperada, (contagem, esperada)
+    print(f"   [OK] {contagem}")
+
+    print("\n4. CONTAGEM NA INSTRUMENTAÇÃO DA PADRONIZAÇÃO:")
+    print("-" * 60)
+    bruto = pd.DataFrame({
+        'Nome envolvido': ['JOAO DA SILVA', 'MARIA SOUZA', 'PEDRO SANTOS'],
+        'Nascimento': ['15/03/1990', '1990-03-15', '01/02/0020'],
+        'Data Início do Fato': ['01/01/2020 10:00', None, '31/02/2020'],
+    })
+    instrumentacao = Instrumentacao('teste_datas')
+    pipeline_padronizacao_completa(bruto, instrumentacao=instrumentacao)
+    medicao = next(m for m in instrumentacao.etapas if m.nome == 'campos_pessoa')
+    formatos = medicao.extras['formatos_data']
+    assert formatos['data_nascimento'] == {
+        '%d/%m/%Y': 1, '%Y-%m-%d': 1, 'fora_intervalo': 1
+    }, formatos
+    assert formatos['data_fato'] == {
+        '%d/%m/%Y %H:%M': 1, 'invalido': 1, 'ausente': 1
+    }, formatos
+    print(f"   [OK] {formatos}")
+
+    print("\n" + "=" * 60)
+    print("TESTE CONCLUÍDO COM SUCESSO!")
+    print("=" * 60)
+
+
+if __name__ == "__main__":
+    testar_datas()
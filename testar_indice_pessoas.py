@@ -0,0 +1,157 @@
+"""
+Script de teste do índice de pessoas (carga incremental).
+
+Carrega duas exportações no índice e compara os grupos de pessoa com os de
+uma reconstrução a partir da exportação completa. A segunda carga traz um
+registro que liga dois grupos já existentes (fusão).
+"""
+
+import os
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent / 'correlation-project'))
+
+import pandas as pd
+import etl.pipeline
+from etl.indice_pessoas import IndicePessoas
+from etl.pipeline import pipeline_incremental
+
+
+def _linha(nome, nascimento, mae, sexo='Masculino', codigo=None):
+    # Sem 'Data Início do Fato': a idade é calculada em relação à data corrente
+    return {
+        'Cd.Envolvido': codigo,
+        'Nome envolvido': nome,
+        'Mãe do envolvido': mae,
+        'Nascimento': nascimento,
+        'Sexo Padronizado': sexo,
+        'Natureza': 'DESAPARECIMENTO DE PESSOA',
+    }
+
+
+# A e B são a mesma pessoa, mas não se ligam entre si: nomes distintos demais
+# para o fuzzy e códigos fonéticos diferentes (SOUZA x ROUSA)
+LOTE_1 = [
+    _linha('LUIZ FERNANDO SOUZA', '10/05/1990', 'ANA SOUZA'),        # A
+    _linha('LUIS FERNANDO ROUSA', '11/05/1990', 'ANA ROUSA'),        # B
+    _linha('MARIA DAS DORES LIMA', '01/02/1975', 'JOANA LIMA', 'Feminino'),
+    _linha('MARIA DAS DORES LIMA', '01/02/1975', 'JOANA LIMA', 'Feminino'),
+    _linha('PEDRO HENRIQUE ALVES', '20/09/2001', 'CLARA ALVES'),
+]
+
+# C liga A (mesmo código fonético e ano) e B (fuzzy, uma letra de diferença)
+LOTE_2 = [
+    _linha('LUIS FERNANDO SOUSA', '12/05/1990', 'ANA SOUSA'),        # C
+    _linha('PEDRO HENRIQUE ALVES', '20/09/2001', 'CLARA ALVES'),     # já vista no lote 1
+    _linha('JOSE CARLOS PEREIRA', '03/03/1960', 'RITA PEREIRA'),
+    _linha('ANTONIO MARCOS REIS', '15/08/1982', 'LUCIA REIS', codigo=987654),
+]
+
+
+def _gravar_csv(linhas, caminho):
+    pd.DataFrame(linhas).to_csv(caminho, sep=';', encoding='latin-1', index=False)
+
+
+def _grupos(caminho_indice):
+    """Partição dos registros em pessoas, independente da numeração de pessoa_id"""
+    with IndicePessoas(caminho_indice) as indice:
+        pessoas = indice.pessoas()
+    return {frozenset(ids) for _, ids in pessoas.groupby('pessoa_id')['id_unico']}
+
+
+def _ids_em_outro_processo(caminho_csv, semente, hoje='2026-01-15'):
+    """
+    (id_unico, idade_calculada) gerados por um processo Python novo, com
+    PYTHONHASHSEED fixa e a data corrente (datetime.now) trocada por `hoje`.
+    """
+    codigo = (
+        "import sys; sys.path.insert(0, sys.argv[1]);"
+        "import pandas as pd; from datetime import datetime;"
+        "import utils.normalization as normalizacao;"
+        "hoje = datetime.fromisoformat(sys.argv[3]);"
+        "normalizacao.datetime = type('Hoje', (datetime,), {'now': classmethod(lambda cls: hoje)});"
+        "from etl.padronizacao import pipeline_padronizacao_completa;"
+        "df = pipeline_padronizacao_completa(pd.read_csv(sys.argv[2], sep=';', encoding='latin-1'));"
+        "print('\\n'.join(f'{i};{a}' for i, a in zip(df['id_unico'], df['idade_calculada'])))"
+    )
+    saida = subprocess.run(
+        [sys.executable, '-c', codigo, str(Path(__file__).parent / 'correlation-project'),
+         str(caminho_csv), hoje],
+        capture_output=True, text=True, check=True,
+        env={**os.environ, 'PYTHONHASHSEED': str(semente)}
+    ).stdout
+    linhas = [linha.split(';') for linha in saida.splitlines() if linha.startswith('REG_')]
+    return [i for i, _ in linhas], [a for _, a in linhas]
+
+
+def testar_indice_pessoas():
+    print("=" * 60)
+    print("TESTE DO ÍNDICE DE PESSOAS (CARGA INCREMENTAL)")
+    print("=" * 60)
+
+    with tempfile.TemporaryDirectory() as pasta:
+        pasta = Path(pasta)
+        exportacao_1 = pasta / 'exportacao_1.csv'
+        exportacao_2 = pasta / 'exportacao_2.csv'
+        # Cada exportação traz o histórico inteiro
+        _gravar_csv(LOTE_1, exportacao_1)
+        _gravar_csv(LOTE_1 + LOTE_2, exportacao_2)
+
+        incremental = pasta / 'incremental.sqlite'
+        completo = pasta / 'completo.sqlite'
+        # Cache de nomes e relatórios de execução também ficam na pasta temporária
+        etl.pipeline.CACHE_NOMES = pasta / 'nomes_normalizados.json'
+        etl.pipeline.RELATORIOS_DIR = pasta / 'relatorios'
+
+        print("\n1. CARGAS INCREMENTAIS:")
+        print("-" * 60)
+        carga_1 = pipeline_incremental(str(exportacao_1), caminho_indice=str(incremental))
+        grupos_1 = _grupos(incremental)
+        assert carga_1['linhas_novas'] == len(LOTE_1) - 1, carga_1['linhas_novas']
+        assert len(grupos_1) == 4, grupos_1
+
+        carga_2 = pipeline_incremental(str(exportacao_2), caminho_indice=str(incremental))
+        assert carga_2['linhas_novas'] == len(LOTE_2) - 1, carga_2['linhas_novas']
+        assert carga_2['fusoes'] == 1, carga_2['fusoes']
+        print(f"   [OK] Linhas novas: {carga_1['linhas_novas']} + {carga_2['linhas_novas']}; "
+              f"fusões na segunda carga: {carga_2['fusoes']}")
+
+        print("\n2. FUSÃO DE GRUPOS EXISTENTES:")
+        print("-" * 60)
+        grupos_2 = _grupos(incremental)
+        fundido = [g for g in grupos_2 if len(g) == 3]
+        antigos = [g for g in grupos_1 if len(g) == 1 and g <= fundido[0]] if fundido else []
+        assert len(fundido) == 1 and len(antigos) == 2, grupos_2
+        print("   [OK] A e B (grupos distintos na primeira carga) agora são a mesma pessoa")
+
+        print("\n3. INCREMENTAL x RECONSTRUÇÃO:")
+        print("-" * 60)
+        pipeline_incremental(str(exportacao_2), caminho_indice=str(completo), reconstruir=True)
+        grupos_completo = _grupos(completo)
+        assert grupos_2 == grupos_completo, (grupos_2 ^ grupos_completo)
+        print(f"   [OK] {len(grupos_2)} pessoas, mesmos grupos nos dois índices")
+
+        print("\n4. ID_UNICO ESTÁVEL (CHAVE PRIMÁRIA DO ÍNDICE):")
+        print("-" * 60)
+        ids_1, idades_1 = _ids_em_outro_processo(exportacao_2, 1)
+        ids_2, _ = _ids_em_outro_processo(exportacao_2, 2)
+        assert ids_1 == ids_2 and len(ids_1) == len(LOTE_1 + LOTE_2), (ids_1, ids_2)
+        assert len(set(ids_1)) == len(ids_1) and 'REG_987654' in ids_1, ids_1
+        print(f"   [OK] {len(ids_1)} IDs únicos e iguais com PYTHONHASHSEED diferente")
+
+        # Sem data do fato, a idade muda com a data corrente; o ID não pode mudar
+        ids_3, idades_3 = _ids_em_outro_processo(exportacao_2, 1, hoje='2027-06-01')
+        assert idades_3 != idades_1, (idades_1, idades_3)
+        assert ids_3 == ids_1, (ids_1, ids_3)
+        print("   [OK] IDs iguais com outra data corrente (idades recalculadas)")
+
+    print("\n" + "=" * 60)
+    print("TESTE CONCLUÍDO COM SUCESSO!")
+    print("=" * 60)
+
+
+if __name__ == "__main__":
+    testar_indice_pessoas()
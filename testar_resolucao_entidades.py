@@ -0,0 +1,85 @@
+"""
+Script de teste da resolução de entidades (união-busca sobre os matches).
+"""
+
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent / 'correlation-project'))
+
+import pandas as pd
+from etl.matching_engine import MatchTable, TIPOS_MATCH
+from etl.resolucao_entidades import resolver_entidades
+
+
+def _matches(*pares):
+    """MatchTable a partir de tuplas (origem, destino, tipo, confiança)"""
+    return MatchTable(pd.DataFrame(
+        [(origem, destino, tipo, f'chave_{tipo}', confianca)
+         for origem, destino, tipo, confianca in pares],
+        columns=['id_origem', 'id_destino', 'tipo_match', 'chave_usada', 'confianca']
+    ))
+
+
+def _grupos(df):
+    """Partição dos IDs em grupos, independente da numeração de pessoa_cluster_id"""
+    return {frozenset(ids) for _, ids in df.groupby('pessoa_cluster_id')['id_unico']}
+
+
+def testar_resolucao_entidades():
+    print("=" * 60)
+    print("TESTE DE RESOLUÇÃO DE ENTIDADES")
+    print("=" * 60)
+
+    # A~B (forte) e B~C (fuzzy): A e C nunca foram comparados.
+    # H1, H2 e H3 são homônimos de C, ligados só pelo nome (fraco).
+    # F e G compartilham a chave forte, sem par de match entre eles.
+    df = pd.DataFrame({
+        'id_unico': ['A', 'B', 'C', 'H1', 'H2', 'H3', 'F', 'G', None],
+        'chave_forte_hash': [None, None, None, None, None, None, 7, 7, None],
+    })
+    cad = _matches(('A', 'B', 'forte', 0.95), ('H1', 'H2', 'fraco', 0.50))
+    hom = _matches(
+        ('B', 'C', 'fuzzy', 0.55),
+        ('C', 'H1', 'fraco', 0.50),
+        ('H2', 'H3', 'fraco', 0.50),
+        ('A', 'X', 'forte', 0.95),  # X fora da base: ignorado
+    )
+
+    print("\n1. FECHAMENTO TRANSITIVO:")
+    print("-" * 60)
+    resultado = resolver_entidades(df, [cad, hom], chaves_exatas=['chave_forte_hash'])
+    grupos = _grupos(resultado)
+    assert frozenset({'A', 'B', 'C'}) in grupos, grupos
+    assert frozenset({'F', 'G'}) in grupos, grupos
+    assert resultado.loc[resultado['id_unico'] == 'A', 'tamanho_cluster'].item() == 3
+    print("   [OK] A~B e B~C -> {A, B, C}; F e G unidos pela chave exata")
+
+    print("\n2. HOMÔNIMOS (MATCH FRACO) NÃO SÃO ENCADEADOS:")
+    print("-" * 60)
+    for homonimo in ['H1', 'H2', 'H3']:
+        assert frozenset({homonimo}) in grupos, grupos
+    print("   [OK] H1, H2 e H3 continuam em grupos próprios")
+
+    # Pedindo todas as camadas, o fraco encadeia C e os três homônimos
+    todos = _grupos(resolver_entidades(df, [cad, hom], tipos=TIPOS_MATCH))
+    assert frozenset({'A', 'B', 'C', 'H1', 'H2', 'H3'}) in todos, todos
+    print("   [OK] Com tipos=TIPOS_MATCH o fraco junta todos (motivo do default)")
+
+    print("\n3. CONFIANÇA MÍNIMA E REGISTROS SEM ID:")
+    print("-" * 60)
+    resultado = resolver_entidades(df, [cad, hom], confianca_minima=0.6)
+    grupos = _grupos(resultado)
+    assert frozenset({'A', 'B'}) in grupos and frozenset({'C'}) in grupos, grupos
+    sem_id = resultado.iloc[-1]
+    assert sem_id['tamanho_cluster'] == 1, sem_id
+    assert resultado['pessoa_cluster_id'].nunique() == 8
+    print("   [OK] Fuzzy abaixo de 0.6 descartado; registro sem ID em grupo próprio")
+
+    print("\n" + "=" * 60)
+    print("TESTE CONCLUÍDO COM SUCESSO!")
+    print("=" * 60)
+
+
+if __name__ == "__main__":
+    testar_resolucao_entidades()
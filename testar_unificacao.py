@@ -0,0 +1,74 @@
+"""
+Script de teste da unificação (desaparecidos + cadáveres + homicídios).
+"""
+
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent / 'correlation-project'))
+
+import pandas as pd
+from config.config import (
+    CLASSIFICACAO_DESAPARECIDO_MORTO, CLASSIFICACAO_DESAPARECIDO_VITIMA_HOMICIDIO,
+    CLASSIFICACAO_CADAVER_SEM_DESAPARECIMENTO
+)
+from etl.matching_engine import MatchResult
+from etl.pipeline import unificar_registros
+
+
+def testar_unificacao():
+    print("=" * 60)
+    print("TESTE DE UNIFICAÇÃO DE REGISTROS")
+    print("=" * 60)
+
+    # D1 tem dois cadáveres candidatos (C1 forte, C2 moderado); C3 não tem match.
+    # D2 tem um homicídio pareado pela camada fonética.
+    desaparecidos = pd.DataFrame({
+        'id_unico': ['D1', 'D2'],
+        'nome': ['JOAO DA SILVA', 'MARIA SOUZA'],
+    })
+    cadaveres = pd.DataFrame({
+        'id_unico': ['C1', 'C2', 'C3'],
+        'nome': ['JOAO DA SILVA', 'JOAO SILVA', 'PEDRO SANTOS'],
+    })
+    homicidios = pd.DataFrame({
+        'id_unico': ['H1'],
+        'nome': ['MARIA SOUSA'],
+    })
+    matches_cad = [
+        MatchResult('D1', 'C1', 'forte', 'k1', 1.0),
+        MatchResult('D1', 'C2', 'moderado', 'k2', 0.8),
+    ]
+    matches_hom = [MatchResult('D2', 'H1', 'fonetico', 'k3', 0.75)]
+
+    df = unificar_registros(desaparecidos, cadaveres, homicidios, matches_cad, matches_hom)
+    print(df[['nome', 'classificacao_final', 'tipo_match_cad', 'tipo_match_hom']])
+
+    print("\n1. MELHOR MATCH DE CADA DESAPARECIDO:")
+    print("-" * 60)
+    d1, d2 = df.iloc[0], df.iloc[1]
+    assert d1['classificacao_final'] == CLASSIFICACAO_DESAPARECIDO_MORTO
+    assert d1['tipo_match_cad'] == 'forte' and d1['match_forte_cad']
+    assert d2['classificacao_final'] == CLASSIFICACAO_DESAPARECIDO_VITIMA_HOMICIDIO
+    print("   [OK] D1 -> C1 (forte), D2 -> H1 (fonetico)")
+
+    print("\n2. FLAGS POR TIPO DE MATCH:")
+    print("-" * 60)
+    assert d2['match_fonetico_hom'] and not d2['match_forte_hom']
+    print("   [OK] match_fonetico_hom coerente com tipo_match_hom")
+
+    print("\n3. ÓRFÃOS:")
+    print("-" * 60)
+    orfaos = df[df['classificacao_final'] == CLASSIFICACAO_CADAVER_SEM_DESAPARECIMENTO]
+    # C2 tem match (não é o melhor de D1), então não é órfão
+    assert orfaos['nome'].tolist() == ['PEDRO SANTOS'], orfaos['nome'].tolist()
+    assert len(df) == 3
+    print("   [OK] Só C3 entra como cadáver sem desaparecimento")
+
+    print("\n" + "=" * 60)
+    print("TESTE CONCLUÍDO COM SUCESSO!")
+    print("=" * 60)
+
+
+if __name__ == "__main__":
+    testar_unificacao()